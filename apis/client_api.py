@@ -6,8 +6,15 @@ import urllib3
 
 from dotenv import load_dotenv
 from utils.logging_utils import log_and_print
+from utils.concurrency import observed_request
 from urllib.parse import urlencode
 from utils.json_parser import get_first_request_id
+from utils.fetcher import (
+    write_tab_cache, touch_tab_cache, write_negative_cache, get_fresh_cache_entry, conditional_headers,
+    response_validators, NEGATIVE_STATUSES, fetch_flights,
+)
+from utils.single_flight import single_flight
+from utils import json_codec
 import datetime
 
 # Load environment variables from .env file
@@ -35,7 +42,7 @@ def fetch_case_details(case_id):
     }
 
     try:
-        response = requests.get(url, headers=headers, verify=False)
+        response = observed_request("GET", url, headers=headers, verify=False)
         log_and_print(f"🔎 Raw response status: {response.status_code}")
         log_and_print(f"🔎 Response text: {response.text[:50]}...")
 
@@ -44,7 +51,7 @@ def fetch_case_details(case_id):
             return None
 
         response.raise_for_status()
-        return response.json()
+        return json_codec.response_json(response)
 
     except requests.exceptions.HTTPError as http_err:
         log_and_print(f"❌ HTTP error occurred: {http_err}", "error")
@@ -54,23 +61,16 @@ def fetch_case_details(case_id):
         log_and_print(f"❌ Unexpected error: {e}", "error")
 
     return None
-def fetch_case_documents(case_id: int) -> dict:
-    url = "https://ecourtsdocumentsint.justice.gov.il/api/Documents"
 
-    headers = {
-        "Authorization": f"Bearer {BEARER_TOKEN}",
-        "Content-Type": "application/json",
-        "Moj-Application-Id": MOJ_APP_ID
-    }
 
-    # Attempt to get the first request_id for this case
-    try:
-        request_id = get_first_request_id(case_id)
-        log_and_print(f"📌 Retrieved request_id={request_id} for case_id={case_id}", "debug")
-    except Exception as e:
-        log_and_print(f"⚠️ Failed to retrieve request_id for case_id {case_id}: {e}", "warning")
-        request_id = None
+DOCUMENTS_URL = "https://ecourtsdocumentsint.justice.gov.il/api/Documents"
+CONNECT_CONTACTS_URL = "https://bo-contacts-int.prod.k8s.justice.gov.il/api/ConnectDetails"
 
+
+def build_documents_payload(case_id: int) -> dict:
+    """
+    Builds the Documents search payload for a case (shared with utils/async_fetcher.py).
+    """
     # Compose propertiesList with both folder_ids
     properties_list = [
         {
@@ -125,19 +125,54 @@ def fetch_case_documents(case_id: int) -> dict:
         ]
     }
 
+    return payload
+
+
+@single_flight(fetch_flights, lambda case_id, case_json=None: ("doc", case_id))
+def fetch_case_documents(case_id: int, case_json=None) -> dict:
+    """
+    Documents JSON of the case, {} when there is none or the request failed.
+    """
+    data = fetch_case_documents_with_status(case_id, case_json)[1]
+    return data if data is not None else {}
+
+
+def fetch_case_documents_with_status(case_id: int, case_json=None):
+    """
+    Returns (status_code, documents_json). documents_json is None unless the status is 200;
+    status_code is None when the request itself failed.
+    """
+    url = DOCUMENTS_URL
+
+    headers = {
+        "Authorization": f"Bearer {BEARER_TOKEN}",
+        "Content-Type": "application/json",
+        "Moj-Application-Id": MOJ_APP_ID
+    }
+
+    # Attempt to get the first request_id for this case
     try:
-        response = requests.post(url, headers=headers, json=payload, verify=False)
+        request_id = get_first_request_id(case_id, case_json)
+        log_and_print(f"📌 Retrieved request_id={request_id} for case_id={case_id}", "debug")
+    except Exception as e:
+        log_and_print(f"⚠️ Failed to retrieve request_id for case_id {case_id}: {e}", "warning")
+        request_id = None
+
+    payload = build_documents_payload(case_id)
+
+    try:
+        response = observed_request("POST", url, headers=headers, json=payload, verify=False)
         log_and_print(f"🔎 Document API response status: {response.status_code}", "info")
 
         if response.status_code != 200:
             log_and_print(f"❌ Failed to fetch documents for case {case_id}. Status: {response.status_code}", "error")
-            return {}
+            return response.status_code, None
 
-        return response.json()
+        return response.status_code, json_codec.response_json(response)
 
     except Exception as e:
         log_and_print(f"❌ Exception occurred while fetching documents: {e}", "error")
-        return {}
+        return None, None
 
 
 # def fetch_case_discussions(case_id: int) -> dict:
@@ -164,29 +199,57 @@ def fetch_case_documents(case_id: int) -> dict:
 #         return {}
 
 
-def fetch_connect_contacts(role_ids: list) -> dict:
+def build_connect_contacts_url(role_ids: list) -> str:
+    params = "&".join(f"ConnectDetailsIds={rid}" for rid in role_ids)
+    return f"{CONNECT_CONTACTS_URL}?{params}"  # only 1 "?" here
+
+
+@single_flight(fetch_flights, lambda role_ids, case_id=None, force_refresh=False, max_age_hours=None: (
+    "connect", case_id, tuple(role_ids or ()), force_refresh, max_age_hours
+))
+def fetch_connect_contacts(role_ids: list, case_id=None, force_refresh=False, max_age_hours=None) -> dict:
+    """
+    Fetch connect-details contact data. When case_id is given the result is cached
+    (prefix "connect") and revalidated like fetch_role_contacts.
+    """
     if not role_ids:
         return {}
 
-    base_url = "https://bo-contacts-int.prod.k8s.justice.gov.il/api/ConnectDetails"
-    params = "&".join(f"ConnectDetailsIds={rid}" for rid in role_ids)
-    url = f"{base_url}?{params}"  # only 1 "?" here
+    entry, fresh = get_fresh_cache_entry(case_id, "connect", force_refresh or case_id is None, max_age_hours)
+    if fresh:
+        log_and_print(f"*******cached connect contacts******")
+        return entry["data"]
+
+    url = build_connect_contacts_url(role_ids)
 
     headers = {
         "Authorization": f"Bearer {BEARER_TOKEN}",
         "Accept": "application/json",
-        "Moj-Application-Id": MOJ_APP_ID
+        "Moj-Application-Id": MOJ_APP_ID,
+        **conditional_headers(entry)
     }
 
     try:
-        response = requests.get(url, headers=headers, verify=False)
+        response = observed_request("GET", url, headers=headers, verify=False)
         log_and_print(f"🔎 Contact API response status: {response.status_code}", "info")
 
+        if response.status_code == 304 and entry is not None:
+            touch_tab_cache(case_id, "connect", response_validators(response.headers))
+            return entry["data"]
+
+        if response.status_code in NEGATIVE_STATUSES and case_id is not None:
+            write_negative_cache(case_id, "connect", response.status_code, {})
+            return {}
+
         if response.status_code != 200:
             log_and_print(f"❌ Failed to fetch contact data. Status: {response.status_code}", "error")
             return {}
 
-        return response.json()
+        connect_json = json_codec.response_json(response)
+        if case_id is not None:
+            write_tab_cache(case_id, "connect", connect_json, validators=response_validators(response.headers))
+
+        return connect_json
 
     except Exception as e:
         log_and_print(f"❌ Exception occurred while fetching contact data: {e}", "error")
@@ -0,0 +1,214 @@
+# mapping_tables.py
+import os
+import threading
+import time
+import zlib
+import pandas as pd
+from dotenv import load_dotenv
+from utils.logging_utils import log_and_print
+
+load_dotenv()
+
+# "true": the decision / discussion / appeal / distribution queries fetch only their fact
+# rows and the conversion tables below are joined client-side (see apply_client_joins).
+MENORA_CLIENT_JOINS = os.getenv("MENORA_CLIENT_JOINS", "false").lower() == "true"
+MAPPING_CACHE_PATH = os.getenv("MAPPING_CACHE_PATH", os.path.join("snapshots", "mapping_tables.pkl"))
+MAPPING_CACHE_HOURS = float(os.getenv("MAPPING_CACHE_HOURS", "24"))
+
+# Small lookup tables that every per-case query used to re-join on the server.
+# Court-specific tables are filtered to Court_Id 11 here, as the original joins did.
+MAPPING_TABLE_QUERIES = {
+    "decision_status": """
+        SELECT Decision_Status_Type_BO, Decision_Status_Type_Id
+        FROM External_Courts.cnvrt.Decision_Status_Types_To_BO
+        """,
+    "decision_type_name": "SELECT Code, Name FROM Menora_Conversion.dbo.CT_Decision_Type",
+    "decision_type": """
+        SELECT BO_Decision_Type_Id, Decision_Type_Id
+        FROM External_Courts.cnvrt.Decision_Types_To_BO_Decision_Type
+        WHERE Court_ID = 11
+        """,
+    "decision_type_to_court": """
+        SELECT Decision_Type_Id, Decision_Type_To_Court_ID
+        FROM CaseManagement_BO.dbo.lt_decision_type_to_court
+        WHERE Court_Id = 11
+        """,
+    "discussion_status": """
+        SELECT Discussion_Status_BO, Discussion_Status_Id
+        FROM External_Courts.cnvrt.Discussion_Status_To_BO
+        """,
+    "discussion_cancel_reason": "SELECT Code, Name FROM Menora_Conversion.dbo.CT_DiscussionCancelationReason",
+    "discussion_change_reason": """
+        SELECT Discussion_Change_Reason_BO, Discussion_Change_Reason_Id
+        FROM External_Courts.cnvrt.Discussion_Change_Reason_To_BO
+        """,
+    "discussion_conference_type": "SELECT Discussion_Conference_Type_ID FROM Discussions.code.CT_Discussion_Conference_Types",
+    "case_status": """
+        SELECT Case_Status_BO, Case_Status_Type_Id
+        FROM External_Courts.cnvrt.Case_Status_To_Case_Status_BO
+        WHERE Court_Id = 11
+        """,
+    "distribution_type": "SELECT Code, Name FROM Menora_Conversion.dbo.CT_Distribution_Type",
+}
+
+
+def _queries_fingerprint():
+    text = "\n".join(f"{name}:{query}" for name, query in sorted(MAPPING_TABLE_QUERIES.items()))
+    return f"{zlib.crc32(text.encode('utf-8')):08x}"
+
+
+class MappingTables:
+    """
+    The conversion tables of MAPPING_TABLE_QUERIES, loaded once per process and cached in
+    a pickle at MAPPING_CACHE_PATH for MAPPING_CACHE_HOURS, so later runs skip the queries.
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    @classmethod
+    def load(cls, conn, cache_path=MAPPING_CACHE_PATH, max_age_hours=MAPPING_CACHE_HOURS):
+        cached = cls._read_cache(cache_path, max_age_hours)
+        if cached is not None:
+            return cached
+
+        from apis.sql_client import read_sql_observed
+
+        tables = {name: read_sql_observed(query, conn) for name, query in MAPPING_TABLE_QUERIES.items()}
+        log_and_print(
+            f"🗺️ Loaded {len(tables)} mapping tables ({sum(len(df) for df in tables.values())} rows) from SQL", "info"
+        )
+        mappings = cls(tables)
+        mappings._write_cache(cache_path)
+        return mappings
+
+    @classmethod
+    def _read_cache(cls, cache_path, max_age_hours):
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+        if time.time() - os.path.getmtime(cache_path) > max_age_hours * 3600:
+            return None
+        try:
+            cached = pd.read_pickle(cache_path)
+        except Exception as e:
+            log_and_print(f"⚠️ Failed reading mapping cache {cache_path}: {e}", "warning")
+            return None
+        if cached.get("fingerprint") != _queries_fingerprint():
+            return None
+        log_and_print(f"🗺️ Loaded mapping tables from {cache_path}", "debug")
+        return cls(cached["tables"])
+
+    def _write_cache(self, cache_path):
+        if not cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+            pd.to_pickle({"fingerprint": _queries_fingerprint(), "tables": self.tables}, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            log_and_print(f"⚠️ Could not cache mapping tables at {cache_path}: {e}", "warning")
+
+
+_mappings = None
+_mappings_lock = threading.Lock()
+
+
+def get_mapping_tables(conn):
+    """
+    Process-wide MappingTables, loaded on first use with conn.
+    """
+    global _mappings
+    with _mappings_lock:
+        if _mappings is None:
+            _mappings = MappingTables.load(conn)
+        return _mappings
+
+
+def _join(df, table, left_on, right_on, how="inner", rename=None):
+    """
+    Hash-joins a mapping table onto df. Key columns are compared as numbers when both
+    sides are numeric (NULLs make SQL int columns arrive as float), else as strings.
+    """
+    table = table.rename(columns=rename or {})
+    left_key, right_key = df[left_on], table[right_on]
+    if pd.api.types.is_numeric_dtype(left_key) and pd.api.types.is_numeric_dtype(right_key):
+        left_key, right_key = left_key.astype("float64"), right_key.astype("float64")
+    else:
+        left_key = left_key.where(left_key.isna(), left_key.astype(str))
+        right_key = right_key.where(right_key.isna(), right_key.astype(str))
+    right_key = right_key.dropna()  # SQL never matches NULL keys
+    joined = df.assign(_join_key=left_key).merge(
+        table.loc[right_key.index].assign(_join_key=right_key), on="_join_key", how=how,
+        suffixes=("", "_mapped"),
+    )
+    return joined.drop(columns=["_join_key"])
+
+
+def _join_decision(df, mappings):
+    df = _join(df, mappings["decision_status"], "Status", "Decision_Status_Type_BO")
+    df = _join(df, mappings["decision_type_name"], "Decision_Type", "Code")
+    df = _join(df, mappings["decision_type"], "Decision_Type", "BO_Decision_Type_Id")
+    df = _join(df, mappings["decision_type_to_court"], "Decision_Type_Id", "Court_Decision_Type_Id", how="left",
+               rename={"Decision_Type_Id": "Court_Decision_Type_Id"})
+    in_court_range = df["Decision_Type_Id"].between(70, 85)
+    decision_type_id = df["Decision_Type_Id"].mask(in_court_range, df["Decision_Type_To_Court_ID"])
+    if not decision_type_id.isna().any():  # ints stay ints, as pd.read_sql returns them without NULLs
+        decision_type_id = decision_type_id.astype(df["Decision_Type_Id"].dtype)
+    df["Decision_Type_Id"] = decision_type_id
+    df = df.rename(columns={"Decision_Status_Type_Id": "Decision_Status"})
+    columns = [
+        "Batch_Case_Id", "Decision_Date", "Create_User", "Decision_Id", "Appeal_Number_Display",
+        "Decision_Type_Id", "Name", "Is_For_Advertisement", "Moj_ID", "Decision_Status",
+    ]
+    return df[columns].drop_duplicates().reset_index(drop=True)  # the SQL used SELECT DISTINCT
+
+
+def _join_discussion(df, mappings):
+    df = _join(df, mappings["discussion_status"], "Status", "Discussion_Status_BO")
+    df = _join(df, mappings["discussion_cancel_reason"], "CancelationReason", "Cancel_Code", how="left",
+               rename={"Code": "Cancel_Code", "Name": "CancelReason"})
+    df = _join(df, mappings["discussion_change_reason"], "Cancel_Code", "Discussion_Change_Reason_BO", how="left")
+    df = _join(df, mappings["discussion_conference_type"], "virtualDiscussion", "Discussion_Conference_Type_ID")
+    columns = [
+        "Batch_Case_Id", "Strat_Time", "End_Time", "Discussion_Id", "Discussion_Strat_Time", "PlatphormType",
+        "Discussion_Status_Id", "Discussion_Conference_Type_ID", "discussionLink", "m_tik", "Discussion_Room",
+        "Discussion_Change_Reason_Id", "CancelReason", "Moj_ID",
+    ]
+    return df[columns].reset_index(drop=True)
+
+
+def _join_appeal(df, mappings):
+    # CT_Case_Status_Types / CT_Request_Status_Types were LEFT JOINed on their primary
+    # keys without selecting anything, so only the court-11 status mapping filters rows.
+    df = _join(df, mappings["case_status"], "Appeal_Status", "Case_Status_BO")
+    return df[["Batch_Case_Id", "Appeal_Number_Display"]].reset_index(drop=True)
+
+
+def _join_distribution(df, mappings):
+    df = _join(df, mappings["distribution_type"], "Distribution_type", "Code", rename={"Name": "סוג הפצה"})
+    columns = [
+        "Batch_Case_Id", "SendDate", "SendUser", "SendFrom", "SendTo", "SendSubject", "SendBody",
+        "AttachmentsDocMojID", "Discussion_Id", "SendErrorCode", "SendErrorDesc", "Distribution_Status",
+        "Distribution_Status_Desc", "Distribution_type", "סוג הפצה",
+    ]
+    return df[columns].reset_index(drop=True)
+
+
+# Tab → client-side join, applied to the result of the tab's fact query.
+CLIENT_JOINS = {
+    "decision": _join_decision,
+    "discussion": _join_discussion,
+    "appeal": _join_appeal,
+    "distribution": _join_distribution,
+}
+
+
+def apply_client_joins(tab, df, mappings):
+    """
+    Turns a fact-query result into the frame the original server-side query returned.
+    """
+    return CLIENT_JOINS[tab](df, mappings)
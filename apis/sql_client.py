@@ -4,11 +4,32 @@ import pyodbc
 import pandas as pd
 from utils.logging_utils import log_and_print
 from utils.sql_connection import get_sql_connection
+from utils.concurrency import record_backend_call
+from apis.mapping_tables import MENORA_CLIENT_JOINS, get_mapping_tables, apply_client_joins
 import os
+import time
 
-def fetch_appeal_number_by_case_id(case_id,conn):
-    query = """
-    SELECT a.Appeal_Number_Display
+def read_sql_observed(query, conn, params=None):
+    """
+    pd.read_sql that reports its latency to the concurrency controller as backend 'sql'.
+    """
+    started = time.perf_counter()
+    try:
+        df = pd.read_sql(query, conn, params=params)
+    except Exception:
+        record_backend_call("sql", time.perf_counter() - started, error=True)
+        raise
+    record_backend_call("sql", time.perf_counter() - started)
+    return df
+
+
+# {case_filter} of the query templates below: one case (parameter ?) or the #case_batch temp table.
+SINGLE_CASE_FILTER = "a.Case_Id = ?"
+BATCH_CASE_FILTER = "a.Case_Id IN (SELECT Case_Id FROM #case_batch)"
+
+
+APPEAL_NUMBER_QUERY = """
+    SELECT a.Case_Id AS Batch_Case_Id, a.Appeal_Number_Display
     FROM Menora_Conversion.dbo.Appeal a 
     left JOIN External_Courts.cnvrt.Case_Status_To_Case_Status_BO cn 
         ON a.Appeal_Status = cn.Case_Status_BO
@@ -16,12 +37,16 @@ def fetch_appeal_number_by_case_id(case_id,conn):
         ON c.Case_Status_Type_Id = cn.Case_Status_Type_Id
     left JOIN cases_bo.dbo.CT_Request_Status_Types r 
         ON r.Request_Status_Type_Id = c.Request_Status_Type_Id
-    WHERE cn.Court_Id = 11 AND a.Case_id = ?
+    WHERE cn.Court_Id = 11 AND {case_filter}
     """
+
+
+def fetch_appeal_number_by_case_id(case_id,conn):
     try:
         #log_and_print(f"a.Appeal_Number_Display={query}")
         #conn = get_sql_connection()
-        df = pd.read_sql(query, conn, params=[case_id])
+        df = run_tab_query("appeal", conn, SINGLE_CASE_FILTER, params=[case_id])
+        df = df.drop(columns=["Batch_Case_Id"])
         #conn.close()
 
         if df.empty:
@@ -36,9 +61,10 @@ def fetch_appeal_number_by_case_id(case_id,conn):
         log_and_print(f"❌ Error fetching appeal number: {e}", "error")
         return None
 
-def fetch_menora_decision_data(case_id,appeal_number, conn):
-    query = """
+
+DECISION_QUERY = """
             SELECT DISTINCT 
+            a.Case_Id AS Batch_Case_Id,
             d.Decision_Date,
             d.Create_User, 
             d.Decision_Id, 
@@ -73,13 +99,17 @@ def fetch_menora_decision_data(case_id,appeal_number, conn):
         LEFT JOIN CaseManagement_BO.dbo.lt_decision_type_to_court l 
             ON l.Decision_Type_Id = ec_dt.Decision_Type_Id AND l.Court_Id = 11 
 
-        WHERE a.Case_Id = ?
+        WHERE {case_filter}
         AND ec_dt.Court_ID = 11
 
     """
+
+
+def fetch_menora_decision_data(case_id,appeal_number, conn):
     try:
         #conn = get_sql_connection()
-        df = pd.read_sql(query, conn, params=[case_id])
+        df = run_tab_query("decision", conn, SINGLE_CASE_FILTER, params=[case_id])
+        df = df.drop(columns=["Batch_Case_Id"])
         #conn.close()
         log_and_print(f"✅ Retrieved {len(df)} decisions from Menora for case {case_id}", "success")
         return df
@@ -87,9 +117,10 @@ def fetch_menora_decision_data(case_id,appeal_number, conn):
         log_and_print(f"❌ Error while fetching Menora decision data: {e}", "error")
         return pd.DataFrame()
 
-def fetch_menora_document_data(case_id,appeal_number, conn):
-    query = """
+
+DOCUMENT_QUERY = """
   SELECT 
+    d_base.Batch_Case_Id,
     a.Appeal_Number_Display AS m_tik,
     d1.t_mismach,
     d1.sug_mismach,
@@ -104,17 +135,17 @@ def fetch_menora_document_data(case_id,appeal_number, conn):
     COALESCE(ec_ds.Document_Source_Type_Id, 
              CASE WHEN e_dt.Document_Type_Id IN (3, 13, 30) THEN 3 ELSE 4 END) AS Source_Type
 FROM (
-    SELECT DISTINCT d.moj_id
+    SELECT DISTINCT a.Case_Id AS Batch_Case_Id, d.moj_id
     FROM Menora_Conversion.dbo.documents d
     JOIN Menora_Conversion.dbo.Appeal a ON d.mis_tik = a.Appeal_ID
-    WHERE a.Case_Id =?  and d.user_mochek = 0
+    WHERE {case_filter}  and d.user_mochek = 0
 ) AS d_base
 OUTER APPLY (
     SELECT TOP 1 d1.*
     FROM Menora_Conversion.dbo.documents d1
     JOIN Menora_Conversion.dbo.Appeal a ON d1.mis_tik = a.Appeal_ID
     WHERE d1.moj_id = d_base.moj_id
-      AND a.Case_Id =?
+      AND a.Case_Id = d_base.Batch_Case_Id
     ORDER BY d1.DocStatus DESC -- Or replace with r_creation_date if available
 ) AS d1
 JOIN Menora_Conversion.dbo.doc_types dt 
@@ -132,9 +163,14 @@ LEFT JOIN [External_Courts].[cnvrt].[Document_Source_Types_To_DocSource_Code_BO]
 WHERE e_dt.Court_Id = 11 
 
     """
+
+
+def fetch_menora_document_data(case_id,appeal_number, conn):
+    query = DOCUMENT_QUERY.format(case_filter=SINGLE_CASE_FILTER)
     try:
         #conn = get_sql_connection()
-        df = pd.read_sql(query, conn, params=[case_id, case_id])
+        df = read_sql_observed(query, conn, params=[case_id])
+        df = df.drop(columns=["Batch_Case_Id"])
         #conn.close()
         log_and_print(f"✅ Retrieved {len(df)} documents from Menora for case {case_id}", "success")
         return df
@@ -142,9 +178,10 @@ WHERE e_dt.Court_Id = 11
         log_and_print(f"❌ Error while fetching Menora document data: {e}", "error")
         return pd.DataFrame()
 
-def fetch_menora_discussion_data(case_id,appeal_number, conn):
-    query = """
+
+DISCUSSION_QUERY = """
     SELECT 
+        a.Case_Id AS Batch_Case_Id,
         FORMAT(Discussion_Date, 'dd/MM/yyyy') + ' ' + CONVERT(VARCHAR, d.Discussion_Strat_Time, 8) AS Strat_Time,
         FORMAT(Discussion_Date, 'dd/MM/yyyy') + ' ' + CONVERT(VARCHAR, d.Discussion_End_Time, 8) AS End_Time, 
         d.Discussion_Id,
@@ -165,11 +202,15 @@ def fetch_menora_discussion_data(case_id,appeal_number, conn):
     LEFT JOIN External_Courts.cnvrt.Discussion_Change_Reason_To_BO ec_cr ON cr.Code = ec_cr.Discussion_Change_Reason_BO
     JOIN Menora_Conversion.dbo.Appeal a ON lr.appeal_id = a.Appeal_ID
     JOIN Discussions.code.CT_Discussion_Conference_Types dc ON dc.Discussion_Conference_Type_ID = d.virtualDiscussion
-    WHERE a.Case_Id = ?
+    WHERE {case_filter}
     """
+
+
+def fetch_menora_discussion_data(case_id,appeal_number, conn):
     try:
         #conn = get_sql_connection()
-        df = pd.read_sql(query, conn, params=[case_id])
+        df = run_tab_query("discussion", conn, SINGLE_CASE_FILTER, params=[case_id])
+        df = df.drop(columns=["Batch_Case_Id"])
         #conn.close()
         log_and_print(f"✅ Retrieved {len(df)} discussions from Menora for case {case_id}", "success")
         return df
@@ -177,9 +218,10 @@ def fetch_menora_discussion_data(case_id,appeal_number, conn):
         log_and_print(f"❌ Error while fetching Menora discussion data: {e}", "error")
         return pd.DataFrame()
 
-def fetch_menora_case_involved_data(case_id,appeal_number, conn):
-    query = """
+
+CASE_INVOLVED_QUERY = """
 SELECT
+    a.Case_Id AS Batch_Case_Id,
     COALESCE(p.Main_Id_Number, r.ID_Num) AS Main_Id_Number,
     r.ID_Num AS meshivaID,
     a.PrivateCompanyNumber,
@@ -199,11 +241,16 @@ LEFT JOIN Menora_Conversion.dbo.Person p
     ON ap.Person_ID = p.Person_ID
 LEFT JOIN Menora_Conversion.dbo.Respondents r 
     ON a.Respondent_Code = r.RespondentID
-WHERE a.Case_Id = ?
+WHERE {case_filter}
     """
+
+
+def fetch_menora_case_involved_data(case_id,appeal_number, conn):
+    query = CASE_INVOLVED_QUERY.format(case_filter=SINGLE_CASE_FILTER)
     try:
         #conn = get_sql_connection()
-        df = pd.read_sql(query, conn, params=[case_id])
+        df = read_sql_observed(query, conn, params=[case_id])
+        df = df.drop(columns=["Batch_Case_Id"])
         #conn.close()
         log_and_print(f"✅ Retrieved {len(df)} case involved entries from Menora for case {case_id}", "success")
         return df
@@ -213,9 +260,9 @@ WHERE a.Case_Id = ?
     
 
 
-def fetch_menora_case_contacts(case_id,appeal_number, conn):
-    query = """
+CASE_CONTACTS_QUERY = """
     SELECT
+    a.Case_Id AS Batch_Case_Id,
     MAX(a.CompanyName) AS CompanyName,
     MAX(a.Open_Date) AS Open_Date, 
     MAX(TRIM(ud.shem_prati) + ' ' + TRIM(ud.shem_mishpacha)) AS 'your vaada',
@@ -277,12 +324,17 @@ JOIN [Cases_BO].[dbo].[CT_Case_Status_Types] cb_s
 LEFT JOIN [External_Courts].[cnvrt].[Case_Subject_Type_And_Case_Type_To_BO_Case_Type] ec_st 
     ON ec_st.BO_Case_Type = a.Main_Subject 
     AND ec_pt.[Entitlement_Periods_Type_Id] = ec_st.Entitlement_Period_Id
-WHERE a.Case_Id = ?
-GROUP BY p.Main_Id_Number;
+WHERE {case_filter}
+GROUP BY a.Case_Id, p.Main_Id_Number;
     """
+
+
+def fetch_menora_case_contacts(case_id,appeal_number, conn):
+    query = CASE_CONTACTS_QUERY.format(case_filter=SINGLE_CASE_FILTER)
     try:
         #conn = get_sql_connection()
-        df = pd.read_sql(query, conn, params=[case_id])
+        df = read_sql_observed(query, conn, params=[case_id])
+        df = df.drop(columns=["Batch_Case_Id"])
         #conn.close()
         log_and_print(f"✅ Retrieved {len(df)} case involved entries from Menora for case {case_id}", "success")
         return df
@@ -291,19 +343,23 @@ GROUP BY p.Main_Id_Number;
         return pd.DataFrame()
     
 
-def fetch_menora_distributions(case_id,appeal_number, conn):
-    query = """ 
-        select d.SendDate,d.SendUser,d.SendFrom,d.SendTo,d.SendSubject,d.SendBody,d.AttachmentsDocMojID,d.Discussion_Id,
+
+DISTRIBUTIONS_QUERY = """ 
+        select a.Case_Id AS Batch_Case_Id, d.SendDate,d.SendUser,d.SendFrom,d.SendTo,d.SendSubject,d.SendBody,d.AttachmentsDocMojID,d.Discussion_Id,
         d.SendErrorCode,d.SendErrorDesc,d.Distribution_Status,d.Distribution_Status_Desc,
         d.Distribution_type, dt.Name 'סוג הפצה'
         from [Menora_Conversion].[dbo].[Log_DistributionService] d
         join [Menora_Conversion].dbo.CT_Distribution_Type dt on d.Distribution_type=dt.Code
         join [Menora_Conversion].dbo.Appeal a on d.appeal_id=a.Appeal_ID
-        WHERE a.Case_Id = ?
+        WHERE {case_filter}
     """
+
+
+def fetch_menora_distributions(case_id,appeal_number, conn):
     try:
         #conn = get_sql_connection()
-        df = pd.read_sql(query, conn, params=[case_id])
+        df = run_tab_query("distribution", conn, SINGLE_CASE_FILTER, params=[case_id])
+        df = df.drop(columns=["Batch_Case_Id"])
         #conn.close()
         log_and_print(f"✅ Retrieved {len(df)} distribution entries from Menora for case {case_id}", "success")
         return df
@@ -312,9 +368,10 @@ def fetch_menora_distributions(case_id,appeal_number, conn):
         return pd.DataFrame()
     
 
-def fetch_menora_log_requests(case_id,appeal_number, conn):
-    query = """
+
+LOG_REQUESTS_QUERY = """
         SELECT 
+            a.Case_Id AS Batch_Case_Id,
             la.Status_Date,
             CASE 
                 WHEN la.Action_Description = 'Case Create' THEN N'הגשת תיק ערר'
@@ -326,12 +383,17 @@ def fetch_menora_log_requests(case_id,appeal_number, conn):
         FROM [Menora_Conversion].[dbo].[Log_Appeal_Status] la
         JOIN Menora_Conversion.dbo.Appeal a 
             ON la.Appeal_ID = a.Appeal_ID
-        WHERE a.Case_Id = ?
+        WHERE {case_filter}
         ORDER BY la.Log_Code DESC;
     """
+
+
+def fetch_menora_log_requests(case_id,appeal_number, conn):
+    query = LOG_REQUESTS_QUERY.format(case_filter=SINGLE_CASE_FILTER)
     try:
         #conn = get_sql_connection()
-        df = pd.read_sql(query, conn, params=[case_id])
+        df = read_sql_observed(query, conn, params=[case_id])
+        df = df.drop(columns=["Batch_Case_Id"])
         #conn.close()
 
         required_columns = ["Status_Date", "Action_Description", "Status_Reason", "Action_Type", "Create_User"]
@@ -346,3 +408,236 @@ def fetch_menora_log_requests(case_id,appeal_number, conn):
     except Exception as e:
         log_and_print(f"❌ Error while fetching request log data for case number {case_id}: {e}", "error")
         return pd.DataFrame()
+
+
+# Tab name (as used for tab_configs in main.py) → batch query template.
+MENORA_TAB_QUERIES = {
+    "appeal": APPEAL_NUMBER_QUERY,
+    "request_log": LOG_REQUESTS_QUERY,
+    "discussion": DISCUSSION_QUERY,
+    "decision": DECISION_QUERY,
+    "document": DOCUMENT_QUERY,
+    "representator_log": CASE_INVOLVED_QUERY,
+    "case_contact": CASE_CONTACTS_QUERY,
+    "distribution": DISTRIBUTIONS_QUERY,
+}
+
+# Fact-only variants used with MENORA_CLIENT_JOINS: the conversion-table joins of the
+# queries above are done client-side by apis.mapping_tables.apply_client_joins.
+APPEAL_FACT_QUERY = """
+    SELECT a.Case_Id AS Batch_Case_Id, a.Appeal_Number_Display, a.Appeal_Status
+    FROM Menora_Conversion.dbo.Appeal a
+    WHERE {case_filter}
+    """
+
+DECISION_FACT_QUERY = """
+    SELECT DISTINCT
+        a.Case_Id AS Batch_Case_Id,
+        d.Decision_Date,
+        d.Create_User,
+        d.Decision_Id,
+        a.Appeal_Number_Display,
+        d.Decision_Type,
+        d.Is_For_Advertisement,
+        d.Moj_ID,
+        d.Status
+    FROM Menora_Conversion.dbo.Decision d
+    JOIN Menora_Conversion.dbo.Link_Request_Decision ld
+        ON ld.Decision_Id = d.Decision_Id
+    JOIN Menora_Conversion.dbo.Appeal a
+        ON ld.appeal_id = a.Appeal_ID
+    WHERE {case_filter}
+    """
+
+DISCUSSION_FACT_QUERY = """
+    SELECT
+        a.Case_Id AS Batch_Case_Id,
+        FORMAT(Discussion_Date, 'dd/MM/yyyy') + ' ' + CONVERT(VARCHAR, d.Discussion_Strat_Time, 8) AS Strat_Time,
+        FORMAT(Discussion_Date, 'dd/MM/yyyy') + ' ' + CONVERT(VARCHAR, d.Discussion_End_Time, 8) AS End_Time,
+        d.Discussion_Id,
+        d.Discussion_Strat_Time,
+        CASE WHEN d.discussionLink IS NOT NULL THEN 2 ELSE NULL END AS PlatphormType,
+        d.Status,
+        d.virtualDiscussion,
+        d.CancelationReason,
+        d.discussionLink,
+        a.Appeal_Number_Display AS m_tik,
+        d.Discussion_Room,
+        d.Moj_ID
+    FROM Menora_Conversion.dbo.Discussion d
+    JOIN Menora_Conversion.dbo.Link_Request_Discussion lr ON lr.Discussion_Id = d.Discussion_Id
+    JOIN Menora_Conversion.dbo.Appeal a ON lr.appeal_id = a.Appeal_ID
+    WHERE {case_filter}
+    """
+
+DISTRIBUTIONS_FACT_QUERY = """
+        select a.Case_Id AS Batch_Case_Id, d.SendDate,d.SendUser,d.SendFrom,d.SendTo,d.SendSubject,d.SendBody,d.AttachmentsDocMojID,d.Discussion_Id,
+        d.SendErrorCode,d.SendErrorDesc,d.Distribution_Status,d.Distribution_Status_Desc,
+        d.Distribution_type
+        from [Menora_Conversion].[dbo].[Log_DistributionService] d
+        join [Menora_Conversion].dbo.Appeal a on d.appeal_id=a.Appeal_ID
+        WHERE {case_filter}
+    """
+
+MENORA_FACT_QUERIES = {
+    "appeal": APPEAL_FACT_QUERY,
+    "decision": DECISION_FACT_QUERY,
+    "discussion": DISCUSSION_FACT_QUERY,
+    "distribution": DISTRIBUTIONS_FACT_QUERY,
+}
+
+
+def tab_query(tab):
+    """
+    The query template a tab actually runs: its fact query with MENORA_CLIENT_JOINS, else the full query.
+    """
+    if MENORA_CLIENT_JOINS and tab in MENORA_FACT_QUERIES:
+        return MENORA_FACT_QUERIES[tab]
+    return MENORA_TAB_QUERIES[tab]
+
+
+def run_tab_query(tab, conn, case_filter, params=None):
+    """
+    Runs a tab's query (see tab_query) and, for fact queries, joins the mapping tables in
+    memory, so both modes return the same frame (Batch_Case_Id included).
+    """
+    df = read_sql_observed(tab_query(tab).format(case_filter=case_filter), conn, params=params)
+    if MENORA_CLIENT_JOINS and tab in MENORA_FACT_QUERIES:
+        df = apply_client_joins(tab, df, get_mapping_tables(conn))
+    return df
+
+
+DEFAULT_BULK_TABS = ["appeal", "request_log", "discussion", "decision", "representator_log", "case_contact", "distribution"]
+
+
+def load_case_batch(case_ids, conn):
+    """
+    Loads the batch's case_ids into the session temp table #case_batch.
+    The temp table lives as long as the connection, so the bulk queries must run on the same conn.
+    """
+    cursor = conn.cursor()
+    cursor.execute("IF OBJECT_ID('tempdb..#case_batch') IS NOT NULL DROP TABLE #case_batch")
+    cursor.execute("CREATE TABLE #case_batch (Case_Id INT PRIMARY KEY)")
+    rows = [(int(case_id),) for case_id in sorted(set(case_ids))]
+    if rows:
+        cursor.fast_executemany = True
+        cursor.executemany("INSERT INTO #case_batch (Case_Id) VALUES (?)", rows)
+    conn.commit()
+    cursor.close()
+    log_and_print(f"📥 Loaded {len(rows)} case_ids into #case_batch", "info")
+
+
+def split_frame_by_case(df, case_ids):
+    """
+    Splits a bulk result on Batch_Case_Id into {case_id: DataFrame}.
+    Cases without rows get an empty frame with the same columns, like the per-case fetchers return.
+    """
+    columns = [col for col in df.columns if col != "Batch_Case_Id"]
+    frames = {
+        int(case_id): group.drop(columns=["Batch_Case_Id"]).reset_index(drop=True)
+        for case_id, group in df.groupby("Batch_Case_Id", sort=False)
+    }
+    for case_id in case_ids:
+        frames.setdefault(int(case_id), pd.DataFrame(columns=columns))
+    return frames
+
+
+def fetch_menora_bulk(case_ids, conn, tabs=None):
+    """
+    Runs each tab query once for the whole batch instead of once per case.
+
+    Returns:
+        dict: {case_id: {tab: DataFrame}} — the per-case frames the runners expect.
+    """
+    if tabs is None:
+        tabs = DEFAULT_BULK_TABS
+
+    case_ids = [int(case_id) for case_id in case_ids]
+    load_case_batch(case_ids, conn)
+
+    results = {case_id: {} for case_id in case_ids}
+    for tab in tabs:
+        try:
+            df = run_tab_query(tab, conn, BATCH_CASE_FILTER)
+            log_and_print(f"✅ Bulk-retrieved {len(df)} '{tab}' rows from Menora for {len(case_ids)} cases", "success")
+        except Exception as e:
+            log_and_print(f"❌ Bulk fetch failed for '{tab}': {e}", "error")
+            continue
+
+        for case_id, frame in split_frame_by_case(df, case_ids).items():
+            results[case_id][tab] = frame
+
+    return results
+
+
+# One cheap aggregate per case that changes whenever the case's Menora data is touched:
+# the newest status-log entry, the number of log entries and the appeal's own status.
+SNAPSHOT_KEY_QUERY = """
+    SELECT
+        a.Case_Id AS Batch_Case_Id,
+        CONCAT(MAX(la.Log_Code), '-', COUNT(la.Log_Code), '-', MAX(a.Appeal_Status)) AS Snapshot_Key
+    FROM Menora_Conversion.dbo.Appeal a
+    LEFT JOIN [Menora_Conversion].[dbo].[Log_Appeal_Status] la
+        ON la.Appeal_ID = a.Appeal_ID
+    WHERE {case_filter}
+    GROUP BY a.Case_Id
+    """
+
+
+def fetch_snapshot_keys(case_ids, conn):
+    """
+    Returns {case_id: snapshot key} for the batch (cases missing from Appeal are left out).
+    Loads #case_batch, so bulk queries for the same batch can follow on the same conn.
+    """
+    load_case_batch(case_ids, conn)
+    df = read_sql_observed(SNAPSHOT_KEY_QUERY.format(case_filter=BATCH_CASE_FILTER), conn)
+    return {int(row.Batch_Case_Id): str(row.Snapshot_Key) for row in df.itertuples(index=False)}
+
+
+def get_menora_frame(tab, fetch_fn, case_id, appeal_number, conn, menora_frames=None):
+    """
+    Returns the Menora frame for one tab: the bulk-prefetched frame if one was loaded,
+    otherwise the per-case fetcher result.
+    """
+    if menora_frames and tab in menora_frames:
+        return menora_frames[tab].copy()
+    return fetch_fn(case_id, appeal_number, conn)
+
+
+def get_appeal_number(case_id, conn, menora_frames=None):
+    """
+    Returns the appeal number from the bulk-prefetched 'appeal' frame, or queries it per case.
+    """
+    if menora_frames and "appeal" in menora_frames:
+        df = menora_frames["appeal"]
+        if df.empty:
+            log_and_print(f"⚠️ No appeal number found for case_id {case_id}", "warning")
+            return None
+        return df.iloc[0]["Appeal_Number_Display"]
+    return fetch_appeal_number_by_case_id(case_id, conn)
+
+
+# Tab name → per-case fetcher, for stages that gather all Menora frames of a case up front.
+MENORA_TAB_FETCHERS = {
+    "request_log": fetch_menora_log_requests,
+    "discussion": fetch_menora_discussion_data,
+    "decision": fetch_menora_decision_data,
+    "document": fetch_menora_document_data,
+    "representator_log": fetch_menora_case_involved_data,
+    "case_contact": fetch_menora_case_contacts,
+    "distribution": fetch_menora_distributions,
+}
+
+
+def fetch_menora_case_frames(case_id, appeal_number, conn, tabs=None, menora_frames=None):
+    """
+    Returns {tab: DataFrame} for one case, reusing bulk-prefetched frames where present.
+    """
+    if tabs is None:
+        tabs = [tab for tab in DEFAULT_BULK_TABS if tab != "appeal"]
+
+    frames = dict(menora_frames or {})
+    for tab in tabs:
+        if tab not in frames:
+            frames[tab] = MENORA_TAB_FETCHERS[tab](case_id, appeal_number, conn)
+    return frames
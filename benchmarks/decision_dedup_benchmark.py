@@ -0,0 +1,99 @@
+# decision_dedup_benchmark.py
+"""
+Old (quadratic any(...) scan) vs hashed decision-mismatch deduplication on synthetic
+comparison results, checking both give identical output:
+
+    python -m benchmarks.decision_dedup_benchmark --decisions 250 1000 2500
+"""
+import argparse
+import random
+import time
+from tabulate import tabulate
+from utils.comparison_engine import dedupe_reverse_mismatches
+
+FIELDS = ["Decision_Date", "Decision_Status", "Is_For_Advertisement", "Decision_Type_Id"]
+
+
+def reference_dedupe(comparison_results):
+    """
+    The loop run_decision_comparison used before dedupe_reverse_mismatches (the decision
+    plan's "reversePairs" dedupe rule).
+    """
+    mismatched_fields = []
+    seen_mismatches = set()
+    for row in comparison_results:
+        if row.get("Match") != "✗":
+            continue
+        key = (row["mojId"], row["Field"])
+        reverse_pair = (row["JSON Value"], row["Menora Value"])
+
+        if key in seen_mismatches:
+            continue
+
+        if any(
+            r["mojId"] == row["mojId"]
+            and r["Field"] == row["Field"]
+            and (r["Menora Value"], r["JSON Value"]) == reverse_pair
+            for r in comparison_results
+        ):
+            seen_mismatches.add(key)
+            continue
+
+        mismatched_fields.append({
+            "Status_Date": row.get("mojId"),
+            "Field": row.get("Field"),
+            "Menora": row.get("Menora Value"),
+            "JSON": row.get("JSON Value")
+        })
+        seen_mismatches.add(key)
+    return mismatched_fields
+
+
+def synthetic_results(n_decisions, seed=0):
+    """
+    Rows as comparison_records returns them for decisions: every decision × field, some duplicated
+    (one-to-many merges) and some duplicates holding the reversed value pair.
+    """
+    rng = random.Random(seed)
+    results = []
+    for d in range(n_decisions):
+        moj_id = f"0901{d:012d}"
+        for field in FIELDS:
+            menora, json_value = rng.randint(0, 3), rng.randint(0, 3)
+            results.append({"mojId": moj_id, "Field": field, "Menora Value": menora, "JSON Value": json_value,
+                            "Match": "✓" if menora == json_value else "✗"})
+            if rng.random() < 0.2:
+                results.append({"mojId": moj_id, "Field": field, "Menora Value": json_value, "JSON Value": menora,
+                                "Match": "✓" if menora == json_value else "✗"})
+    rng.shuffle(results)
+    return results
+
+
+def time_call(fn, arg):
+    started = time.perf_counter()
+    result = fn(arg)
+    return time.perf_counter() - started, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark decision mismatch deduplication")
+    parser.add_argument("--decisions", type=int, nargs="+", default=[250, 1000, 2500],
+                        help="Decision counts to benchmark (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for n_decisions in args.decisions:
+        results = synthetic_results(n_decisions)
+        old_seconds, old_output = time_call(reference_dedupe, results)
+        new_seconds, new_output = time_call(dedupe_reverse_mismatches, results)
+        rows.append([
+            n_decisions, len(results), len(new_output), f"{old_seconds * 1000:.1f}", f"{new_seconds * 1000:.2f}",
+            "yes" if old_output == new_output else "NO",
+        ])
+
+    print(tabulate(rows, headers=["decisions", "result rows", "mismatches", "any() scan ms", "hashed ms", "identical"],
+                   tablefmt="github"))
+
+
+if __name__ == "__main__":
+    main()
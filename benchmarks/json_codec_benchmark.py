@@ -0,0 +1,108 @@
+# json_codec_benchmark.py
+"""
+Parse (and encode) time per payload size for every installed JSON backend:
+
+    python -m benchmarks.json_codec_benchmark                  # synthetic case payloads
+    python -m benchmarks.json_codec_benchmark --data-dir data  # cached case_*.json[.gz|.zst] files
+
+Synthetic payloads mimic /api/Case/GetCase: nested requests[*].requestLogs,
+decisions[*].decisionRequests[*].subDecisions and caseInvolveds, with Hebrew text.
+"""
+import argparse
+import glob
+import os
+import time
+from tabulate import tabulate
+from utils.json_codec import JSON_BACKENDS, JSON_BACKEND
+
+
+def synthetic_case(n_requests):
+    return {
+        "caseId": 2000001,
+        "caseDisplayIdentifier": "ערר 1234-05-24",
+        "requests": [
+            {
+                "requestId": 9000000 + r,
+                "requestTypeId": 1,
+                "requestLogs": [
+                    {"requestStatusId": s, "statusDate": "2024-05-12T10:31:22.123+03:00", "remarks": "הוגש ערר לוועדה"}
+                    for s in range(12)
+                ],
+            }
+            for r in range(n_requests)
+        ],
+        "decisions": [
+            {
+                "decisionId": 500000 + d,
+                "decisionDate": "2024-06-01T00:00:00",
+                "mojId": f"0901{d:012d}",
+                "decisionRequests": [
+                    {"requestId": 9000000 + d, "subDecisions": [{"decisionTypeId": t, "isMain": t == 0} for t in range(4)]}
+                    for _ in range(2)
+                ],
+            }
+            for d in range(n_requests)
+        ],
+        "caseInvolveds": [
+            {"contactId": 300000 + c, "name": "ישראל ישראלי", "roleInCorporationId": 77, "isActive": c % 3 != 0}
+            for c in range(n_requests // 2 + 1)
+        ],
+    }
+
+
+def synthetic_payloads():
+    from utils.json_codec import dumps
+    return [(f"synthetic x{n}", dumps(synthetic_case(n))) for n in (5, 50, 200, 800)]
+
+
+def cached_payloads(data_dir, limit):
+    from utils.fetcher import _codec_for_path
+    paths = sorted(glob.glob(os.path.join(data_dir, "*", "case_*.json*")), key=os.path.getsize)
+    if len(paths) > limit:  # spread the sample over the size range
+        paths = [paths[i * (len(paths) - 1) // (limit - 1)] for i in range(limit)]
+    payloads = []
+    for path in paths:
+        with open(path, "rb") as f:
+            payloads.append((os.path.basename(path), _codec_for_path(path)["decompress"](f.read())))
+    return payloads
+
+
+def time_call(fn, arg, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the JSON backends of utils/json_codec.py")
+    parser.add_argument("--data-dir", help="Benchmark cached case payloads from this data/ tree instead of synthetic ones")
+    parser.add_argument("--limit", type=int, default=8, help="Max cached files to sample (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement, best is kept (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    payloads = cached_payloads(args.data_dir, args.limit) if args.data_dir else synthetic_payloads()
+    if not payloads:
+        print(f"No case_*.json files under {args.data_dir}")
+        return
+
+    rows = []
+    for name, raw in payloads:
+        data = JSON_BACKENDS["json"]["loads"](raw)
+        row = [name, f"{len(raw) / 1024:.0f}"]
+        for backend in JSON_BACKENDS.values():
+            row.append(f"{time_call(backend['loads'], raw, args.repeat) * 1000:.2f}")
+            row.append(f"{time_call(backend['dumps'], data, args.repeat) * 1000:.2f}")
+        rows.append(row)
+
+    headers = ["payload", "KB"]
+    for backend_name in JSON_BACKENDS:
+        headers += [f"{backend_name} parse ms", f"{backend_name} encode ms"]
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+    print(f"\nJSON_BACKEND in use: {JSON_BACKEND}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,36 @@ import json
 from utils.logging_utils import log_and_print
 import os
 
-def load_tab_config(tab_name: str):
-    
+# Top-level section of tab_config.json that holds per-endpoint cache freshness, not a tab.
+CACHE_POLICY_KEY = "cachePolicy"
+
 
-    # Make the path relative to the script location
+def _load_config_file():
     base_dir = os.path.dirname(os.path.abspath(__file__))
     config_path = os.path.join(base_dir, "tab_config.json")
 
     with open(config_path, encoding="utf-8") as f:
-        config = json.load(f)
+        return json.load(f)
+
+
+def load_cache_policy():
+    """
+    Returns the cachePolicy section: {endpoint prefix or "default": {"ttlHours": N or null}}.
+    null (the shipped default) keeps cached payloads forever, as before TTLs existed; set
+    hours for a prefix (or pass --max-age-hours) to opt into revalidation.
+    """
+    return _load_config_file().get(CACHE_POLICY_KEY, {})
+
+
+def load_tab_config(tab_name: str):
+    
+
+    # Path is relative to the script location
+    config = _load_config_file()
 
-    log_and_print(f"📁 טאבים זמינים בקונפיג: {list(config.keys())}", "info", is_hebrew=True)
+    log_and_print(f"📁 טאבים זמינים בקונפיג: {[key for key in config if key != CACHE_POLICY_KEY]}", "info", is_hebrew=True)
 
-    if tab_name not in config:
+    if tab_name not in config or tab_name == CACHE_POLICY_KEY:
         raise ValueError(f"Tab '{tab_name}' not found in configuration.")
 
     return config[tab_name]
@@ -1,19 +1,26 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from apis.client_api import fetch_case_details
-from apis.sql_client import fetch_appeal_number_by_case_id
-from runners.requestlog_runner import run_request_log_comparison
-from runners.discussion_runner import run_discussion_comparison
-from runners.decision_runner import run_decision_comparison
-from runners.document_runner import run_document_comparison
-from runners.distribution_runner import run_distribution_comparison
-from runners.case_representator_runner import run_representator_comparison
-from runners.case_involved_runner import run_case_involved_comparison
+from apis.sql_client import fetch_menora_bulk, get_appeal_number, fetch_snapshot_keys, tab_query, DEFAULT_BULK_TABS
+from runners.case_runner import run_case_tabs
+from runners.case_graph import run_case_graph, CASE_GRAPH_WORKERS
+from runners.tab_plan import compile_tab_plans
+from utils.pipeline import run_pipeline
+from utils.results_writer import (
+    ResultsLog, DEFAULT_RESULTS_LOG, completed_case_ids, compact_results_log, merge_results_logs, shard_results_log_path,
+    shard_results_logs,
+)
+from utils.case_source import add_case_source_arguments, resolve_case_ids, parse_shard, shard_case_ids
+from utils.work_queue import SqliteWorkQueue, default_worker_id
+from utils.menora_snapshot import MenoraSnapshotStore
 from utils.logging_utils import log_and_print
 from configs.config_loader import load_tab_config
-from utils.sql_connection import get_sql_connection
-from utils.fetcher import get_case_data
+from utils.sql_connection import get_connection_pool
+from utils.concurrency import create_controller
+from utils.fetcher import get_case_data, log_cache_stats
+from utils.case_context import CaseContext
 from dotenv import load_dotenv
 from utils.json_parser import extract_decisions
+import argparse
 import json
 import os
 import sys
@@ -50,64 +57,87 @@ def load_configuration():
             exit(1)
 
 
-def process_case(case_id, tab_configs):
-    conn = get_sql_connection()  # Each thread gets its own connection
+def process_case(case_id, tab_configs, menora_frames=None, max_age_hours=None, tab_plans=None):
     try:
         log_and_print(f"\n\n🔁 Processing case_id {case_id}...", "info")
-        appeal_number = fetch_appeal_number_by_case_id(case_id, conn)
-        # if not appeal_number:
-        #     log_and_print(f"❌ Could not find appeal number for case ID {case_id}. Skipping.", "error")
-        #     return case_id, {}
+        context = CaseContext(case_id, max_age_hours=max_age_hours)
 
-        case_results = {}
-        
-        case_json = get_case_data(case_id)
-        #log_and_print(f"case_json={case_json}")               
+        if CASE_GRAPH_WORKERS > 1:
+            # Independent tabs run concurrently; each SQL node borrows its own pooled connection
+            return case_id, run_case_graph(case_id, tab_configs, menora_frames, context, tab_plans=tab_plans)
 
+        with get_connection_pool().connection() as conn:  # Borrowed from the shared pool, returned after the case
+            appeal_number = get_appeal_number(case_id, conn, menora_frames)
+            # if not appeal_number:
+            #     log_and_print(f"❌ Could not find appeal number for case ID {case_id}. Skipping.", "error")
+            #     return case_id, {}
 
+            case_results = run_case_tabs(case_id, appeal_number, conn, tab_configs, menora_frames, context, tab_plans)
 
-        request_log_result = run_request_log_comparison(case_id, appeal_number, conn, tab_config=tab_configs["request_log"])
-        if request_log_result:
-            case_results["request_log"] = request_log_result["request_log"]
-
-        discussion_result = run_discussion_comparison(case_id, appeal_number, conn, tab_config=tab_configs["discussion"])
-        if discussion_result:
-            case_results["discussion"] = discussion_result["discussion"]
-
-        decision_result = run_decision_comparison(case_id, appeal_number, conn, tab_config=tab_configs["decision"])
-        if decision_result:
-            case_results["decision"] = decision_result["decision"]
-
-        #document_result = run_document_comparison(case_id, appeal_number, conn, tab_config=tab_configs["document"])
-        # if document_result:
-        #     case_results["document"] = document_result["document"]
-
-        representator_result = run_representator_comparison(case_id, appeal_number, conn, tab_config=tab_configs["representator_log"])
-        representator_section = representator_result.get(str(case_id), {})
-        if "representator_log" in representator_section:
-            case_results["representator_log"] = representator_section["representator_log"]
-
-        case_contact_result = run_case_involved_comparison(case_id, appeal_number, conn, tab_config=tab_configs["case_contact"])
-        case_contact_section = case_contact_result.get(str(case_id), {})
-        if "case_contact" in case_contact_section:
-            case_results["case_contact"] = case_contact_section["case_contact"]
-
-        # # inside your main flow (per case_id)
-
-        
-        distribution_result = run_distribution_comparison(case_id, appeal_number, conn,tab_config=tab_configs.get("distribution"))
-
-        if distribution_result:
-            case_results["distribution"] = distribution_result["distribution"]
-
-
-        return case_id, case_results
+            return case_id, case_results
 
     except Exception as e:
         log_and_print(f"❌ Unexpected error during case_id {case_id}: {e}", "error")
         return case_id, {}
-    finally:
-        conn.close()
+
+
+def prefetch_menora_frames(case_ids, batch_size=500, use_snapshots=False):
+    """
+    Bulk extraction mode: runs each Menora tab query once per batch of case_ids
+    and returns {case_id: {tab: DataFrame}} for process_case.
+    With use_snapshots, cases whose snapshot key is unchanged are read from local
+    Parquet snapshots and only the remaining cases are queried (and snapshotted).
+    """
+    snapshots = MenoraSnapshotStore() if use_snapshots else None
+    if snapshots is not None and not snapshots.available:
+        log_and_print("⚠️ MENORA_SNAPSHOT needs pyarrow; querying Menora without snapshots", "warning")
+        snapshots = None
+    tab_queries = {tab: tab_query(tab) for tab in DEFAULT_BULK_TABS}
+
+    menora_frames = {}
+    with get_connection_pool().connection() as conn:
+        for start in range(0, len(case_ids), batch_size):
+            batch = case_ids[start:start + batch_size]
+            to_query = batch
+            keys = {}
+
+            if snapshots is not None:
+                keys = fetch_snapshot_keys(batch, conn)
+                to_query = []
+                for case_id in batch:
+                    frames = snapshots.load(case_id, keys[case_id], tab_queries) if case_id in keys else None
+                    if frames is None:
+                        to_query.append(case_id)
+                    else:
+                        menora_frames[case_id] = frames
+
+            if not to_query:
+                continue
+            log_and_print(f"📦 Bulk-fetching Menora data for {len(to_query)} cases ({start + 1}-{start + len(batch)} of {len(case_ids)})...", "info")
+            batch_frames = fetch_menora_bulk(to_query, conn)
+            menora_frames.update(batch_frames)
+
+            if snapshots is not None:
+                for case_id in to_query:
+                    if case_id in keys and len(batch_frames[case_id]) == len(tab_queries):  # only complete fetches
+                        snapshots.save(case_id, keys[case_id], batch_frames[case_id], tab_queries)
+
+    if snapshots is not None:
+        snapshots.log_summary()
+    return menora_frames
+
+
+def case_status(tabs):
+    """
+    Overall status of one case from its {tab: result}: "fail" when any tab neither passed
+    nor was skipped (runner errors included), else "skip" when any tab was skipped, else "pass".
+    """
+    statuses = [result.get("status_tab", "skip") for result in tabs.values()]
+    if any(status not in ("pass", "skip") for status in statuses):
+        return "fail"
+    if "skip" in statuses:
+        return "skip"
+    return "pass"
 
 
 def create_excel_summary_from_json(json_path="comparison_summary.json", excel_path="comparison_summary.xlsx"):
@@ -127,25 +157,11 @@ def create_excel_summary_from_json(json_path="comparison_summary.json", excel_pa
     for case_id, tabs in comparison_data.items():
         case_summary = {
             "מספר תיק": case_id,
-            "סטטוס כללי": "pass"
+            "סטטוס כללי": case_status(tabs)
         }
 
-        has_fail = False
-        has_skip = False
-
         for tab, result in tabs.items():
-            status = result.get("status_tab", "skip")
-            case_summary[tab] = status
-
-            if status == "fail":
-                has_fail = True
-            elif status == "skip":
-                has_skip = True
-
-        if has_fail:
-            case_summary["סטטוס כללי"] = "fail"
-        elif has_skip:
-            case_summary["סטטוס כללי"] = "skip"
+            case_summary[tab] = result.get("status_tab", "skip")
 
         summary_rows.append(case_summary)
 
@@ -170,7 +186,89 @@ def create_excel_summary_from_json(json_path="comparison_summary.json", excel_pa
     log_and_print(f"📁 Excel summary saved to: {excel_path}", "success")
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare Menora conversion data against the back-office APIs.")
+    parser.add_argument("--results-log", default=DEFAULT_RESULTS_LOG,
+                        help="JSONL file each finished case is appended to (default: %(default)s)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip case_ids already present in the results log and append to it")
+    parser.add_argument("--max-age-hours", type=float,
+                        help="Revalidate cached API payloads older than this (default: cachePolicy TTLs in tab_config.json)")
+
+    add_case_source_arguments(parser, "case source (default: the list in main.py)")
+
+    distributed = parser.add_argument_group("multi-node runs")
+    distributed.add_argument("--shard", help="Only run shard i of N (0-based), e.g. 0/4")
+    distributed.add_argument("--queue", help="Shared SQLite queue file; workers claim case_ids from it until empty")
+    distributed.add_argument("--worker-id", help="Worker name in the queue and results log (default: host-pid)")
+    distributed.add_argument("--queue-batch", type=int, default=int(os.getenv("QUEUE_BATCH_SIZE", "20")),
+                             help="case_ids claimed per queue round trip (default: %(default)s)")
+    distributed.add_argument("--merge", nargs="+", metavar="RESULTS_LOG",
+                             help="Merge shard results logs into comparison_summary.json and exit")
+    return parser.parse_args(argv)
+
+
+def run_cases(case_ids, tab_configs, results_log, controller, executor, max_age_hours=None, tab_plans=None):
+    """
+    Runs one list of cases (the whole run, or one claimed queue batch) and appends each
+    finished case to results_log. controller and executor are created once per run in
+    main(), so queue batches share one adaptive limit and one thread pool.
+
+    Returns:
+        list: case_ids that produced no results (failed); they are not written to results_log.
+    """
+    if os.getenv("ASYNC_FETCH", "false").lower() == "true":
+        from utils.async_fetcher import prefetch_cases_async
+        prefetch_cases_async(case_ids, max_age_hours=max_age_hours)
+
+    menora_frames = {}
+    use_snapshots = os.getenv("MENORA_SNAPSHOT", "false").lower() == "true"
+    if os.getenv("MENORA_BULK", "false").lower() == "true" or use_snapshots:
+        batch_size = int(os.getenv("MENORA_BULK_BATCH_SIZE", "500"))
+        menora_frames = prefetch_menora_frames(case_ids, batch_size, use_snapshots)
+
+    if os.getenv("PIPELINE", "false").lower() == "true":
+        failed = []
+        for case_id, case_results in run_pipeline(case_ids, tab_configs, menora_frames, max_age_hours=max_age_hours, tab_plans=tab_plans):
+            if case_results:
+                results_log.append(case_id, case_results)
+            else:
+                failed.append(case_id)
+        return failed
+
+    failed = []
+    futures = set()
+    for case_id in case_ids:
+        controller.acquire()  # blocks while the current concurrency limit is reached
+        future = executor.submit(process_case, case_id, tab_configs, menora_frames.get(case_id), max_age_hours, tab_plans)
+        future.add_done_callback(lambda _: controller.release())
+        futures.add(future)
+
+        for done_future in [f for f in futures if f.done()]:
+            futures.discard(done_future)
+            done_case_id, case_results = done_future.result()
+            if case_results:
+                results_log.append(done_case_id, case_results)
+            else:
+                failed.append(done_case_id)
+
+    for future in as_completed(futures):
+        case_id, case_results = future.result()
+        if case_results:
+            results_log.append(case_id, case_results)
+        else:
+            failed.append(case_id)
+    return failed
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.merge:
+        merge_results_logs(args.merge, "comparison_summary.json")
+        create_excel_summary_from_json()
+        return
+
     #load_configuration()
     #case_ids = [2005049,2004905,2005468]
     #20.5 תיקי הסבה סגורים + API
@@ -293,25 +391,64 @@ def main():
         "case_contact": load_tab_config("עורר פרטי קשר"),
         "distribution": load_tab_config("הפצות")
     }
+    # Compile config-driven tabs once up front so a bad plan fails before any case runs.
+    tab_plans = compile_tab_plans(tab_configs)
+    log_and_print(f"🧩 Compiled tab plans: {sorted(tab_plans)}", "debug")
+
+    case_ids = resolve_case_ids(args, case_ids)
+
+    if args.shard:
+        shard_index, shard_count = parse_shard(args.shard)
+        case_ids = shard_case_ids(case_ids, shard_index, shard_count)
+        log_and_print(f"🧩 Shard {shard_index}/{shard_count}: {len(case_ids)} cases", "info")
+
+    worker_id = args.worker_id or default_worker_id()
+    results_log_path = args.results_log
+    if results_log_path == DEFAULT_RESULTS_LOG:
+        # Each shard/worker writes its own log; --merge combines them into one summary.
+        if args.shard:
+            results_log_path = shard_results_log_path(results_log_path, f"shard-{shard_index}-of-{shard_count}")
+        elif args.queue:
+            results_log_path = shard_results_log_path(results_log_path, worker_id)
+
+    if args.resume:
+        if args.queue and results_log_path != args.results_log:
+            # Queue workers get a new pid-based log per run: resume from every worker's log.
+            done = set().union(*(completed_case_ids(path) for path in shard_results_logs(args.results_log)))
+        else:
+            done = completed_case_ids(results_log_path)
+        case_ids = [case_id for case_id in case_ids if case_id not in done]
+        log_and_print(f"⏩ Resuming: {len(done)} cases already in {results_log_path}, {len(case_ids)} left", "info")
+
+    controller = create_controller()
+    with ThreadPoolExecutor(max_workers=controller.ceiling) as executor, \
+            ResultsLog(results_log_path, resume=args.resume) as results_log:
+        if args.queue:
+            work_queue = SqliteWorkQueue(args.queue)
+            added = work_queue.enqueue(case_ids)
+            log_and_print(f"📋 Worker {worker_id} joined queue {args.queue} ({added} new cases enqueued)", "info")
+            while True:
+                batch = work_queue.claim(worker_id, args.queue_batch)
+                if not batch:
+                    break
+                failed = run_cases(batch, tab_configs, results_log, controller, executor, args.max_age_hours, tab_plans)
+                results_log.sync()  # results are durable before the queue marks them done
+                work_queue.complete([case_id for case_id in batch if case_id not in failed])
+                work_queue.fail(failed)
+                work_queue.log_progress()
+            work_queue.close()
+        else:
+            run_cases(case_ids, tab_configs, results_log, controller, executor, args.max_age_hours, tab_plans)
+
+    controller.log_summary()
+    get_connection_pool().log_metrics()
+    log_cache_stats()
+
+    if args.shard or args.queue:
+        log_and_print(f"✅ Worker finished; results in {results_log_path}. Combine all shards with: python main.py --merge <logs...>", "success")
+        return
 
-    dashboard_results = {}
-
-    with ThreadPoolExecutor(max_workers=6) as executor:
-        futures = [executor.submit(process_case, case_id, tab_configs) for case_id in case_ids]
-        for future in as_completed(futures):
-            case_id, case_results = future.result()
-            if case_results:
-                dashboard_results[str(case_id)] = case_results
-
-    with open("comparison_summary.json", "w", encoding="utf-8") as f:
-        #json.dump(dashboard_results, f, indent=2, ensure_ascii=False)
-        import pandas as pd
-        def convert_timestamps(obj):
-            if isinstance(obj, pd.Timestamp):
-                return obj.isoformat()
-            raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
-
-        json.dump(dashboard_results, f, indent=2, ensure_ascii=False, default=convert_timestamps)
+    compact_results_log(results_log_path, "comparison_summary.json")
 
     log_and_print("✅ All comparisons completed. Use streamlit run dashboard_app.py to view results.", "success")
     create_excel_summary_from_json()
@@ -0,0 +1,64 @@
+# prewarm.py
+"""
+Fills the local API cache for a case list before a comparison run, so the run itself
+reads every payload from disk:
+
+    python prewarm.py --cases-file cases.txt --rate-per-host 10
+"""
+import argparse
+import os
+from dotenv import load_dotenv
+from utils.async_fetcher import prefetch_cases_async, ASYNC_PER_HOST_LIMIT
+from utils.case_source import add_case_source_arguments, resolve_case_ids
+from utils.fetcher import log_cache_stats
+from utils.logging_utils import log_and_print
+
+load_dotenv()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Download every API payload the comparison runners need into the cache.")
+    add_case_source_arguments(parser)
+    parser.add_argument("--rate-per-host", type=float, default=float(os.getenv("PREWARM_RATE_PER_HOST", "10")),
+                        help="Max requests per second against each back-office host, 0 = unlimited (default: %(default)s)")
+    parser.add_argument("--per-host-limit", type=int, default=ASYNC_PER_HOST_LIMIT,
+                        help="Max concurrent connections per host (default: %(default)s)")
+    parser.add_argument("--skip-documents", action="store_true",
+                        help="Do not download documents (the document tab is currently disabled)")
+    parser.add_argument("--force-refresh", action="store_true",
+                        help="Download everything again, ignoring the cache")
+    parser.add_argument("--max-age-hours", type=float,
+                        help="Revalidate cached payloads older than this (default: cachePolicy TTLs in tab_config.json)")
+    parser.add_argument("--progress-every", type=int, default=50,
+                        help="Log progress every N cases (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    case_ids = resolve_case_ids(args)
+    if not case_ids:
+        log_and_print("❌ No case_ids given; use --cases-file, --cases-query or --case-range", "error")
+        return 1
+
+    log_and_print(f"🔥 Pre-warming cache for {len(case_ids)} cases ({args.rate_per_host:g} req/s per host)", "info")
+    failed = prefetch_cases_async(
+        case_ids,
+        force_refresh=args.force_refresh,
+        include_documents=not args.skip_documents,
+        per_host_limit=args.per_host_limit,
+        max_age_hours=args.max_age_hours,
+        rate_per_host=args.rate_per_host,
+        progress_every=args.progress_every,
+    )
+    log_cache_stats()
+
+    if failed:
+        log_and_print(f"⚠️ {len(failed)} cases have no case JSON: {sorted(failed)[:20]}{' ...' if len(failed) > 20 else ''}", "warning")
+        return 1
+    log_and_print("✅ Cache pre-warmed. Run main.py with the same case list to compare from local data.", "success")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,180 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+from apis.sql_client import get_appeal_number, MENORA_TAB_FETCHERS
+from runners.requestlog_runner import run_request_log_comparison
+from runners.discussion_runner import run_discussion_comparison
+from runners.decision_runner import run_decision_comparison
+from runners.document_runner import run_document_comparison
+from runners.distribution_runner import run_distribution_comparison
+from runners.case_representator_runner import run_representator_comparison
+from runners.case_involved_runner import run_case_involved_comparison
+from utils.logging_utils import log_and_print
+from utils.sql_connection import get_connection_pool
+from utils.json_parser import get_contact_lookup_ids
+from utils.case_context import CaseContext
+
+load_dotenv()
+
+CASE_GRAPH_WORKERS = int(os.getenv("CASE_GRAPH_WORKERS", "4"))
+
+# Tab node → runner and the API payloads it reads. Every tab also depends on its own
+# Menora frame ("menora:<tab>") and on the appeal number. Listed in result order.
+TAB_NODES = {
+    "request_log": {"runner": run_request_log_comparison, "data": ["case_json"]},
+    "discussion": {"runner": run_discussion_comparison, "data": ["discussions"]},
+    "decision": {"runner": run_decision_comparison, "data": ["case_json"]},
+    "document": {"runner": run_document_comparison, "data": ["case_json", "documents"]},
+    "representator_log": {"runner": run_representator_comparison, "data": ["case_json"]},
+    "case_contact": {"runner": run_case_involved_comparison, "data": ["case_json", "contacts"]},
+    "distribution": {"runner": run_distribution_comparison, "data": ["distributions"]},
+}
+
+# The document runner is disabled in process_case as well.
+ENABLED_TABS = ["request_log", "discussion", "decision", "representator_log", "case_contact", "distribution"]
+
+
+def run_task_graph(nodes, max_workers=CASE_GRAPH_WORKERS):
+    """
+    Runs {name: (deps, fn)} nodes on a thread pool, each as soon as all of its deps are done.
+    fn receives {dep_name: value}. A failed node only fails the nodes that depend on it
+    (they are not started); the others still run.
+
+    Returns:
+        (results, errors): {name: value} for finished nodes, {name: exception} for failed ones
+        (dependents of a failed node carry its exception).
+    """
+    results = {}
+    errors = {}
+    remaining = dict(nodes)
+
+    def fail_dependents():
+        changed = True
+        while changed:
+            changed = False
+            for name, (deps, _) in list(remaining.items()):
+                failed_dep = next((dep for dep in deps if dep in errors), None)
+                if failed_dep is not None:
+                    del remaining[name]
+                    errors[name] = errors[failed_dep]
+                    log_and_print(f"⚠️ Node '{name}' skipped: dependency '{failed_dep}' failed", "warning")
+                    changed = True
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        while remaining or running:
+            fail_dependents()
+            ready = [name for name, (deps, _) in remaining.items() if all(dep in results for dep in deps)]
+            for name in ready:
+                deps, fn = remaining.pop(name)
+                running[executor.submit(fn, {dep: results[dep] for dep in deps})] = name
+
+            if not running:
+                if remaining:
+                    raise ValueError(f"Unresolvable dependencies for nodes: {sorted(remaining)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    log_and_print(f"❌ Node '{name}' failed: {e}", "error")
+                    errors[name] = e
+
+    return results, errors
+
+
+def build_case_graph(case_id, tab_configs, menora_frames=None, context=None, tabs=None, tab_plans=None):
+    """
+    Declares the data and tab nodes for one case. Data nodes load the case JSON, API payloads,
+    appeal number and Menora frames (each SQL node borrows its own pooled connection);
+    tab nodes run a runner once its inputs are loaded.
+    """
+    if tabs is None:
+        tabs = ENABLED_TABS
+    if context is None:
+        context = CaseContext(case_id)
+    menora_frames = menora_frames or {}
+    tab_plans = tab_plans or {}
+
+    def load_menora(tab):
+        def load(_):
+            if tab in menora_frames:
+                return menora_frames[tab]
+            with get_connection_pool().connection() as conn:
+                return MENORA_TAB_FETCHERS[tab](case_id, None, conn)
+        return load
+
+    def load_appeal_number(_):
+        if "appeal" in menora_frames:
+            return get_appeal_number(case_id, None, menora_frames)
+        with get_connection_pool().connection() as conn:
+            return get_appeal_number(case_id, conn)
+
+    def load_contacts(_):
+        if not context.case_json:  # 404/401/error: no representors to look up
+            return {}
+        role_ids, connect_ids = get_contact_lookup_ids(context.contact_representors)
+        if role_ids:
+            return context.role_contacts(role_ids)
+        if connect_ids:
+            return context.connect_contacts(connect_ids)
+        return {}
+
+    nodes = {
+        "appeal_number": ([], load_appeal_number),
+        "case_json": ([], lambda _: context.case_json),
+        "discussions": ([], lambda _: context.discussions),
+        "distributions": ([], lambda _: context.distributions),
+        "documents": (["case_json"], lambda _: context.documents),
+        "contacts": (["case_json"], load_contacts),
+    }
+
+    def run_tab(tab):
+        def run(inputs):
+            frames = {tab: inputs[f"menora:{tab}"]}
+            result = TAB_NODES[tab]["runner"](
+                case_id, inputs["appeal_number"], None,
+                tab_config=tab_configs.get(tab), menora_frames=frames, context=context, tab_plan=tab_plans.get(tab)
+            )
+            return result[tab] if result else None
+        return run
+
+    for tab in tabs:
+        nodes[f"menora:{tab}"] = ([], load_menora(tab))
+        deps = ["appeal_number", f"menora:{tab}", *TAB_NODES[tab]["data"]]
+        nodes[f"tab:{tab}"] = (deps, run_tab(tab))
+
+    # Only keep data nodes some tab actually needs (e.g. skip documents while that tab is disabled).
+    needed = set()
+    pending = [f"tab:{tab}" for tab in tabs]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(nodes[name][0])
+    return {name: node for name, node in nodes.items() if name in needed}
+
+
+def run_case_graph(case_id, tab_configs, menora_frames=None, context=None, max_workers=CASE_GRAPH_WORKERS, tab_plans=None):
+    """
+    Runs all enabled tabs of one case concurrently, bounded by their data dependencies,
+    so per-case latency approaches the slowest tab rather than the sum of all tabs.
+
+    Returns:
+        dict: {tab: result} in the same shape and order as run_case_tabs. A tab whose
+        runner or input nodes failed gets {"status_tab": "fail", "error": ...}.
+    """
+    nodes = build_case_graph(case_id, tab_configs, menora_frames, context, tab_plans=tab_plans)
+    results, errors = run_task_graph(nodes, max_workers)
+
+    case_results = {}
+    for tab in ENABLED_TABS:
+        node = f"tab:{tab}"
+        if node in errors:
+            case_results[tab] = {"status_tab": "fail", "error": str(errors[node])}
+        elif results.get(node):
+            case_results[tab] = results[node]
+    return case_results
@@ -0,0 +1,84 @@
+from apis.sql_client import get_appeal_number, fetch_menora_case_frames
+from runners.requestlog_runner import run_request_log_comparison
+from runners.discussion_runner import run_discussion_comparison
+from runners.decision_runner import run_decision_comparison
+from runners.document_runner import run_document_comparison
+from runners.distribution_runner import run_distribution_comparison
+from runners.case_representator_runner import run_representator_comparison
+from runners.case_involved_runner import run_case_involved_comparison
+from utils.logging_utils import log_and_print
+from utils.case_context import CaseContext
+
+
+def run_case_tabs(case_id, appeal_number, conn, tab_configs, menora_frames=None, context=None, tab_plans=None):
+    """
+    Runs every tab comparison for one case and returns {tab: result}.
+    With a complete menora_frames dict the runners never touch conn, so conn may be None.
+    All runners share one CaseContext, so the case JSON is loaded and parsed once.
+    tab_plans: {tab: TabPlan} from compile_tab_plans, passed to the runners.
+    """
+    if context is None:
+        context = CaseContext(case_id)
+    tab_plans = tab_plans or {}
+
+    case_results = {}
+
+    request_log_result = run_request_log_comparison(case_id, appeal_number, conn, tab_config=tab_configs["request_log"], menora_frames=menora_frames, context=context, tab_plan=tab_plans.get("request_log"))
+    if request_log_result:
+        case_results["request_log"] = request_log_result["request_log"]
+
+    discussion_result = run_discussion_comparison(case_id, appeal_number, conn, tab_config=tab_configs["discussion"], menora_frames=menora_frames, context=context, tab_plan=tab_plans.get("discussion"))
+    if discussion_result:
+        case_results["discussion"] = discussion_result["discussion"]
+
+    decision_result = run_decision_comparison(case_id, appeal_number, conn, tab_config=tab_configs["decision"], menora_frames=menora_frames, context=context, tab_plan=tab_plans.get("decision"))
+    if decision_result:
+        case_results["decision"] = decision_result["decision"]
+
+    #document_result = run_document_comparison(case_id, appeal_number, conn, tab_config=tab_configs["document"])
+    # if document_result:
+    #     case_results["document"] = document_result["document"]
+
+    representator_result = run_representator_comparison(case_id, appeal_number, conn, tab_config=tab_configs["representator_log"], menora_frames=menora_frames, context=context, tab_plan=tab_plans.get("representator_log"))
+    if representator_result:
+        case_results["representator_log"] = representator_result["representator_log"]
+
+    case_contact_result = run_case_involved_comparison(case_id, appeal_number, conn, tab_config=tab_configs["case_contact"], menora_frames=menora_frames, context=context, tab_plan=tab_plans.get("case_contact"))
+    if case_contact_result:
+        case_results["case_contact"] = case_contact_result["case_contact"]
+
+    distribution_result = run_distribution_comparison(case_id, appeal_number, conn, tab_config=tab_configs.get("distribution"), menora_frames=menora_frames, context=context, tab_plan=tab_plans.get("distribution"))
+    if distribution_result:
+        case_results["distribution"] = distribution_result["distribution"]
+
+    return case_results
+
+
+def collect_case_inputs(case_id, conn, menora_frames=None, max_age_hours=None):
+    """
+    I/O stage: loads the appeal number, all Menora frames and every API payload the
+    runners read (preloaded into a CaseContext) for one case.
+
+    Returns:
+        dict: {"appeal_number": ..., "menora_frames": {tab: DataFrame}, "context": CaseContext}
+    """
+    log_and_print(f"\n\n📡 Collecting inputs for case_id {case_id}...", "info")
+    appeal_number = get_appeal_number(case_id, conn, menora_frames)
+    frames = fetch_menora_case_frames(case_id, appeal_number, conn, menora_frames=menora_frames)
+
+    context = CaseContext(case_id, max_age_hours=max_age_hours).preload()
+
+    return {"appeal_number": appeal_number, "menora_frames": frames, "context": context}
+
+
+def compare_case(case_id, appeal_number, tab_configs, menora_frames, context=None, tab_plans=None):
+    """
+    CPU stage: runs the tab comparisons on pre-collected inputs, without a SQL connection.
+    Safe to run in a worker process.
+    """
+    try:
+        log_and_print(f"\n\n🔁 Comparing case_id {case_id}...", "info")
+        return case_id, run_case_tabs(case_id, appeal_number, None, tab_configs, menora_frames, context, tab_plans)
+    except Exception as e:
+        log_and_print(f"❌ Unexpected error during case_id {case_id}: {e}", "error")
+        return case_id, {}
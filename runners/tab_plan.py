@@ -0,0 +1,494 @@
+# tab_plan.py
+import json
+import threading
+import pandas as pd
+from jsonpath_ng import parse as jsonpath_parse
+from apis.sql_client import MENORA_TAB_FETCHERS, get_menora_frame
+from utils.case_context import CaseContext
+from utils.comparison_engine import (
+    column_kinds, compare_fields, comparison_records, dedupe_reverse_mismatches, mismatch_records, MISSING, NORMALIZERS
+)
+from utils.cutoff import CutoffIndex, describe_window, load_cutoff_window, outside_window
+from utils.date_utils import format_dates, parse_date, parse_dates
+from utils.json_parser import (
+    extract_decision_data_from_json, extract_document_data_from_json, extract_request_logs_from_json,
+    get_contact_lookup_ids, is_case_type_supported, is_case_type_support_doc
+)
+from utils.logging_utils import log_and_print
+
+
+def _extract_decisions(context):
+    case_json = context.case_json
+    return extract_decision_data_from_json(case_json) if case_json else pd.DataFrame()
+
+
+def _extract_documents(context):
+    documents = (context.documents or {}).get("documentList")
+    if not documents:
+        log_and_print("⚠️ No 'documentList' found in JSON.", "warning")
+        return None
+    return extract_document_data_from_json(documents)
+
+
+def _extract_discussions(context):
+    json_data = context.discussions
+    if not json_data:
+        return pd.DataFrame()
+    matches = json_data if isinstance(json_data, list) else [match.value for match in jsonpath_parse("$[*]").find(json_data)]
+    return pd.json_normalize(matches)
+
+
+def _extract_request_logs(context):
+    return extract_request_logs_from_json(context.case_json)
+
+
+def _active_representors(case_json):
+    """
+    (orer representor, meshiva representor, every active representor): the first active
+    representor of the first other involved party is the orer's, רשות המיסים's is the meshiva's.
+    """
+    orer_rep = {}
+    meshiva_rep = {}
+    all_active_representors = []
+    for ci in case_json.get("caseInvolveds", []):
+        active_reps = [r for r in ci.get("representors", []) if r.get("appointmentEndDate") is None]
+        all_active_representors.extend(active_reps)
+        if ci.get("caseInvolvedName", "").strip() == "רשות המיסים":
+            if active_reps:
+                meshiva_rep = active_reps[0]
+        elif not orer_rep and active_reps:
+            orer_rep = active_reps[0]
+    return orer_rep, meshiva_rep, all_active_representors
+
+
+def _extract_representators(context):
+    orer_rep, meshiva_rep, _ = _active_representors(context.case_json)
+    return pd.DataFrame([{
+        "orerID": orer_rep.get("caseInvolvedIdentifyId"),
+        "orer": orer_rep.get("caseInvolvedName", ""),
+        "meshiva": meshiva_rep.get("caseInvolvedName", ""),
+        "meshivaID": meshiva_rep.get("caseInvolvedIdentifyId"),
+    }], dtype=object)
+
+
+def _extract_contacts(context):
+    representors = context.contact_representors
+    role_ids, connect_ids = get_contact_lookup_ids(representors)
+
+    records = []
+    if role_ids:
+        for role in context.role_contacts(role_ids).get("roleInCorporationDetails", []):
+            connect_details = role.get("connectDetails", {})
+            records.append({
+                "Main_Id_Number": str(role.get("corporationDetails", {}).get("corporationIDNumber")).zfill(9),
+                "mail": connect_details.get("mail"),
+                "primaryPhone": connect_details.get("primaryPhone"),
+                "secondaryPhone": connect_details.get("secondaryPhone"),
+            })
+    else:
+        connect_map = {r.get("connectDetailsId"): r.get("caseInvolvedIdentifyId")
+                       for r in representors if r.get("connectDetailsId") and r.get("caseInvolvedIdentifyId")}
+        for details in context.connect_contacts(connect_ids).get("connectDetails", []):
+            records.append({
+                "Main_Id_Number": str(connect_map.get(details.get("connectDetailsId"))).zfill(9),
+                "mail": details.get("mail"),
+                "primaryPhone": details.get("primaryPhone"),
+                "secondaryPhone": details.get("secondaryPhone"),
+            })
+    return pd.DataFrame(records)
+
+
+def _extract_distributions(context):
+    json_df = pd.json_normalize(context.distributions)
+    if "createDate" not in json_df.columns:
+        log_and_print("❌ JSON key 'createDate' not found in distribution data. Returning empty comparison.", "warning")
+        return None
+    return json_df
+
+
+# plan.extractor → fn(CaseContext) → JSON frame (None: no JSON to compare, see plan.noJson)
+EXTRACTORS = {
+    "decisions": _extract_decisions,
+    "documents": _extract_documents,
+    "discussions": _extract_discussions,
+    "requestLogs": _extract_request_logs,
+    "representators": _extract_representators,
+    "contacts": _extract_contacts,
+    "distributions": _extract_distributions,
+}
+
+
+def _all_active_representors(context):
+    return _active_representors(context.case_json)[2]
+
+
+def _all_active_contact_ids(context):
+    return [str(rep["caseInvolvedIdentifyId"]).zfill(9)
+            for rep in context.contact_representors if rep.get("caseInvolvedIdentifyId")]
+
+
+# plan.extras values → fn(CaseContext) → list reported next to the comparison
+EXTRAS = {
+    "activeRepresentors": _all_active_representors,
+    "activeContactIds": _all_active_contact_ids,
+}
+
+# plan.caseTypeGate → fn(case_id, case_json=...) → bool; unsupported cases are skipped
+CASE_TYPE_GATES = {
+    "case": is_case_type_supported,
+    "document": is_case_type_support_doc,
+}
+
+def _all_mismatches(results, key_label):
+    return [
+        {"Status_Date": row[key_label], "Field": row["Field"], "Menora": row["Menora Value"], "JSON": row["JSON Value"]}
+        for row in results if row["Match"] == "✗"
+    ]
+
+
+# plan.dedupe → fn(comparison_records rows, key_label) → results-log mismatch rows
+# (module-level functions, so compiled plans pickle into the pipeline's comparison processes)
+DEDUPE_RULES = {
+    "none": _all_mismatches,
+    "reversePairs": dedupe_reverse_mismatches,
+}
+
+
+def default_kind(field):
+    """
+    How a field is compared unless matchingKeys[0].kinds says otherwise (see comparison_engine.NORMALIZERS).
+    """
+    return "date" if field.lower().endswith("date") else "text_ci"
+
+
+class TabPlan:
+    """
+    One tab's comparison compiled from its tab_config.json entry: the "plan" section plus
+    matchingKeys[0] (compared "columns", their "kinds" and the join key's "keyKind").
+    Config errors surface here, at compile time.
+
+    plan keys:
+        label: tab name for logs.
+        extractor: EXTRACTORS name.
+        caseTypeGate: CASE_TYPE_GATES name (optional).
+        menoraKey / jsonKey: join columns (jsonKey may list candidates; the first present is used).
+        keyDates: {"format", "jsonToLocal"}: keys are dates, joined as parse_dates(...) formatted with format.
+        singleRow: true → no keys; the first Menora row is compared with the first JSON row.
+        menoraColumns: {Menora column: new name}, applied when the frame is loaded.
+        columns / kinds: compared columns, instead of matchingKeys[0]'s.
+        jsonExclude: {column: [values whose JSON rows are dropped]}.
+        jsonDates: JSON columns parsed up front.
+        collapseRows: separator → rows sharing a key become one, each compared column holding
+            the distinct stripped values, sorted and joined with the separator.
+        compareFields: false → compare ids only.
+        defaultKind: NORMALIZERS name for columns without a declared kind (default: default_kind).
+        fillMissing: NaN/None compare (and show) as MISSING, or as the given string.
+        noneEqualsEmpty / display: passed to compare_fields.
+        dedupe: DEDUPE_RULES name (default "none").
+        keyLabel: key name in mismatched_fields (default "Status_Date"; null leaves it out).
+        cutoff: {"menoraColumn", "jsonColumn", "keepUnknown", "mismatches"} drops records dated
+            outside the window; {"mode": "status"} keeps them but passes the tab when every
+            discrepancy's key date is outside the window.
+        onError: a failed Menora fetch or JSON extraction compares as an empty frame ("empty",
+            the default) or ends the tab with status "fail" / "error".
+        noJson: when the extractor finds nothing to compare, the tab returns None ("omit",
+            the default) or passes ("pass").
+        extras: {result key: EXTRAS name}, lists added to the result.
+    """
+
+    def __init__(self, tab, tab_config):
+        plan = tab_config.get("plan")
+        if not plan:
+            raise ValueError(f"Tab '{tab}' has no 'plan' section in tab_config.json.")
+
+        self.tab = tab
+        self.label = plan.get("label", tab)
+        self.extract = self._lookup(EXTRACTORS, plan.get("extractor"), "extractor")
+        gate = plan.get("caseTypeGate")
+        self.gate = self._lookup(CASE_TYPE_GATES, gate, "caseTypeGate") if gate else None
+        self.single_row = bool(plan.get("singleRow", False))
+        self.menora_key = None if self.single_row else plan["menoraKey"]
+        json_keys = None if self.single_row else plan["jsonKey"]
+        self.json_keys = [json_keys] if isinstance(json_keys, str) else json_keys
+        key_dates = plan.get("keyDates")
+        self.key_format = key_dates["format"] if key_dates else None
+        self.json_key_to_local = bool(key_dates and key_dates.get("jsonToLocal", False))
+        self.menora_columns = dict(plan.get("menoraColumns", {}))
+        self.json_exclude = {column: list(values) for column, values in plan.get("jsonExclude", {}).items()}
+        self.json_dates = list(plan.get("jsonDates", []))
+        self.collapse_separator = plan.get("collapseRows")
+
+        matching_key = (tab_config.get("matchingKeys") or [{}])[0]
+        if "columns" in plan:
+            matching_key = {"key": matching_key.get("key"), "columns": plan["columns"], "kinds": plan.get("kinds", {})}
+        columns = matching_key.get("columns", {}) if plan.get("compareFields", True) else {}
+        self.fields = [(field, field, json_column) for field, json_column in columns.items()]
+        kind = plan.get("defaultKind")
+        if kind is not None:
+            self._lookup(NORMALIZERS, kind, "defaultKind")
+        try:
+            self.kinds = column_kinds(matching_key, default_kind if kind is None else lambda _: kind)
+        except ValueError as e:
+            raise ValueError(f"Tab '{tab}': {e}") from e
+        key_kind = matching_key.get("keyKind")
+        self.normalize_key = self._lookup(NORMALIZERS, key_kind, "keyKind") if key_kind else None
+        fill_missing = plan.get("fillMissing")
+        self.na_value = fill_missing if isinstance(fill_missing, str) else MISSING if fill_missing else None
+        self.none_equals_empty = bool(plan.get("noneEqualsEmpty", False))
+        self.display = self._choose(plan.get("display", "raw"), ("raw", "text", "normalized"), "display")
+        self.dedupe = self._lookup(DEDUPE_RULES, plan.get("dedupe", "none"), "dedupe")
+        self.key_label = plan.get("keyLabel", "Status_Date")
+
+        cutoff = plan.get("cutoff")
+        self.cutoff = None
+        if cutoff is not None:
+            mode = self._choose(cutoff.get("mode", "filter"), ("filter", "status"), "cutoff mode")
+            self.cutoff = {"mode": mode} if mode == "status" else {
+                "mode": mode,
+                "menora_column": cutoff.get("menoraColumn"),
+                "json_column": cutoff["jsonColumn"],
+                "keep_unknown": bool(cutoff.get("keepUnknown", False)),
+                "mismatches": bool(cutoff.get("mismatches", True)),
+            }
+        self.on_error = self._choose(plan.get("onError", "empty"), ("empty", "fail", "error"), "onError")
+        self.no_json = self._choose(plan.get("noJson", "omit"), ("omit", "pass"), "noJson")
+        self.extras = {key: self._lookup(EXTRAS, name, "extras") for key, name in plan.get("extras", {}).items()}
+
+    def _lookup(self, registry, name, setting):
+        if name not in registry:
+            raise ValueError(f"Tab '{self.tab}': unknown plan {setting} {name!r} (expected one of {sorted(registry)}).")
+        return registry[name]
+
+    def _choose(self, name, choices, setting):
+        return self._lookup(dict(zip(choices, choices)), name, setting)
+
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def get_tab_plan(tab, tab_config):
+    """
+    The compiled plan for a tab, compiled once per process and config.
+    """
+    cache_key = (tab, json.dumps(tab_config, sort_keys=True, ensure_ascii=False))
+    with _plans_lock:
+        plan = _plans.get(cache_key)
+        if plan is None:
+            plan = _plans[cache_key] = TabPlan(tab, tab_config)
+    return plan
+
+
+def compile_tab_plans(tab_configs):
+    """
+    Compiles every tab config that has a "plan" section (at startup, so config errors fail fast).
+    Returns {tab: TabPlan}.
+    """
+    return {tab: get_tab_plan(tab, config) for tab, config in tab_configs.items() if config and "plan" in config}
+
+
+def _prepare(df):
+    df = df.rename(columns=lambda x: x.strip())
+    return df.loc[:, ~df.columns.duplicated()].copy()
+
+
+def _keys(df, column, normalize=None, date_format=None, to_local=False):
+    """
+    The join key as stripped strings, passed through the keyKind normalizer if any, or parsed
+    and formatted with date_format (None where missing, blank or unparseable).
+    """
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    values = df[column]
+    if date_format is not None:
+        values = format_dates(parse_dates(values, to_local=to_local), date_format)
+    keys = values.astype(object).where(values.notna(), None)
+    keys = keys.map(lambda value: None if value is None else str(value).strip())
+    keys = keys.where(keys != "", None)
+    if normalize is not None:
+        present = keys.notna()
+        keys = keys.astype(object)
+        keys[present] = normalize(keys[present]).astype(object)
+    return keys
+
+
+def _collapse(df, keys, columns, separator):
+    """
+    One row per key, in key order: each column holds the key's distinct stripped values,
+    sorted and joined with separator. Returns (frame, keys).
+    """
+    keys = keys[keys.notna()]
+    order = sorted(set(keys))
+    collapsed = pd.DataFrame({
+        column: df.loc[keys.index, column].fillna("").astype(str).str.strip().groupby(keys)
+        .agg(lambda values: separator.join(sorted(values.unique()))).reindex(order)
+        for column in columns if column in df.columns
+    }, index=order)
+    return collapsed.reset_index(drop=True), pd.Series(order, dtype=object)
+
+
+def _compare(plan, menora_df, json_df, menora_keys, json_keys):
+    """
+    comparison_records rows ("mojId", "Field", "Menora Value", "JSON Value", "Match") for the
+    rows present on both sides, in Menora order.
+    """
+    left = pd.DataFrame({"mojId": menora_keys.to_numpy()}, index=menora_df.index)
+    right = pd.DataFrame({"mojId": json_keys.to_numpy()}, index=json_df.index)
+    for field, menora_column, json_column in plan.fields:
+        if menora_column in menora_df.columns:
+            left[f"{field}_menora"] = menora_df[menora_column]
+        if json_column in json_df.columns:
+            right[f"{field}_json"] = json_df[json_column]
+
+    merged = pd.merge(left.dropna(subset=["mojId"]), right.dropna(subset=["mojId"]), on="mojId", how="inner")
+    fields = [(field, f"{field}_menora", f"{field}_json") for field, _, _ in plan.fields]
+    comparison = compare_fields(
+        merged, "mojId", fields, kinds=plan.kinds, na_value=plan.na_value,
+        none_equals_empty=plan.none_equals_empty, display=plan.display
+    )
+
+    mismatched = {}
+    for row in mismatch_records(comparison, "mojId"):
+        mismatched.setdefault(row["mojId"], []).append(row["Field"])
+    if mismatched:
+        log_and_print(f"❌ Found mismatches in {len(mismatched)} {plan.tab} record(s).", "warning")
+        for moj_id, fields in mismatched.items():
+            log_and_print(f"  🔍 mojId {moj_id} mismatched fields: {', '.join(fields)}", "info")
+    elif not comparison.empty:
+        log_and_print(f"✅ All matched {plan.tab} fields are identical.", "success")
+    return comparison_records(comparison, "mojId")
+
+
+def _relabel(rows, key_label):
+    """
+    Renames the "Status_Date" key of mismatch rows to key_label (None drops it).
+    """
+    if key_label == "Status_Date":
+        return rows
+    return [
+        {(key_label if name == "Status_Date" else name): value for name, value in row.items()
+         if name != "Status_Date" or key_label is not None}
+        for row in rows
+    ]
+
+
+def _error_result(plan, error):
+    if plan.on_error == "error":
+        return {plan.tab: {"status_tab": "error", "error": str(error)}}
+    return {plan.tab: {"status_tab": "fail", "missing_json_dates": [], "missing_menora_dates": [], "mismatched_fields": []}}
+
+
+def _issues_outside_window(window, missing_json, missing_menora, mismatched_fields):
+    """
+    True when every discrepancy's key, read as a date, falls outside the cutoff window.
+    """
+    dates = [parse_date(key) for key in missing_json + missing_menora if key]
+    dates += [parse_date(row["Status_Date"]) for row in mismatched_fields if row.get("Status_Date")]
+    return all(outside_window(date, window) for date in dates if date)
+
+
+def run_tab_plan(plan, case_id, appeal_number, conn, menora_frames=None, context=None):
+    """
+    fetch → extract → key → compare → dedupe → cutoff → status, for one case.
+    Returns {tab: result} in the shape of the hand-written runners.
+    """
+    if context is None:
+        context = CaseContext(case_id)
+
+    try:
+        menora_df = _prepare(get_menora_frame(
+            plan.tab, MENORA_TAB_FETCHERS[plan.tab], case_id, appeal_number, conn, menora_frames
+        )).rename(columns=plan.menora_columns)
+        log_and_print(f"✅ Retrieved {len(menora_df)} {plan.tab} row(s) from Menora for appeal {appeal_number}", "success")
+    except Exception as e:
+        log_and_print(f"❌ SQL query execution failed: {e}", "error")
+        if plan.on_error != "empty":
+            return _error_result(plan, e)
+        menora_df = pd.DataFrame()
+
+    if plan.gate and not plan.gate(case_id, case_json=context.case_json):
+        return {plan.tab: {"status_tab": "skip", "reason": "Not relevant case type"}}
+
+    extras = {key: [] for key in plan.extras}
+    try:
+        for key, extra in plan.extras.items():
+            extras[key] = extra(context)
+        json_df = plan.extract(context)
+    except Exception as e:
+        log_and_print(f"❌ Failed to parse JSON {plan.tab} data: {e}", "error")
+        if plan.on_error != "empty":
+            return _error_result(plan, e)
+        json_df = pd.DataFrame()
+    if json_df is None:
+        if plan.no_json == "omit":
+            return None
+        return {plan.tab: {"status_tab": "pass", "missing_json_dates": [], "missing_menora_dates": [], "mismatched_fields": []}}
+    json_df = _prepare(json_df)
+
+    for column, values in plan.json_exclude.items():
+        if column in json_df.columns:
+            before_count = len(json_df)
+            json_df = json_df[~json_df[column].isin(values)].copy()
+            if before_count > len(json_df):
+                log_and_print(f"⚠️ Skipped {before_count - len(json_df)} JSON {plan.tab} row(s) with {column} in {values}", "debug")
+
+    for column in plan.json_dates:
+        if column in json_df.columns:
+            json_df[column] = parse_dates(json_df[column])
+
+    if plan.single_row:
+        menora_df, json_df = menora_df.head(1), json_df.head(1)
+        menora_keys = pd.Series("", index=menora_df.index, dtype=object)
+        json_keys = pd.Series("", index=json_df.index, dtype=object)
+        missing_json, missing_menora = [], []
+    else:
+        json_key = next((column for column in plan.json_keys if column in json_df.columns), plan.json_keys[0])
+        menora_keys = _keys(menora_df, plan.menora_key, plan.normalize_key, plan.key_format)
+        json_keys = _keys(json_df, json_key, plan.normalize_key, plan.key_format, plan.json_key_to_local)
+        if plan.collapse_separator is not None:
+            menora_df, menora_keys = _collapse(menora_df, menora_keys, [column for _, column, _ in plan.fields], plan.collapse_separator)
+            json_df, json_keys = _collapse(json_df, json_keys, [column for _, _, column in plan.fields], plan.collapse_separator)
+        menora_ids, json_ids = set(menora_keys.dropna()), set(json_keys.dropna())
+        missing_json = sorted(menora_ids - json_ids)
+        missing_menora = sorted(json_ids - menora_ids)
+
+    mismatched_fields = []
+    if plan.fields and not menora_df.empty and not json_df.empty:
+        mismatched_fields = plan.dedupe(_compare(plan, menora_df, json_df, menora_keys, json_keys), "mojId")
+
+    ignored_by_policy = False
+    if plan.cutoff:
+        window = load_cutoff_window()
+        if plan.cutoff["mode"] == "status":
+            ignored_by_policy = _issues_outside_window(window, missing_json, missing_menora, mismatched_fields)
+        else:
+            keep_unknown = plan.cutoff["keep_unknown"]
+            json_dates = CutoffIndex(json_df.assign(_key=json_keys), plan.cutoff["json_column"], id_column="_key")
+            menora_dates = json_dates
+            if plan.cutoff["menora_column"]:
+                menora_dates = CutoffIndex(menora_df.assign(_key=menora_keys), plan.cutoff["menora_column"], id_column="_key")
+            missing_json = menora_dates.filter(missing_json, window, keep_unknown, label="Missing in JSON")
+            missing_menora = json_dates.filter(missing_menora, window, keep_unknown, label="Missing in Menora")
+            if plan.cutoff["mismatches"]:
+                keep = json_dates.in_window([row["Status_Date"] for row in mismatched_fields], window, keep_unknown)
+                mismatched_fields = [row for row, kept in zip(mismatched_fields, keep) if kept]
+
+    if not missing_json and not missing_menora and not mismatched_fields:
+        status_tab = "pass"
+        log_and_print(f"🟡 {plan.label} - PASS", "info", is_hebrew=True)
+    elif ignored_by_policy:
+        status_tab = "pass"
+        log_and_print(f"✅ Discrepancies occurred {describe_window(window)}. Ignored by policy.", "info")
+    else:
+        status_tab = "fail"
+        log_and_print(f"❌ {plan.label} - FAIL", "warning", is_hebrew=True)
+
+    return {
+        plan.tab: {
+            "status_tab": status_tab,
+            "missing_json_dates": missing_json,
+            "missing_menora_dates": missing_menora,
+            "mismatched_fields": _relabel(mismatched_fields, plan.key_label),
+            **extras
+        }
+    }
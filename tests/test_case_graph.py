@@ -0,0 +1,79 @@
+# test_case_graph.py
+import pytest
+from main import case_status
+from runners import case_graph
+from runners.case_graph import ENABLED_TABS, run_case_graph, run_task_graph
+
+
+def fail(_):
+    raise RuntimeError("down")
+
+
+def test_graph_passes_dependency_results():
+    nodes = {
+        "a": ([], lambda _: 1),
+        "b": (["a"], lambda inputs: inputs["a"] + 1),
+        "c": (["a", "b"], lambda inputs: inputs["a"] + inputs["b"]),
+    }
+    assert run_task_graph(nodes, max_workers=2) == ({"a": 1, "b": 2, "c": 3}, {})
+
+
+def test_dependents_of_a_failed_node_are_not_run():
+    started = []
+    nodes = {
+        "bad": ([], fail),
+        "child": (["bad"], lambda _: started.append("child")),
+        "grandchild": (["child"], lambda _: started.append("grandchild")),
+        "other": ([], lambda _: "ok"),
+        "other_child": (["other"], lambda inputs: inputs["other"] * 2),
+    }
+    results, errors = run_task_graph(nodes, max_workers=2)
+
+    assert started == []
+    assert set(errors) == {"bad", "child", "grandchild"}
+    assert all(str(error) == "down" for error in errors.values())  # dependents carry the cause
+    assert results == {"other": "ok", "other_child": "okok"}  # the unrelated branch still finishes
+
+
+def test_unresolvable_dependencies_raise():
+    with pytest.raises(ValueError, match="Unresolvable"):
+        run_task_graph({"a": (["missing"], lambda _: 1)}, max_workers=1)
+
+
+def stub_case_graph(failing_tab):
+    def build(case_id, tab_configs, menora_frames=None, context=None, tabs=None, tab_plans=None):
+        def run_tab(tab):
+            def run(inputs):
+                if tab == failing_tab:
+                    raise RuntimeError(f"{tab} is down")
+                return {"status_tab": "pass"}
+            return run
+        nodes = {"case_json": ([], fail if failing_tab == "case_json" else lambda _: {})}
+        for tab in ENABLED_TABS:
+            deps = ["case_json"] if tab in ("request_log", "decision") else []
+            nodes[f"tab:{tab}"] = (deps, run_tab(tab))
+        return nodes
+    return build
+
+
+def test_failed_tab_fails_the_case(monkeypatch):
+    monkeypatch.setattr(case_graph, "build_case_graph", stub_case_graph("decision"))
+    results = run_case_graph(1, {})
+
+    assert results["decision"] == {"status_tab": "fail", "error": "decision is down"}
+    assert case_status(results) == "fail"
+
+
+def test_case_status():
+    assert case_status({"a": {"status_tab": "pass"}, "b": {"status_tab": "skip"}}) == "skip"
+    assert case_status({"a": {"status_tab": "pass"}}) == "pass"
+    assert case_status({"a": {"status_tab": "skip"}, "b": {"status_tab": "error"}}) == "fail"
+
+
+def test_every_tab_gets_a_result(monkeypatch):
+    monkeypatch.setattr(case_graph, "build_case_graph", stub_case_graph("case_json"))
+    results = run_case_graph(1, {})
+
+    assert list(results) == ENABLED_TABS
+    assert results["request_log"] == results["decision"] == {"status_tab": "fail", "error": "down"}
+    assert all(results[tab] == {"status_tab": "pass"} for tab in ENABLED_TABS if tab not in ("request_log", "decision"))
@@ -0,0 +1,162 @@
+# test_comparison_engine.py
+import random
+import numpy as np
+import pandas as pd
+import pytest
+from dateutil.parser import parse
+from utils.comparison_engine import (
+    MISSING, NORMALIZERS, column_kinds, compare_fields, comparison_records, dedupe_reverse_mismatches, mismatch_records
+)
+
+
+def normalized(kind, values):
+    return list(NORMALIZERS[kind](pd.Series(values, dtype=object)))
+
+
+def test_text_normalizers():
+    assert normalized("text", [" a ", None, 1.0]) == ["a", "None", "1.0"]
+    assert normalized("text_ci", [" ABC "]) == ["abc"]
+    assert normalized("casefold", ["  Straße \t Berlin "]) == ["strasse berlin"]
+    assert normalized("email", [" John@Example.COM "]) == ["john@example.com"]
+
+
+def test_phone_normalizer():
+    assert normalized("phone", ["+972-50-1234567", "050-123 4567", "03-1234567"]) == \
+        ["0501234567", "0501234567", "031234567"]
+
+
+def test_id_zfill9_pads_digits_only():
+    assert normalized("id_zfill9", [" 12345 ", "A123", "123456789"]) == ["000012345", "A123", "123456789"]
+    assert normalized("id_zfill9_or_blank", [" 12345 ", "A123", None]) == ["000012345", "", ""]
+
+
+def test_whitespace_normalizer():
+    assert normalized("whitespace", [" a \t b ", None, ""]) == ["a b", "", ""]
+
+
+def test_int_normalizer_matches_int_semantics():
+    values = normalized("int", [1, 2.7, "3", " 4 ", "1.0", "x", None, True])
+    assert values[:4] == [1, 2, 3, 4]
+    assert all(np.isnan(v) for v in values[4:7])  # int("1.0") / int("x") / int(None) fail
+    assert values[7] == 1
+
+
+def test_date_normalizers():
+    dates = normalized("date", ["2025-04-21T10:15:00+03:00", "21/04/2025 10:15", "nope"])
+    assert dates[0] == dates[1] == pd.Timestamp("2025-04-21 10:15")
+    assert pd.isna(dates[2])
+    assert normalized("date_second", ["2025-04-21 10:15:00.900"]) == [pd.Timestamp("2025-04-21 10:15:00")]
+
+
+def test_column_kinds_defaults_and_validation():
+    key = {"key": "k", "columns": {"A_Date": "a", "B": "b"}, "kinds": {"B": "int", "C": "email"}}
+    default_kind = lambda column: "date" if column.endswith("Date") else "text_ci"  # noqa: E731
+    assert column_kinds(key, default_kind) == {"A_Date": "date", "B": "int", "C": "email"}
+    assert column_kinds({"columns": {"A": "a"}}) == {"A": "text"}
+    with pytest.raises(ValueError, match="Unknown comparison kind"):
+        column_kinds({"key": "k", "columns": {"A": "a"}, "kinds": {"A": "soundex"}})
+
+
+def test_compare_fields_row_major_with_missing_column():
+    merged = pd.DataFrame({"mojId": ["1", "2"], "A_m": ["x", "y"], "A_j": ["X", "z"], "B_m": [1, 2]})
+    comparison = compare_fields(merged, "mojId", [("A", "A_m", "A_j"), ("B", "B_m", "B_j")], kinds={"A": "text_ci"})
+
+    assert list(comparison["mojId"]) == ["1", "1", "2", "2"]
+    assert list(comparison["Field"]) == ["A", "B", "A", "B"]
+    assert list(comparison["Match"]) == [True, False, False, False]
+    assert list(comparison["JSON"]) == ["X", MISSING, "z", MISSING]
+    assert mismatch_records(comparison, "Status_Date")[0] == {"Status_Date": "1", "Field": "B", "Menora": 1, "JSON": MISSING}
+
+
+def test_compare_fields_na_value_and_none_equals_empty():
+    merged = pd.DataFrame({"k": [1, 2], "m": pd.Series([None, ""], dtype=object), "j": pd.Series([np.nan, "None"], dtype=object)})
+    assert list(compare_fields(merged, "k", [("f", "m", "j")], na_value=MISSING)["Match"]) == [True, False]
+    text = compare_fields(merged, "k", [("f", "m", "j")], none_equals_empty=True, display="text")
+    assert list(text["Match"]) == [False, True]
+    assert list(text["JSON"]) == ["nan", "None"]
+
+
+def test_compare_fields_display_normalized():
+    merged = pd.DataFrame({"k": [1], "m": ["123"], "j": [None]}, dtype=object)
+    comparison = compare_fields(merged, "k", [("id", "m", "j")], kinds={"id": "id_zfill9_or_blank"}, display="normalized")
+    assert (comparison.loc[0, "Menora"], comparison.loc[0, "JSON"], comparison.loc[0, "Match"]) == ("000000123", "", False)
+
+
+def test_compare_fields_empty_input():
+    assert compare_fields(pd.DataFrame(), "k", [("f", "m", "j")]).empty
+    assert comparison_records(compare_fields(pd.DataFrame(), "k", []), "k") == []
+
+
+def test_dedupe_reverse_mismatches():
+    results = [
+        {"mojId": "1", "Field": "A", "Menora Value": "x", "JSON Value": "y", "Match": "✗"},
+        {"mojId": "1", "Field": "A", "Menora Value": "y", "JSON Value": "x", "Match": "✗"},  # reverse pair
+        {"mojId": "2", "Field": "A", "Menora Value": "p", "JSON Value": "q", "Match": "✗"},
+        {"mojId": "2", "Field": "A", "Menora Value": "p", "JSON Value": "r", "Match": "✗"},  # same key, kept once
+        {"mojId": "3", "Field": "A", "Menora Value": "s", "JSON Value": "s", "Match": "✓"},
+    ]
+    assert dedupe_reverse_mismatches(results) == [{"Status_Date": "2", "Field": "A", "Menora": "p", "JSON": "q"}]
+
+
+def test_dedupe_reverse_mismatches_unhashable_values():
+    # lists/dicts are matched through their repr
+    results = [
+        {"mojId": "1", "Field": "A", "Menora Value": [1, 2], "JSON Value": {"a": 1}, "Match": "✗"},
+        {"mojId": "1", "Field": "A", "Menora Value": {"a": 1}, "JSON Value": [1, 2], "Match": "✗"},
+        {"mojId": "2", "Field": "A", "Menora Value": [1], "JSON Value": [2], "Match": "✗"},
+    ]
+    assert dedupe_reverse_mismatches(results) == [{"Status_Date": "2", "Field": "A", "Menora": [1], "JSON": [2]}]
+
+
+def reference_values_match(kind, menora_value, json_value):
+    """
+    The per-row values_match the runners used before compare_fields.
+    """
+    menora_str, json_str = str(menora_value).strip(), str(json_value).strip()
+    if kind == "int":
+        try:
+            return int(menora_value) == int(json_value)
+        except (TypeError, ValueError):
+            return False
+    if kind == "date":
+        try:
+            return parse(menora_str).replace(tzinfo=None) == parse(json_str).replace(tzinfo=None)
+        except Exception:
+            return False
+    return menora_str.lower() == json_str.lower()
+
+
+def reference_compare(merged, fields, kinds):
+    """
+    The row loop compare_decision_data ran before compare_fields. Rows are read as plain
+    dicts: pandas 3 iterrows() infers a str dtype for all-text rows and turns None into NaN.
+    """
+    results = []
+    for row in merged.to_dict("records"):
+        for field, menora_column, json_column in fields:
+            left, right = row.get(menora_column, MISSING), row.get(json_column, MISSING)
+            results.append((row["mojId"], field, reference_values_match(kinds[field], left, right)))
+    return results
+
+
+SAMPLE_VALUES = [
+    np.nan, None, 1, 1.0, 2, 2.7, "1", "1.0", " 3 ", " a ", "A", "", "None", "x",
+    "2024-01-01", "01/01/2024", "2024-01-01T00:00:00+02:00", "2024-01-01 00:00:00.000", pd.Timestamp("2024-01-01"),
+]
+
+
+def test_vectorized_comparison_matches_row_by_row():
+    rng = random.Random(7)
+    fields = [("Decision_Date", "Decision_Date_m", "decisionDate_j"), ("Source_Type", "Source_Type_m", "st_j"),
+              ("Decision_Status", "Decision_Status_m", "dst_j"), ("Absent", "Absent_m", "absent_j")]
+    kinds = {"Decision_Date": "date", "Source_Type": "int", "Decision_Status": "text_ci", "Absent": "text_ci"}
+
+    for _ in range(100):
+        n = rng.randint(1, 8)
+        merged = pd.DataFrame({"mojId": [str(rng.randint(0, 5)) for _ in range(n)]})
+        for column in ["Decision_Date_m", "decisionDate_j", "Source_Type_m", "st_j", "Decision_Status_m", "dst_j", "Absent_m"]:
+            merged[column] = pd.Series([rng.choice(SAMPLE_VALUES) for _ in range(n)], dtype=object)
+
+        comparison = compare_fields(merged, "mojId", fields, kinds=kinds)
+        vectorized = list(zip(comparison["mojId"], comparison["Field"], comparison["Match"]))
+        assert vectorized == reference_compare(merged, fields, kinds)
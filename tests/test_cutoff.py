@@ -0,0 +1,72 @@
+# test_cutoff.py
+from datetime import datetime
+import pandas as pd
+import pytest
+from utils.cutoff import CutoffIndex, load_cutoff_window, outside_window, parse_cutoff
+
+LOWER = datetime(2025, 1, 1)
+UPPER = datetime(2025, 5, 18)
+
+
+@pytest.fixture
+def index():
+    frame = pd.DataFrame({
+        "mojId": ["before", "lower", "inside", "upper", "after", "bad", "inside"],
+        "statusDate": ["2024-12-31", "2025-01-01", "2025-03-01 10:00", "2025-05-18", "2025-05-18 00:00:01", "n/a", "2030-01-01"],
+    })
+    return CutoffIndex(frame, "statusDate")
+
+
+def test_in_window_upper_only(index):
+    mask = index.in_window(["before", "upper", "after", "inside"], (None, UPPER))
+    assert list(mask) == [True, True, False, True]  # first row per id wins, upper is inclusive
+
+
+def test_in_window_lower_and_upper(index):
+    mask = index.in_window(["before", "lower", "inside", "upper", "after"], (LOWER, UPPER))
+    assert list(mask) == [False, True, True, True, False]
+
+
+def test_in_window_unknown_ids(index):
+    ids = ["bad", "never-seen"]
+    assert list(index.in_window(ids, (None, UPPER))) == [False, False]
+    assert list(index.in_window(ids, (None, UPPER), keep_unknown=True)) == [True, True]
+
+
+def test_filter_keeps_order(index):
+    assert index.filter(["after", "inside", "lower", "bad"], (LOWER, UPPER), keep_unknown=True) == ["inside", "lower", "bad"]
+    assert index.filter([], (LOWER, UPPER)) == []
+
+
+def test_missing_columns_make_everything_unknown():
+    index = CutoffIndex(pd.DataFrame({"mojId": ["a"]}), "statusDate")
+    assert list(index.in_window(["a"], (None, UPPER), keep_unknown=True)) == [True]
+    assert list(CutoffIndex(None, "statusDate").in_window(["a"], (None, UPPER))) == [False]
+
+
+def test_outside_window():
+    assert outside_window(datetime(2025, 6, 1), (None, UPPER))
+    assert not outside_window(UPPER, (None, UPPER))
+    assert not outside_window(datetime(2024, 6, 1), (None, UPPER))
+    assert outside_window(datetime(2024, 6, 1), (LOWER, UPPER))
+    assert not outside_window(pd.NaT, (LOWER, UPPER))
+
+
+def test_parse_cutoff():
+    assert parse_cutoff("180525") == UPPER
+    with pytest.raises(ValueError):
+        parse_cutoff("2025-05-18")
+
+
+def test_lower_cutoff_is_opt_in(monkeypatch):
+    monkeypatch.setenv("CUTOFF", "180525")
+    monkeypatch.setenv("LOWER_CUTOFF", "010125")
+    monkeypatch.setenv("CUTOFF_WINDOW_ENABLED", "false")
+    assert load_cutoff_window() == (None, UPPER)
+
+    monkeypatch.setenv("CUTOFF_WINDOW_ENABLED", "true")
+    assert load_cutoff_window() == (LOWER, UPPER)
+
+    monkeypatch.setenv("LOWER_CUTOFF", "010625")
+    with pytest.raises(ValueError, match="after CUTOFF"):
+        load_cutoff_window()
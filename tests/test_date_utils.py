@@ -0,0 +1,51 @@
+# test_date_utils.py
+import pandas as pd
+from dateutil.parser import parse
+from utils.date_utils import format_dates, parse_date, parse_dates
+
+SAMPLES = [
+    "2025-04-21", "2025-04-21 10:15:00", "2025-04-21 10:15:00.123", "2025-04-21T10:15:00Z",
+    "2025-04-21T10:15:00+03:00", " 2025-04-21T10:15 ", "21/04/2025 10:15", "April 21, 2025", "5/4/2025",
+    pd.Timestamp("2025-04-21 10:15"),
+]
+
+
+def test_parse_dates_matches_dateutil_wall_time():
+    # ISO values take the vectorized path, the rest the memoized dateutil path
+    expected = [parse(str(value).strip()).replace(tzinfo=None) for value in SAMPLES]
+    assert list(parse_dates(pd.Series(SAMPLES, dtype=object))) == [pd.Timestamp(value) for value in expected]
+
+
+def test_parse_dates_unparseable_and_empty():
+    parsed = parse_dates(pd.Series(["2025-04-21", "not a date", None, ""], dtype=object))
+    assert parsed.iloc[0] == pd.Timestamp("2025-04-21")
+    assert parsed.iloc[1:].isna().all()
+    assert parse_dates(pd.Series([], dtype="datetime64[ns]")).empty
+
+
+def test_parse_dates_keeps_index():
+    series = pd.Series(["2025-04-21", "2025-04-22"], index=[10, 20])
+    assert list(parse_dates(series).index) == [10, 20]
+
+
+def test_parse_dates_to_local():
+    series = pd.Series([
+        "2025-07-01T09:00:00Z",       # UTC → Asia/Jerusalem summer time (+3)
+        "2025-07-01T12:00:00+03:00",  # already local
+        "2025-01-01 09:00:00",        # no offset: read as UTC, winter time (+2)
+        "01/07/2025 09:00 +0000",     # non-ISO, through dateutil
+    ], dtype=object)
+    assert list(parse_dates(series, to_local=True)) == [
+        pd.Timestamp("2025-07-01 12:00"), pd.Timestamp("2025-07-01 12:00"),
+        pd.Timestamp("2025-01-01 11:00"), pd.Timestamp("2025-01-07 11:00"),
+    ]
+
+
+def test_parse_date():
+    assert parse_date(" 2025-04-21T10:15:00+03:00 ") == pd.Timestamp("2025-04-21 10:15")
+    assert pd.isna(parse_date("garbage"))
+
+
+def test_format_dates():
+    parsed = parse_dates(pd.Series(["2025-04-21 10:15:30", None], dtype=object))
+    assert list(format_dates(parsed, "%m-%d %H:%M:%S")) == ["04-21 10:15:30", None]
@@ -0,0 +1,30 @@
+# test_fetcher_cache.py
+import json
+from utils import fetcher
+from utils.fetcher import read_cached_json
+
+
+def write_legacy(tmp_path, data):
+    legacy = tmp_path / "case_1.json"
+    legacy.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return legacy
+
+
+def test_legacy_file_is_migrated(tmp_path):
+    legacy = write_legacy(tmp_path, {"id": 1})
+    path = tmp_path / "case_1.json.gz"
+
+    assert read_cached_json(str(path)) == {"id": 1}
+    assert path.exists() and not legacy.exists()
+    assert read_cached_json(str(path)) == {"id": 1}
+
+
+def test_migration_race_still_returns_data(tmp_path, monkeypatch):
+    legacy = write_legacy(tmp_path, {"id": 1})
+
+    def removed_by_another_reader(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(fetcher.os, "remove", removed_by_another_reader)
+    assert read_cached_json(str(tmp_path / "case_1.json.gz")) == {"id": 1}
+    assert legacy.exists()
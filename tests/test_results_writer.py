@@ -0,0 +1,64 @@
+# test_results_writer.py
+import json
+from utils.results_writer import (
+    ResultsLog, completed_case_ids, compact_results_log, merge_results_logs, read_results_log,
+    shard_results_log_path, shard_results_logs,
+)
+
+
+def test_append_and_read(tmp_path):
+    path = tmp_path / "results.jsonl"
+    with ResultsLog(str(path)) as log:
+        log.append(1, {"decision": {"status_tab": "pass"}})
+        log.append(2, {"decision": {"status_tab": "fail"}})
+        log.append(1, {"decision": {"status_tab": "fail"}})  # a later line for the same case wins
+
+    assert read_results_log(str(path)) == {"1": {"decision": {"status_tab": "fail"}}, "2": {"decision": {"status_tab": "fail"}}}
+    assert completed_case_ids(str(path)) == {1, 2}
+
+
+def test_resume_after_torn_line(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text('{"case_id": "1", "results": {}}\n{"case_id": "2", "res', encoding="utf-8")
+
+    with ResultsLog(str(path), resume=True) as log:
+        log.append(3, {"request_log": {"status_tab": "pass"}})
+
+    assert read_results_log(str(path)) == {"1": {}, "3": {"request_log": {"status_tab": "pass"}}}
+
+
+def test_missing_log_reads_empty(tmp_path):
+    assert read_results_log(str(tmp_path / "nope.jsonl")) == {}
+
+
+def test_compaction_writes_summary(tmp_path):
+    path, summary = tmp_path / "results.jsonl", tmp_path / "summary.json"
+    with ResultsLog(str(path)) as log:
+        log.append(7, {"distribution": {"status_tab": "pass"}})
+
+    compact_results_log(str(path), str(summary))
+    assert json.loads(summary.read_text(encoding="utf-8")) == {"7": {"distribution": {"status_tab": "pass"}}}
+
+
+def test_merge_last_log_wins(tmp_path):
+    first = shard_results_log_path(str(tmp_path / "comparison_results.jsonl"), "shard-0-of-2")
+    second = shard_results_log_path(str(tmp_path / "comparison_results.jsonl"), "shard-1-of-2")
+    with ResultsLog(first) as log:
+        log.append(1, {"tab": "old"})
+        log.append(2, {"tab": "two"})
+    with ResultsLog(second) as log:
+        log.append(1, {"tab": "new"})
+
+    summary = tmp_path / "summary.json"
+    merged = merge_results_logs([first, second], str(summary))
+    assert merged == {"1": {"tab": "new"}, "2": {"tab": "two"}}
+    assert json.loads(summary.read_text(encoding="utf-8")) == merged
+
+
+def test_shard_log_paths(tmp_path):
+    base = str(tmp_path / "comparison_results.jsonl")
+    assert shard_results_log_path("comparison_results.jsonl", "host-1") == "comparison_results.host-1.jsonl"
+    paths = [shard_results_log_path(base, suffix) for suffix in ("b", "a")]
+    for path in paths + [base]:
+        ResultsLog(path).close()
+    assert shard_results_logs(base) == sorted(paths)
@@ -0,0 +1,90 @@
+# test_single_flight.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils.single_flight import SingleFlight, single_flight
+
+CALLERS = 8
+
+
+def run_concurrently(fn):
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        futures = [executor.submit(fn) for _ in range(CALLERS)]
+        return [future.exception() or future.result() for future in futures]
+
+
+def blocking_call(flights, key, result=None, error=None):
+    """
+    (call, release, calls): every call waits for release, so they all overlap.
+    """
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(key)
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    def call():
+        return flights.do(key, fn)
+
+    return call, release, calls
+
+
+def release_when_joined(flights, release):
+    def wait_for_joins():
+        while flights.joins < CALLERS - 1:
+            threading.Event().wait(0.01)
+        release.set()
+    threading.Thread(target=wait_for_joins, daemon=True).start()
+
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    payload = {"case": 1}
+    call, release, calls = blocking_call(flights, "case:1", result=payload)
+    release_when_joined(flights, release)
+
+    results = run_concurrently(call)
+
+    assert calls == ["case:1"]
+    assert flights.joins == CALLERS - 1
+    assert all(result is payload for result in results)  # shared, read-only (see MemoryCache)
+
+
+def test_errors_reach_every_caller():
+    flights = SingleFlight()
+    call, release, calls = blocking_call(flights, "case:2", error=RuntimeError("down"))
+    release_when_joined(flights, release)
+
+    results = run_concurrently(call)
+
+    assert calls == ["case:2"]
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_nothing_is_remembered_after_the_call():
+    flights = SingleFlight()
+    calls = []
+
+    @single_flight(flights, lambda case_id: ("case", case_id))
+    def fetch(case_id):
+        calls.append(case_id)
+        return case_id
+
+    assert [fetch(1), fetch(1), fetch(2)] == [1, 1, 2]
+    assert calls == [1, 1, 2]
+    assert flights.joins == 0
+
+
+def test_leader_error_propagates():
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        flights.do("k", fail)
+    assert flights.do("k", lambda: "ok") == "ok"  # the failed call is not remembered either
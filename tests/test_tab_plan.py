@@ -0,0 +1,105 @@
+# test_tab_plan.py
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+from configs.config_loader import load_tab_config
+from runners.tab_plan import compile_tab_plans, get_tab_plan, run_tab_plan
+
+TAB_LABELS = {
+    "document": "מסמכים",
+    "decision": "החלטות",
+    "discussion": "דיונים",
+    "request_log": "יומן תיק",
+    "representator_log": "מעורבים בתיק",
+    "case_contact": "עורר פרטי קשר",
+    "distribution": "הפצות",
+}
+
+
+def plan(tab):
+    return get_tab_plan(tab, load_tab_config(TAB_LABELS[tab]))
+
+
+def run(tab, menora_df, **context):
+    return run_tab_plan(plan(tab), 1, "A1", None, {tab: menora_df}, SimpleNamespace(**context))[tab]
+
+
+@pytest.fixture(autouse=True)
+def cutoff(monkeypatch):
+    monkeypatch.setenv("CUTOFF", "180525")
+    monkeypatch.setenv("CUTOFF_WINDOW_ENABLED", "false")
+
+
+def test_every_runner_compiles_from_its_plan():
+    plans = compile_tab_plans({tab: load_tab_config(label) for tab, label in TAB_LABELS.items()})
+    assert set(plans) == set(TAB_LABELS)
+
+
+def test_representators_compare_a_single_normalized_row():
+    case_json = {"caseInvolveds": [
+        {"caseInvolvedName": "עורר", "representors": [
+            {"caseInvolvedIdentifyId": "12345", "caseInvolvedName": "עו\"ד  כהן", "appointmentEndDate": None}]},
+        {"caseInvolvedName": "רשות המיסים", "representors": [
+            {"caseInvolvedIdentifyId": "999", "caseInvolvedName": "פרקליט", "appointmentEndDate": "2024-01-01"}]},
+    ]}
+    menora_df = pd.DataFrame({"Main_Id_Number": ["000012345", "1"], "orer": ["עו\"ד כהן", "x"], "meshiva": ["פרקליט", "y"], "meshivaID": [None, None]})
+
+    result = run("representator_log", menora_df, case_json=case_json)
+
+    assert result["status_tab"] == "fail"
+    assert result["missing_json_dates"] == [] and result["missing_menora_dates"] == []
+    assert result["mismatched_fields"] == [{"Field": "meshiva", "Menora": "פרקליט", "JSON": ""}]  # no key column
+    assert [rep["caseInvolvedIdentifyId"] for rep in result["all_active_representors"]] == ["12345"]
+
+
+def test_distributions_collapse_rows_per_send_date():
+    menora_df = pd.DataFrame({
+        "SendDate": ["2025-01-01 10:00:00", "2025-01-01 10:00:00", "2025-02-01 09:00:00"],
+        "SendSubject": ["b", "a", "c"],
+    })
+    distributions = [
+        {"createDate": "2025-01-01T08:00:00Z", "subject": "a"},
+        {"createDate": "2025-01-01T08:00:00Z", "subject": "b"},
+        {"createDate": "2025-02-01T07:00:00Z", "subject": "d"},
+        {"createDate": "2026-01-01T07:00:00Z", "subject": "e"},
+    ]
+
+    result = run("distribution", menora_df, distributions=distributions)
+
+    assert result["missing_json_dates"] == []
+    assert result["missing_menora_dates"] == ["2026-01-01 09:00:00"]
+    assert result["mismatched_fields"] == [{"date": "2025-02-01 09:00:00", "Field": "SendSubject", "Menora": "c", "JSON": "d"}]
+    assert result["status_tab"] == "fail"  # the February mismatch is inside the cutoff window
+
+
+def test_distributions_outside_the_window_pass_by_policy():
+    menora_df = pd.DataFrame({"SendDate": ["2025-06-01 10:00:00"], "SendSubject": ["a"]})
+    result = run("distribution", menora_df, distributions=[{"createDate": "2025-07-01T07:00:00Z", "subject": "a"}])
+
+    assert result["missing_json_dates"] == ["2025-06-01 10:00:00"]
+    assert result["status_tab"] == "pass"
+
+
+def test_distributions_without_json_dates_pass():
+    result = run("distribution", pd.DataFrame({"SendDate": ["2025-01-01"]}), distributions=[])
+    assert result == {"status_tab": "pass", "missing_json_dates": [], "missing_menora_dates": [], "mismatched_fields": []}
+
+
+def test_contacts_key_on_padded_ids():
+    representors = [{"caseInvolvedIdentifyId": "555", "connectDetailsId": 7}]
+    context = {
+        "contact_representors": representors,
+        "connect_contacts": lambda ids: {"connectDetails": [
+            {"connectDetailsId": 7, "mail": "a@b.com", "primaryPhone": None, "secondaryPhone": "03-1234567"}]},
+    }
+    menora_df = pd.DataFrame({
+        "Main_Id_Number": ["555", "777"], "orerEmail": ["a@b.com", ""], "Phone1": [None, ""], "Phone2": ["03-7654321", ""],
+    })
+
+    result = run("case_contact", menora_df, **context)
+
+    assert result["missing_json_dates"] == ["000000777"]
+    assert result["mismatched_fields"] == [
+        {"Main_Id_Number": "000000555", "Field": "Phone2", "Menora": "03-7654321", "JSON": "03-1234567"}
+    ]
+    assert result["all_active_contact_ids"] == ["000000555"]
@@ -0,0 +1,61 @@
+# test_work_queue.py
+import pytest
+from utils import work_queue
+from utils.work_queue import SqliteWorkQueue
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(work_queue.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = SqliteWorkQueue(str(tmp_path / "queue.db"), lease_seconds=60, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_is_idempotent(queue):
+    assert queue.enqueue([3, 1, 2]) == 3
+    assert queue.enqueue([2, 3, 4]) == 1
+    assert queue.counts() == {"pending": 4}
+
+
+def test_claims_do_not_overlap(queue):
+    queue.enqueue(range(1, 6))
+    assert queue.claim("a", 2) == [1, 2]
+    assert queue.claim("b", 10) == [3, 4, 5]
+    assert queue.claim("c", 10) == []
+
+
+def test_expired_lease_is_claimed_again(queue, clock):
+    queue.enqueue([1])
+    assert queue.claim("a") == [1]
+    clock[0] += 30
+    assert queue.claim("b") == []
+    clock[0] += 31
+    assert queue.claim("b") == [1]
+
+
+def test_attempts_are_bounded(queue, clock):
+    queue.enqueue([1])
+    for _ in range(2):
+        assert queue.claim("a") == [1]
+        clock[0] += 61
+    assert queue.claim("a") == []  # max_attempts leases used up
+
+
+def test_complete_and_fail(queue):
+    queue.enqueue([1, 2])
+    queue.claim("a", 2)
+    queue.complete([1])
+    queue.fail([2])
+    assert queue.counts() == {"done": 1, "pending": 1}
+
+    assert queue.claim("b") == [2]  # retried
+    queue.fail([2])
+    assert queue.counts() == {"done": 1, "failed": 1}
+    assert queue.claim("b") == []
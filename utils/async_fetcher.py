@@ -0,0 +1,223 @@
+# async_fetcher.py
+import asyncio
+import os
+import time
+from urllib.parse import urlsplit
+import aiohttp
+from dotenv import load_dotenv
+from utils.logging_utils import log_and_print
+from utils.concurrency import record_backend_call
+from utils import json_codec
+from utils.fetcher import (
+    get_fresh_cache_entry, write_tab_cache, touch_tab_cache, write_negative_cache, conditional_headers,
+    response_validators, stale_or, NEGATIVE_STATUSES,
+    build_role_contacts_url,
+    CASE_URL, DISCUSSIONS_URL, DISTRIBUTIONS_URL,
+)
+from utils.json_parser import extract_active_contact_representors, get_contact_lookup_ids
+from apis.client_api import (
+    BASE_URL, BEARER_TOKEN, MOJ_APP_ID, DOCUMENTS_URL,
+    build_documents_payload, build_connect_contacts_url,
+)
+
+load_dotenv()
+
+# Per-host keep-alive pool size = max requests in flight against one back-office host.
+ASYNC_PER_HOST_LIMIT = int(os.getenv("ASYNC_PER_HOST_LIMIT", "20"))
+ASYNC_TOTAL_LIMIT = int(os.getenv("ASYNC_TOTAL_LIMIT", "200"))
+ASYNC_TIMEOUT_SECONDS = int(os.getenv("ASYNC_TIMEOUT_SECONDS", "120"))
+# Max requests per second started against one host (0 = unlimited).
+ASYNC_RATE_PER_HOST = float(os.getenv("ASYNC_RATE_PER_HOST", "0"))
+# Cases fetched at once by prefetch_cases_async; the rest wait in line instead of as pending coroutines.
+ASYNC_CASE_CONCURRENCY = int(os.getenv("ASYNC_CASE_CONCURRENCY", "50"))
+
+
+class AsyncFetcher:
+    """
+    Shared aiohttp session for all back-office endpoints.
+    The TCPConnector keeps connections alive per host, so hundreds of case/tab requests
+    reuse a small pool of TLS connections instead of opening one per call.
+    With rate_per_host, request starts against each host are spaced at least
+    1 / rate_per_host seconds apart.
+    """
+
+    def __init__(self, per_host_limit=ASYNC_PER_HOST_LIMIT, total_limit=ASYNC_TOTAL_LIMIT, timeout=ASYNC_TIMEOUT_SECONDS, rate_per_host=ASYNC_RATE_PER_HOST):
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.rate_per_host = rate_per_host
+        self.session = None
+        self.stats = {"requests": 0, "errors": 0, "seconds": 0.0}
+        self._next_slot = {}
+        self._slot_locks = {}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.total_limit,
+            limit_per_host=self.per_host_limit,
+            ssl=False,
+            keepalive_timeout=60
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={
+                "Authorization": f"Bearer {BEARER_TOKEN}",
+                "Accept": "application/json",
+                "Moj-Application-Id": MOJ_APP_ID
+            }
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    async def _wait_for_rate_slot(self, host):
+        if not self.rate_per_host:
+            return
+        lock = self._slot_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + 1.0 / self.rate_per_host
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def request_json(self, method, url, payload=None, headers=None):
+        """
+        Returns (status_code, parsed_json, validators). parsed_json is None for non-200
+        responses or errors; validators holds the response's ETag / Last-Modified.
+        """
+        backend = urlsplit(url).hostname or "http"
+        await self._wait_for_rate_slot(backend)
+        started = time.perf_counter()
+        self.stats["requests"] += 1
+        try:
+            async with self.session.request(method, url, json=payload, headers=headers) as response:
+                record_backend_call(backend, time.perf_counter() - started, status=response.status)
+                validators = response_validators(response.headers)
+                if response.status != 200:
+                    return response.status, None, validators
+                body = await response.read()
+                return response.status, await asyncio.to_thread(json_codec.loads, body), validators
+        except Exception as e:
+            self.stats["errors"] += 1
+            record_backend_call(backend, time.perf_counter() - started, error=True)
+            log_and_print(f"❌ Async request failed for {url}: {e}", "error")
+            return None, None, {}
+        finally:
+            self.stats["seconds"] += time.perf_counter() - started
+
+
+async def fetch_tab_async(fetcher, case_id, prefix, method, url, payload=None, force_refresh=False, max_age_hours=None):
+    """
+    Async counterpart of the utils/fetcher.py fetch functions: same cache contract
+    (fresh entries are used, stale ones revalidated with a conditional request and served
+    as-is when the revalidation fails) unless force_refresh.
+    Cache reads and writes (disk/SQLite I/O, compression, JSON) run in worker threads so they
+    do not stall the other requests on the event loop.
+    """
+    entry, fresh = await asyncio.to_thread(get_fresh_cache_entry, case_id, prefix, force_refresh, max_age_hours)
+    if fresh:
+        return entry["data"]
+
+    status, data, validators = await fetcher.request_json(method, url, payload, conditional_headers(entry))
+    if status == 304 and entry is not None:
+        await asyncio.to_thread(touch_tab_cache, case_id, prefix, validators)
+        return entry["data"]
+    if status in NEGATIVE_STATUSES:
+        # Same values the sync fetchers return: None for the case JSON, {} for the tabs
+        empty = None if prefix == "case" else {}
+        await asyncio.to_thread(write_negative_cache, case_id, prefix, status, empty)
+        return empty
+    if status == 401:
+        log_and_print(f"❌ Authorization failed (401) for {prefix} of case {case_id}. Token may have expired.", "error")
+        return stale_or(entry, None, case_id, prefix, status)
+    if status != 200:
+        log_and_print(f"❌ Failed to fetch {prefix} for case {case_id}. Status: {status}", "error")
+        return stale_or(entry, None, case_id, prefix, status)
+
+    await asyncio.to_thread(write_tab_cache, case_id, prefix, data, validators=validators)
+    return data
+
+
+async def fetch_case_bundle_async(fetcher, case_id, force_refresh=False, include_documents=False, max_age_hours=None):
+    """
+    Fetches every payload the runners read for one case: case JSON, discussions,
+    distributions, role/connect contacts and (optionally) documents.
+    """
+    case_json = await fetch_tab_async(
+        fetcher, case_id, "case", "GET", CASE_URL.format(base_url=BASE_URL, case_id=case_id),
+        force_refresh=force_refresh, max_age_hours=max_age_hours
+    )
+
+    tasks = [
+        fetch_tab_async(fetcher, case_id, "disc", "GET", DISCUSSIONS_URL.format(case_id=case_id), force_refresh=force_refresh, max_age_hours=max_age_hours),
+        fetch_tab_async(fetcher, case_id, "dist", "GET", DISTRIBUTIONS_URL.format(case_id=case_id), force_refresh=force_refresh, max_age_hours=max_age_hours),
+    ]
+
+    if include_documents:
+        tasks.append(fetch_tab_async(
+            fetcher, case_id, "doc", "POST", DOCUMENTS_URL, payload=build_documents_payload(case_id),
+            force_refresh=force_refresh, max_age_hours=max_age_hours
+        ))
+
+    if case_json:
+        role_ids, connect_ids = get_contact_lookup_ids(extract_active_contact_representors(case_json))
+        if role_ids:
+            tasks.append(fetch_tab_async(fetcher, case_id, "role", "GET", build_role_contacts_url(role_ids), force_refresh=force_refresh, max_age_hours=max_age_hours))
+        elif connect_ids:
+            tasks.append(fetch_tab_async(fetcher, case_id, "connect", "GET", build_connect_contacts_url(connect_ids), force_refresh=force_refresh, max_age_hours=max_age_hours))
+
+    await asyncio.gather(*tasks)
+    return case_json is not None
+
+
+async def _prefetch_cases(case_ids, force_refresh, include_documents, per_host_limit, max_age_hours, rate_per_host,
+                          progress_every, case_concurrency):
+    failed = []
+    done = 0
+    started = time.perf_counter()
+    pending = iter(case_ids)  # shared by the workers: each takes the next case when it is free
+
+    async def worker():
+        nonlocal done
+        for case_id in pending:
+            if not await fetch_case_bundle_async(fetcher, case_id, force_refresh, include_documents, max_age_hours):
+                failed.append(case_id)
+            done += 1
+            if progress_every and (done % progress_every == 0 or done == len(case_ids)):
+                elapsed = time.perf_counter() - started
+                remaining = (len(case_ids) - done) * elapsed / done
+                log_and_print(
+                    f"⏳ Prefetched {done}/{len(case_ids)} cases ({fetcher.stats['requests']} requests, "
+                    f"{len(failed)} failed), {done / elapsed:.1f} cases/s, ~{remaining:.0f}s left", "info"
+                )
+
+    async with AsyncFetcher(per_host_limit=per_host_limit, rate_per_host=rate_per_host) as fetcher:
+        await asyncio.gather(*(worker() for _ in range(max(1, min(case_concurrency, len(case_ids))))))
+    return failed, fetcher.stats
+
+
+def prefetch_cases_async(case_ids, force_refresh=False, include_documents=False, per_host_limit=ASYNC_PER_HOST_LIMIT,
+                         max_age_hours=None, rate_per_host=ASYNC_RATE_PER_HOST, progress_every=0,
+                         case_concurrency=ASYNC_CASE_CONCURRENCY):
+    """
+    Fills the local cache for all case_ids concurrently, so the comparison runners
+    afterwards read everything from disk. At most case_concurrency cases are in flight;
+    progress_every > 0 logs progress every N cases.
+
+    Returns:
+        list: case_ids whose case JSON could not be fetched.
+    """
+    started = time.perf_counter()
+    failed, stats = asyncio.run(_prefetch_cases(
+        case_ids, force_refresh, include_documents, per_host_limit, max_age_hours, rate_per_host, progress_every,
+        case_concurrency
+    ))
+
+    log_and_print(
+        f"🌐 Async prefetch: {len(case_ids)} cases, {stats['requests']} requests, {stats['errors']} errors, "
+        f"{len(failed)} cases without case JSON, {time.perf_counter() - started:.1f}s wall-clock", "info"
+    )
+    return failed
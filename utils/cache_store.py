@@ -0,0 +1,210 @@
+# cache_store.py
+import gzip
+import os
+import sqlite3
+import threading
+import time
+from dotenv import load_dotenv
+from utils.logging_utils import log_and_print
+from utils import json_codec
+
+load_dotenv()
+
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", "cache.sqlite3")
+
+
+def _encode(data):
+    return gzip.compress(json_codec.dumps(data), compresslevel=6)
+
+
+class SqliteCacheStore:
+    """
+    Single-file cache of API payloads keyed by (endpoint, case_id, params), replacing the
+    data/{case_id}/ tree when CACHE_BACKEND=sqlite.
+
+    The database runs in WAL mode, so readers never block each other or the writer.
+    Each thread (and each process, after fork/spawn) opens its own connection; concurrent
+    writers wait on busy_timeout instead of failing. Payloads are stored as gzip'ed compact JSON.
+    """
+
+    def __init__(self, path=CACHE_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                endpoint TEXT NOT NULL,
+                case_id TEXT NOT NULL,
+                params TEXT NOT NULL DEFAULT '',
+                payload BLOB NOT NULL,
+                fetched_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                status INTEGER,
+                PRIMARY KEY (endpoint, case_id, params)
+            )
+            """
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+        for column, column_type in (("etag", "TEXT"), ("last_modified", "TEXT"), ("status", "INTEGER")):
+            if column not in columns:  # databases created by an older version
+                conn.execute(f"ALTER TABLE cache ADD COLUMN {column} {column_type}")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA busy_timeout = 60000")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, endpoint, case_id, params=""):
+        entry = self.get_entry(endpoint, case_id, params)
+        return entry["data"] if entry is not None else None
+
+    def get_entry(self, endpoint, case_id, params=""):
+        """
+        Returns {"data", "fetched_at", "etag", "last_modified", "status"} or None.
+        status is set (204/404) for negative entries.
+        """
+        row = self._connection().execute(
+            "SELECT payload, fetched_at, etag, last_modified, status FROM cache WHERE endpoint = ? AND case_id = ? AND params = ?",
+            (endpoint, str(case_id), params)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "data": json_codec.loads(gzip.decompress(row[0])),
+            "fetched_at": row[1],
+            "etag": row[2],
+            "last_modified": row[3],
+            "status": row[4],
+        }
+
+    def put(self, endpoint, case_id, data, params="", fetched_at=None, etag=None, last_modified=None, status=None):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (endpoint, case_id, params, payload, fetched_at, etag, last_modified, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (endpoint, str(case_id), params, _encode(data), fetched_at or time.time(), etag, last_modified, status)
+        )
+
+    def touch(self, endpoint, case_id, params="", etag=None, last_modified=None):
+        """
+        Marks an entry as just revalidated (after a 304), keeping its payload.
+        """
+        self._connection().execute(
+            "UPDATE cache SET fetched_at = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+            "WHERE endpoint = ? AND case_id = ? AND params = ?",
+            (time.time(), etag, last_modified, endpoint, str(case_id), params)
+        )
+
+    def put_many(self, rows):
+        """
+        rows: iterable of (endpoint, case_id, params, data, meta), written in one transaction.
+        meta holds fetched_at and optionally etag / last_modified / status.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (endpoint, case_id, params, payload, fetched_at, etag, last_modified, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (endpoint, str(case_id), params, _encode(data), meta["fetched_at"],
+                     meta.get("etag"), meta.get("last_modified"), meta.get("status"))
+                    for endpoint, case_id, params, data, meta in rows
+                ]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_cache_store():
+    """
+    Process-wide SqliteCacheStore at CACHE_DB_PATH.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SqliteCacheStore(CACHE_DB_PATH)
+        return _store
+
+
+def _read_tree_entry(case_dir, case_id, filename, suffixes):
+    """
+    Returns (endpoint, case_id, params, data, meta) for one file of the data/ tree, or None.
+    """
+    from utils.fetcher import _read_json_file, read_tab_meta
+
+    path = os.path.join(case_dir, filename)
+    try:
+        if filename.endswith(f"_{case_id}.neg.json"):  # 204/404 marker
+            with open(path, "rb") as f:
+                marker = json_codec.loads(f.read())
+            endpoint = filename[:-len(f"_{case_id}.neg.json")]
+            return endpoint, case_id, "", marker.get("data"), {"fetched_at": os.path.getmtime(path), "status": marker.get("status")}
+
+        suffix = next((s for s in suffixes if filename.endswith(f"_{case_id}{s}")), None)
+        if suffix is None:
+            return None
+        endpoint = filename[:-len(f"_{case_id}{suffix}")]
+        return endpoint, case_id, "", _read_json_file(path), read_tab_meta(path)
+    except Exception as e:
+        log_and_print(f"⚠️ Skipping unreadable cache file {path}: {e}", "warning")
+        return None
+
+
+def import_data_tree(root="data", store=None, batch_size=500):
+    """
+    Imports an existing data/{case_id}/{prefix}_{case_id}.json[.gz|.zst] tree (and its
+    204/404 markers) into the cache database. Existing database entries for the same key
+    are overwritten.
+
+    Returns:
+        int: number of imported payloads.
+    """
+    from utils.fetcher import CACHE_CODECS
+
+    store = store or get_cache_store()
+    suffixes = sorted((".json" + codec["ext"] for codec in CACHE_CODECS.values()), key=len, reverse=True)
+    imported, batch = 0, []
+
+    for case_id in sorted(os.listdir(root)):
+        case_dir = os.path.join(root, case_id)
+        if not os.path.isdir(case_dir):
+            continue
+        for filename in os.listdir(case_dir):
+            row = _read_tree_entry(case_dir, case_id, filename, suffixes)
+            if row is None:
+                continue
+            batch.append(row)
+
+            if len(batch) >= batch_size:
+                store.put_many(batch)
+                imported += len(batch)
+                batch = []
+
+    if batch:
+        store.put_many(batch)
+        imported += len(batch)
+
+    log_and_print(f"📥 Imported {imported} cached payloads from {root}/ into {store.path}", "info")
+    return imported
+
+
+if __name__ == "__main__":
+    import sys
+    import_data_tree(sys.argv[1] if len(sys.argv) > 1 else "data")
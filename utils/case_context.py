@@ -0,0 +1,122 @@
+# case_context.py
+from utils.logging_utils import log_and_print
+from utils.fetcher import (
+    get_case_data, read_tab_cache_entry, write_tab_cache, write_negative_cache, is_entry_fresh, record_cache_event,
+    stale_or, fetch_case_discussions, fetch_distribution_data, fetch_role_contacts, NEGATIVE_STATUSES,
+)
+from utils.json_parser import extract_active_contact_representors, get_contact_lookup_ids
+from apis.client_api import fetch_case_documents_with_status, fetch_connect_contacts
+
+class CaseContext:
+    """
+    Per-case holder of every API payload the runners read.
+    Each payload is loaded (from cache or API) and parsed at most once, then shared by all
+    runners of the case. Built once per case in main.process_case / the pipeline I/O stage.
+    max_age_hours overrides the cachePolicy TTLs: cached payloads older than that are revalidated.
+    """
+
+    def __init__(self, case_id, case_json=None, max_age_hours=None):
+        self.case_id = case_id
+        self.max_age_hours = max_age_hours
+        self._case_json = case_json
+        self._case_json_loaded = case_json is not None
+        self._payloads = {}
+        self._contacts = {}
+
+    @property
+    def case_json(self):
+        if not self._case_json_loaded:
+            self._case_json = get_case_data(self.case_id, max_age_hours=self.max_age_hours)
+            self._case_json_loaded = True
+        return self._case_json
+
+    @property
+    def case_type_id(self):
+        return self.case_json.get("caseTypeId") if self.case_json else None
+
+    @property
+    def request_ids(self):
+        if not self.case_json:
+            return []
+        requests = self.case_json.get("requests") or []
+        return [request.get("requestId") for request in requests if isinstance(request, dict)]
+
+    @property
+    def first_request_id(self):
+        request_ids = self.request_ids
+        return request_ids[0] if request_ids else None
+
+    def _load_tab(self, prefix, fetch_fn):
+        """
+        Returns the cached payload for prefix while it is fresh (an empty cached payload
+        counts as cached), otherwise calls fetch_fn(stale_entry_or_None).
+        """
+        if prefix not in self._payloads:
+            entry = read_tab_cache_entry(self.case_id, prefix)
+            if entry is None or not is_entry_fresh(entry, prefix, self.max_age_hours):
+                payload = fetch_fn(entry)
+            else:
+                payload = entry["data"]
+                record_cache_event("hits")
+                log_and_print(f"📁 Loaded {prefix} data from cache for case {self.case_id}", "debug")
+            self._payloads[prefix] = payload
+        return self._payloads[prefix]
+
+    @property
+    def discussions(self):
+        return self._load_tab("disc", lambda _entry: fetch_case_discussions(self.case_id, max_age_hours=self.max_age_hours))
+
+    @property
+    def distributions(self):
+        return self._load_tab("dist", lambda _entry: fetch_distribution_data(self.case_id, max_age_hours=self.max_age_hours))
+
+    @property
+    def documents(self):
+        return self._load_tab("doc", self._fetch_documents)
+
+    def _fetch_documents(self, entry):
+        """
+        The documents endpoint has no cache of its own: only a 200 is cached, 204/404 become a
+        negative entry, and any other failure keeps the stale entry (or {}) uncached.
+        """
+        status, payload = fetch_case_documents_with_status(self.case_id, self.case_json)
+        if status == 200:
+            write_tab_cache(self.case_id, "doc", payload)
+            return payload
+        if status in NEGATIVE_STATUSES:
+            write_negative_cache(self.case_id, "doc", status, {})
+            return {}
+        return stale_or(entry, {}, self.case_id, "doc", status)
+
+    @property
+    def contact_representors(self):
+        return extract_active_contact_representors(self.case_json)
+
+    def role_contacts(self, role_ids):
+        key = ("role", tuple(role_ids))
+        if key not in self._contacts:
+            self._contacts[key] = fetch_role_contacts(role_ids, self.case_id, max_age_hours=self.max_age_hours)
+        return self._contacts[key]
+
+    def connect_contacts(self, connect_ids):
+        key = ("connect", tuple(connect_ids))
+        if key not in self._contacts:
+            self._contacts[key] = fetch_connect_contacts(connect_ids, self.case_id, max_age_hours=self.max_age_hours)
+        return self._contacts[key]
+
+    def preload(self, include_documents=False):
+        """
+        Loads every payload up front (pipeline I/O stage), so the comparison stage does no I/O.
+        """
+        self.case_json
+        self.discussions
+        self.distributions
+        if include_documents:
+            self.documents
+        if self.case_json:
+            role_ids, connect_ids = get_contact_lookup_ids(self.contact_representors)
+            if role_ids:
+                self.role_contacts(role_ids)
+            elif connect_ids:
+                self.connect_contacts(connect_ids)
+        return self
@@ -0,0 +1,109 @@
+# case_source.py
+import re
+import zlib
+import pandas as pd
+from utils.logging_utils import log_and_print
+from utils.sql_connection import get_connection_pool
+
+
+def load_case_ids_from_file(path):
+    """
+    Reads case_ids from a text file: one or more per line, separated by commas or whitespace.
+    Anything after '#' on a line is ignored.
+    """
+    case_ids = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            case_ids.extend(int(token) for token in re.split(r"[,\s]+", line) if token)
+
+    log_and_print(f"📄 Loaded {len(case_ids)} case_ids from {path}", "info")
+    return case_ids
+
+
+def load_case_ids_from_sql(query, conn):
+    """
+    Runs a query whose first column is the case id, e.g.
+    "SELECT Case_Id FROM Menora_Conversion.dbo.Appeal WHERE Status = 2".
+    """
+    df = pd.read_sql(query, conn)
+    case_ids = [int(case_id) for case_id in df.iloc[:, 0].dropna()]
+    log_and_print(f"🗄️ Loaded {len(case_ids)} case_ids from SQL query", "info")
+    return case_ids
+
+
+def parse_case_range(value):
+    """
+    "2000001-2000500" → [2000001, ..., 2000500] (both ends included).
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*-\s*(\d+)\s*", value)
+    if not match:
+        raise ValueError(f"Invalid case range '{value}', expected START-END")
+    start, end = int(match.group(1)), int(match.group(2))
+    if end < start:
+        raise ValueError(f"Invalid case range '{value}': END is smaller than START")
+    return list(range(start, end + 1))
+
+
+def parse_shard(value):
+    """
+    "i/N" → (i, N) with 0 <= i < N.
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+    if not match:
+        raise ValueError(f"Invalid shard '{value}', expected i/N")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or index >= count:
+        raise ValueError(f"Invalid shard '{value}': need 0 <= i < N")
+    return index, count
+
+
+def shard_case_ids(case_ids, shard_index, shard_count):
+    """
+    Deterministic partition: a case belongs to shard crc32(case_id) % shard_count, so every
+    node computes the same split from the same case source regardless of list order.
+    Duplicates are dropped; the input order is kept.
+    """
+    seen = set()
+    shard = []
+    for case_id in case_ids:
+        if case_id in seen:
+            continue
+        seen.add(case_id)
+        if zlib.crc32(str(case_id).encode()) % shard_count == shard_index:
+            shard.append(case_id)
+    return shard
+
+
+def dedupe_case_ids(case_ids):
+    return list(dict.fromkeys(case_ids))
+
+
+def add_case_source_arguments(parser, title="case source"):
+    """
+    Adds --cases-file / --cases-query / --case-range (shared by main.py and prewarm.py).
+    """
+    source = parser.add_argument_group(title)
+    source.add_argument("--cases-file", help="Text file with case_ids, comma/whitespace separated")
+    source.add_argument("--cases-query", help="SQL query whose first column is the case id")
+    source.add_argument("--case-range", help="Inclusive range of case ids, e.g. 2000001-2000500")
+    return source
+
+
+def resolve_case_ids(args, default_case_ids=None):
+    """
+    Collects case_ids from --cases-file, --cases-query and --case-range (in that order,
+    duplicates dropped). Falls back to default_case_ids when none is given.
+    """
+    case_ids = []
+    if args.cases_file:
+        case_ids.extend(load_case_ids_from_file(args.cases_file))
+    if args.cases_query:
+        with get_connection_pool().connection() as conn:
+            case_ids.extend(load_case_ids_from_sql(args.cases_query, conn))
+    if args.case_range:
+        case_ids.extend(parse_case_range(args.case_range))
+
+    if not (args.cases_file or args.cases_query or args.case_range):
+        case_ids = default_case_ids or []
+    return dedupe_case_ids(case_ids)
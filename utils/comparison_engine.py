@@ -0,0 +1,275 @@
+# comparison_engine.py
+import re
+import numpy as np
+import pandas as pd
+from utils.date_utils import parse_dates
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = "string[pyarrow]"
+except ImportError:  # optional: Arrow-backed comparison columns need pyarrow
+    TEXT_DTYPE = "string"
+
+MISSING = "⛔"  # shown for a compared column that is absent from the merged frame
+
+_INT_LITERAL = re.compile(r"\s*[+-]?\d+\s*")
+_NON_DIGITS = re.compile(r"\D")
+
+
+def as_text(series):
+    """
+    str(value).strip() for every value (None → "None", NaN → "nan", like the row loops did).
+    """
+    return series.map(str).str.strip()
+
+
+def _typed_text(series):
+    """
+    Normalized text as a string column (Arrow-backed when pyarrow is installed), so the
+    comparison is one typed equality.
+    """
+    return series.astype(TEXT_DTYPE)
+
+
+def normalize_text(series):
+    return _typed_text(as_text(series))
+
+
+def normalize_text_ci(series):
+    return _typed_text(as_text(series).str.lower())
+
+
+def normalize_casefold(series):
+    """
+    Whitespace runs collapsed to one space, then casefolded.
+    """
+    return _typed_text(as_text(series).str.split().str.join(" ").str.casefold())
+
+
+def normalize_email(series):
+    return _typed_text(as_text(series).str.casefold())
+
+
+def normalize_phone(series):
+    """
+    Digits only, with the +972 country code written as a leading 0 ("+972-50-1234567" → "0501234567").
+    """
+    digits = as_text(series).str.replace(_NON_DIGITS, "", regex=True)
+    return _typed_text(digits.str.replace(r"^972(?=\d{8,9}$)", "0", regex=True))
+
+
+def normalize_id_zfill9(series):
+    """
+    Identity numbers: all-digit values left-padded to 9 digits, anything else left as stripped text.
+    """
+    text = as_text(series)
+    return _typed_text(text.where(~text.str.fullmatch(r"\d+"), text.str.zfill(9)))
+
+
+def normalize_id_zfill9_or_blank(series):
+    """
+    Like normalize_id_zfill9, but anything that is not all digits (None, "", "A123") becomes "".
+    """
+    text = as_text(series)
+    return _typed_text(text.str.zfill(9).where(text.str.fullmatch(r"\d+"), ""))
+
+
+def normalize_whitespace(series):
+    """
+    Whitespace runs collapsed to one space (case kept); None becomes "".
+    """
+    return _typed_text(series.map(lambda value: "" if value is None else " ".join(str(value).split())))
+
+
+def normalize_int(series):
+    """
+    int(value) semantics: numbers are truncated, strings must be integer literals,
+    anything else becomes NaN (which never matches).
+    """
+    values = pd.to_numeric(series, errors="coerce")
+    if not pd.api.types.is_numeric_dtype(series):
+        is_str = series.map(lambda value: isinstance(value, str))
+        is_literal = as_text(series).str.fullmatch(_INT_LITERAL.pattern)
+        values = values.where(~is_str | is_literal)
+    return np.trunc(values.astype("float64"))
+
+
+def normalize_date(series):
+    """
+    Timezone-naive datetimes (see utils.date_utils.parse_dates).
+    Unparseable values become NaT (which never matches).
+    """
+    return parse_dates(series)
+
+
+def normalize_date_second(series):
+    """
+    normalize_date truncated to whole seconds.
+    """
+    dates = parse_dates(series)
+    return dates.dt.floor("s") if pd.api.types.is_datetime64_any_dtype(dates) else dates
+
+
+NORMALIZERS = {
+    "text": normalize_text,
+    "text_ci": normalize_text_ci,
+    "casefold": normalize_casefold,
+    "email": normalize_email,
+    "phone": normalize_phone,
+    "id_zfill9": normalize_id_zfill9,
+    "id_zfill9_or_blank": normalize_id_zfill9_or_blank,
+    "whitespace": normalize_whitespace,
+    "int": normalize_int,
+    "date": normalize_date,
+    "date_second": normalize_date_second,
+}
+
+
+def column_kinds(matching_key, default_kind=None):
+    """
+    {column: kind} for a tab_config.json matchingKeys entry: its "kinds" map, with
+    default_kind(column) (or "text") for the other compared columns.
+    Raises ValueError for a kind that is not in NORMALIZERS.
+    """
+    declared = matching_key.get("kinds", {})
+    kinds = {column: declared.get(column, default_kind(column) if default_kind else "text")
+             for column in matching_key.get("columns", {})}
+    kinds.update({column: kind for column, kind in declared.items() if column not in kinds})
+    unknown = {column: kind for column, kind in kinds.items() if kind not in NORMALIZERS}
+    if unknown:
+        raise ValueError(f"Unknown comparison kind(s) {unknown} for key '{matching_key.get('key')}' "
+                         f"(expected one of {sorted(NORMALIZERS)}).")
+    return kinds
+
+
+def _column(merged, column, na_value):
+    if column not in merged.columns:
+        return pd.Series(MISSING, index=merged.index, dtype=object)
+    series = merged[column]
+    if na_value is not None:
+        series = series.astype(object).where(series.notna(), na_value)
+    return series
+
+
+def compare_fields(merged, key, fields, kinds=None, na_value=None, none_equals_empty=False, display="raw"):
+    """
+    Compares mapped columns of a merged Menora/JSON frame column by column.
+
+    Args:
+        merged: one row per matched Menora/JSON pair.
+        key: column identifying the pair (mojId, Status_Date, ...).
+        fields: [(field, menora_column, json_column)], in output order.
+        kinds: {field: NORMALIZERS name}; fields not listed compare as "text".
+        na_value: replaces NaN/None before comparing (e.g. "" or MISSING); None keeps them.
+        none_equals_empty: treat "" on one side and "None" on the other as equal.
+        display: "raw" reports the original values, "text" their stripped string form,
+            "normalized" the values as compared.
+
+    Returns:
+        DataFrame [key, "Field", "Menora", "JSON", "Match"] in row-major order, like the
+        row loops it replaces (every field of the first pair, then the next pair, ...).
+    """
+    kinds = kinds or {}
+    columns = [key, "Field", "Menora", "JSON", "Match"]
+    if merged.empty or not fields:
+        return pd.DataFrame(columns=columns)
+
+    frames = []
+    for field, menora_column, json_column in fields:
+        menora = _column(merged, menora_column, na_value)
+        json_values = _column(merged, json_column, na_value)
+        normalize = NORMALIZERS[kinds.get(field, "text")]
+        menora_normalized, json_normalized = normalize(menora), normalize(json_values)
+        match = menora_normalized.eq(json_normalized).fillna(False).astype(bool)
+
+        if none_equals_empty or display == "text":
+            menora_text, json_text = as_text(menora), as_text(json_values)
+        if none_equals_empty:
+            match |= ((menora_text == "") & (json_text.str.lower() == "none")) | \
+                     ((menora_text.str.lower() == "none") & (json_text == ""))
+        if display == "text":
+            menora, json_values = menora_text, json_text
+        elif display == "normalized":
+            menora, json_values = menora_normalized, json_normalized
+
+        frames.append(pd.DataFrame({
+            key: merged[key].to_numpy(),
+            "Field": field,
+            # dtype=object keeps values as they were (no None → NaN string-dtype inference)
+            "Menora": pd.Series(menora.to_numpy(dtype=object), dtype=object),
+            "JSON": pd.Series(json_values.to_numpy(dtype=object), dtype=object),
+            "Match": match.to_numpy(),
+            "_row": np.arange(len(merged)),
+        }))
+
+    comparison = pd.concat(frames, ignore_index=True).sort_values("_row", kind="stable")
+    return comparison.drop(columns=["_row"]).reset_index(drop=True)
+
+
+def mismatch_records(comparison, key_label="Status_Date"):
+    """
+    The mismatching rows as [{key_label, "Field", "Menora", "JSON"}] (the results-log shape).
+    """
+    if comparison.empty:
+        return []
+    key = comparison.columns[0]
+    mismatches = comparison.loc[~comparison["Match"], [key, "Field", "Menora", "JSON"]]
+    return mismatches.rename(columns={key: key_label}).to_dict("records")
+
+
+def comparison_records(comparison, key_label, menora_label="Menora Value", json_label="JSON Value"):
+    """
+    Every compared pair as [{key_label, "Field", menora_label, json_label, "Match": "✓"/"✗"}]
+    (the row shape compare_generic_data returns as well).
+    """
+    if comparison.empty:
+        return []
+    key = comparison.columns[0]
+    records = comparison.rename(columns={key: key_label, "Menora": menora_label, "JSON": json_label})
+    records["Match"] = np.where(records["Match"], "✓", "✗")
+    return records.to_dict("records")
+
+
+def _hashable(value):
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def dedupe_reverse_mismatches(comparison_results, key_label="mojId"):
+    """
+    Keeps the first mismatch per (key, Field) of comparison_records() rows, dropping it when
+    some result for the same key and field holds the reversed (Menora, JSON) value pair.
+    Pairs are looked up in a set of hashed (key, Field, Menora, JSON) tuples, so this is
+    linear in the results.
+
+    Returns:
+        [{"Status_Date": key, "Field", "Menora", "JSON"}] (the results-log shape).
+    """
+    value_pairs = {
+        (r[key_label], r["Field"], _hashable(r["Menora Value"]), _hashable(r["JSON Value"]))
+        for r in comparison_results
+    }
+
+    mismatched_fields = []
+    seen_mismatches = set()
+    for row in comparison_results:
+        if row.get("Match") != "✗":
+            continue
+        key = (row[key_label], row["Field"])
+        if key in seen_mismatches:
+            continue
+        seen_mismatches.add(key)
+
+        reverse_key = (*key, _hashable(row["JSON Value"]), _hashable(row["Menora Value"]))
+        if reverse_key in value_pairs:
+            continue  # a known reverse duplicate
+
+        mismatched_fields.append({
+            "Status_Date": row.get(key_label),
+            "Field": row.get("Field"),
+            "Menora": row.get("Menora Value"),
+            "JSON": row.get("JSON Value")
+        })
+    return mismatched_fields
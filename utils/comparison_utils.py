@@ -1,10 +1,10 @@
 # comparison_utils.py
 import pandas as pd
 from utils.logging_utils import log_and_print
+from utils.comparison_engine import compare_fields, comparison_records, mismatch_records
 from collections import defaultdict
 
 def compare_generic_data(json_df, sql_df, field_map, join_key='mojId', tab_name='Tab'):
-    results = []
     mismatches = defaultdict(list)
 
     # Normalize join key names
@@ -13,20 +13,11 @@ def compare_generic_data(json_df, sql_df, field_map, join_key='mojId', tab_name=
 
     merged = pd.merge(sql_df, json_df, on='mojId', suffixes=('_sql', '_json'))
 
-    for _, row in merged.iterrows():
-        for sql_field, json_field in field_map.items():
-            left = row.get(f"{sql_field}_sql", "⛔")
-            right = row.get(f"{json_field}_json", "⛔")
-            match = str(left).strip() == str(right).strip()
-            results.append({
-                "mojId": row['mojId'],
-                "Field": sql_field,
-                "SQL Value": left,
-                "JSON Value": right,
-                "Match": "✓" if match else "✗"
-            })
-            if not match:
-                mismatches[row['mojId']].append(sql_field)
+    fields = [(sql_field, f"{sql_field}_sql", f"{json_field}_json") for sql_field, json_field in field_map.items()]
+    comparison = compare_fields(merged, 'mojId', fields)
+    results = comparison_records(comparison, 'mojId', menora_label="SQL Value")
+    for row in mismatch_records(comparison, 'mojId'):
+        mismatches[row['mojId']].append(row['Field'])
 
     if mismatches:
         log_and_print(f"❌ Found mismatches in {len(mismatches)} {tab_name.lower()}(s).", "warning")
@@ -0,0 +1,167 @@
+# concurrency.py
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+import requests
+from dotenv import load_dotenv
+from utils.logging_utils import log_and_print
+
+load_dotenv()
+
+THROTTLE_STATUSES = {429, 503}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class AdaptiveConcurrencyController:
+    """
+    Limits the number of cases in flight and adjusts that limit from what the backends report.
+
+    Every SQL query and HTTP call is recorded per backend (latency, status, error). Every
+    adjust_interval seconds the controller looks at the last `window` calls per backend:
+    - any 429/503 or an error rate above max_error_rate → shrink the limit by 30% (backend is hurting)
+    - p95 latency above target_p95 or p50 above 2x the best p50 seen → shrink by 1 (queueing)
+    - otherwise, if the limit is actually saturated → grow by 1
+    The limit always stays within [floor, ceiling]; every change is logged with its reason.
+    """
+
+    def __init__(self, floor=2, ceiling=24, initial=6, window=100, target_p95=5.0, max_error_rate=0.05, adjust_interval=10.0):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.limit = max(floor, min(ceiling, initial))
+        self.window = window
+        self.target_p95 = target_p95
+        self.max_error_rate = max_error_rate
+        self.adjust_interval = adjust_interval
+        self.in_flight = 0
+        self._saturated = False
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._best_p50 = {}
+        self._last_adjust = time.monotonic()
+        self._condition = threading.Condition()
+
+    @property
+    def adaptive(self):
+        return self.floor != self.ceiling
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._saturated = True
+                self._condition.wait(1.0)
+                self._maybe_adjust()
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._saturated = True
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._maybe_adjust()
+            self._condition.notify_all()
+
+    def record(self, backend, latency, status=None, error=False):
+        with self._condition:
+            self._samples[backend].append((latency, status, error))
+
+    def _maybe_adjust(self):
+        # Called with the condition held.
+        now = time.monotonic()
+        if not self.adaptive or now - self._last_adjust < self.adjust_interval:
+            return
+        self._last_adjust = now
+
+        decision, reason = "grow" if self._saturated else "hold", "all backends healthy"
+        for backend, samples in self._samples.items():
+            if len(samples) < 5:
+                continue
+            latencies = [s[0] for s in samples]
+            p50 = _percentile(latencies, 50)
+            p95 = _percentile(latencies, 95)
+            throttled = sum(1 for s in samples if s[1] in THROTTLE_STATUSES)
+            error_rate = sum(1 for s in samples if s[2] or (s[1] is not None and s[1] >= 500)) / len(samples)
+            best = self._best_p50.get(backend)
+            self._best_p50[backend] = p50 if best is None else min(best, p50)
+
+            if throttled or error_rate > self.max_error_rate:
+                decision = "backoff"
+                reason = f"{backend}: {throttled} throttled (429/503), error rate {error_rate:.0%}"
+                break
+            if p95 > self.target_p95 or (best is not None and p50 > 2 * best):
+                decision = "shrink"
+                reason = f"{backend}: p50 {p50:.2f}s (best {self._best_p50[backend]:.2f}s), p95 {p95:.2f}s (target {self.target_p95:.2f}s)"
+
+        old_limit = self.limit
+        if decision == "backoff":
+            self.limit = max(self.floor, int(self.limit * 0.7))
+        elif decision == "shrink":
+            self.limit = max(self.floor, self.limit - 1)
+        elif decision == "grow":
+            self.limit = min(self.ceiling, self.limit + 1)
+        self._saturated = False
+
+        if self.limit != old_limit:
+            log_and_print(f"🎚️ Concurrency {old_limit} → {self.limit} ({decision}: {reason})", "info")
+
+    def log_summary(self):
+        with self._condition:
+            for backend, samples in self._samples.items():
+                latencies = [s[0] for s in samples]
+                if latencies:
+                    log_and_print(
+                        f"📈 {backend}: last {len(latencies)} calls p50 {_percentile(latencies, 50):.2f}s, "
+                        f"p95 {_percentile(latencies, 95):.2f}s", "info"
+                    )
+            log_and_print(f"🎚️ Final concurrency limit: {self.limit} (floor {self.floor}, ceiling {self.ceiling})", "info")
+
+
+_controller = None
+
+
+def create_controller():
+    """
+    Builds the run's controller from CONCURRENCY_* settings and makes it the active one.
+    With ADAPTIVE_CONCURRENCY=false the limit is fixed at CONCURRENCY_INITIAL.
+    """
+    global _controller
+    initial = int(os.getenv("CONCURRENCY_INITIAL", "6"))
+    if os.getenv("ADAPTIVE_CONCURRENCY", "false").lower() == "true":
+        _controller = AdaptiveConcurrencyController(
+            floor=int(os.getenv("CONCURRENCY_FLOOR", "2")),
+            ceiling=int(os.getenv("CONCURRENCY_CEILING", "24")),
+            initial=initial,
+            target_p95=float(os.getenv("CONCURRENCY_TARGET_P95_SECONDS", "5")),
+            adjust_interval=float(os.getenv("CONCURRENCY_ADJUST_SECONDS", "10")),
+        )
+    else:
+        _controller = AdaptiveConcurrencyController(floor=initial, ceiling=initial, initial=initial)
+    return _controller
+
+
+def record_backend_call(backend, latency, status=None, error=False):
+    """
+    Reports one backend call to the active controller (no-op when none is running).
+    """
+    if _controller is not None:
+        _controller.record(backend, latency, status, error)
+
+
+def observed_request(method, url, **kwargs):
+    """
+    requests.request that reports latency and status per host to the concurrency controller.
+    """
+    backend = urlsplit(url).hostname or "http"
+    started = time.perf_counter()
+    try:
+        response = requests.request(method, url, **kwargs)
+    except Exception:
+        record_backend_call(backend, time.perf_counter() - started, error=True)
+        raise
+    record_backend_call(backend, time.perf_counter() - started, status=response.status_code)
+    return response
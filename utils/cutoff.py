@@ -0,0 +1,94 @@
+# cutoff.py
+import os
+import pandas as pd
+from dateutil.parser import parse as dateutil_parse
+from dotenv import load_dotenv
+from utils.logging_utils import log_and_print
+from utils.date_utils import parse_dates
+
+
+def parse_cutoff(raw_cutoff, name="CUTOFF"):
+    """
+    "ddmmyy" (e.g. 250421) → datetime at midnight.
+    """
+    if not raw_cutoff or len(raw_cutoff) != 6 or not raw_cutoff.isdigit():
+        raise ValueError(f"❌ Invalid or missing {name} in environment. Expected format: ddmmyy (e.g., 250421)")
+    return dateutil_parse(f"20{raw_cutoff[4:6]}-{raw_cutoff[2:4]}-{raw_cutoff[0:2]}T00:00:00").replace(tzinfo=None)
+
+
+def load_cutoff_window():
+    """
+    Returns (lower, upper) from .env: upper is CUTOFF (required). lower is LOWER_CUTOFF
+    only with CUTOFF_WINDOW_ENABLED=true, otherwise None (everything up to CUTOFF, as
+    before windows existed). Records dated inside [lower, upper] are reported; the rest
+    are ignored by policy.
+    """
+    load_dotenv()
+    upper = parse_cutoff(os.getenv("CUTOFF"))
+    raw_lower = (os.getenv("LOWER_CUTOFF") or "").strip()
+    enabled = os.getenv("CUTOFF_WINDOW_ENABLED", "false").lower() == "true"
+    lower = parse_cutoff(raw_lower, "LOWER_CUTOFF") if enabled and raw_lower else None
+    if lower is not None and lower > upper:
+        raise ValueError(f"❌ LOWER_CUTOFF {lower:%d/%m/%Y} is after CUTOFF {upper:%d/%m/%Y}")
+    log_and_print(f"🔍 CUTOFF window: {lower or '-∞'} → {upper}", level="debug")
+    return lower, upper
+
+
+def outside_window(date, window):
+    """
+    True when date falls outside window = (lower, upper): after upper or before lower.
+    NaT / None are never outside.
+    """
+    lower, upper = window
+    if date is None or pd.isna(date):
+        return False
+    return date > upper or (lower is not None and date < lower)
+
+
+def describe_window(window):
+    lower, upper = window
+    if lower is None:
+        return f"after cutoff {upper:%d/%m/%Y}"
+    return f"outside the CUTOFF window {lower:%d/%m/%Y} → {upper:%d/%m/%Y}"
+
+
+class CutoffIndex:
+    """
+    id → parsed date for one frame (the first row of each id), built once, so whole id
+    lists can be checked against the cutoff window in one step.
+    Unparseable or empty dates become NaT.
+    """
+
+    def __init__(self, frame, date_column, id_column="mojId"):
+        if frame is None or id_column not in frame.columns or date_column not in frame.columns:
+            self.dates = pd.Series(dtype=object)
+            return
+        first_rows = frame.drop_duplicates(subset=id_column, keep="first")
+        dates = parse_dates(first_rows[date_column])
+        self.dates = pd.Series(dates.to_numpy(), index=first_rows[id_column].to_numpy())
+
+    def in_window(self, ids, window, keep_unknown=False):
+        """
+        Boolean mask over ids: dated inside window = (lower, upper), both ends included.
+        Ids without a row or without a parseable date get keep_unknown.
+        """
+        lower, upper = window
+        dates = pd.to_datetime(self.dates.reindex(list(ids)), errors="coerce")
+        known = dates.notna()
+        inside = known & (dates <= upper)
+        if lower is not None:
+            inside &= dates >= lower
+        return (inside | (~known & keep_unknown)).to_numpy()
+
+    def filter(self, ids, window, keep_unknown=False, label=""):
+        """
+        The ids (in order) that in_window keeps.
+        """
+        ids = list(ids)
+        if not ids:
+            return []
+        mask = self.in_window(ids, window, keep_unknown)
+        skipped = len(ids) - int(mask.sum())
+        if skipped:
+            log_and_print(f"✅ Skipping {skipped} [{label}] record(s) outside the CUTOFF window", "debug")
+        return [moj for moj, keep in zip(ids, mask) if keep]
@@ -0,0 +1,110 @@
+# date_utils.py
+import re
+from functools import lru_cache
+import pandas as pd
+from dateutil.parser import parse as dateutil_parse
+
+LOCAL_TIMEZONE = "Asia/Jerusalem"
+
+# ISO / SQL timestamps ("2025-04-21", "2025-04-21 10:15:00.123", "2025-04-21T10:15:00Z", ...)
+_ISO_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?")
+_ISO_OFFSET = re.compile(r"(?<=\d{2}:\d{2})(?::\d{2}(?:\.\d+)?)?\s*(Z|[+-]\d{2}(?::?\d{2})?)$")
+
+
+@lru_cache(maxsize=65536)
+def _dateutil(text):
+    """
+    dateutil's reading of text (timezone-aware when it carries an offset), None if unparseable.
+    """
+    try:
+        return dateutil_parse(text)
+    except Exception:
+        return None
+
+
+def _to_wall_time(parsed):
+    return pd.NaT if parsed is None else parsed.replace(tzinfo=None)
+
+
+def _to_local(parsed):
+    if parsed is None:
+        return pd.NaT
+    stamp = pd.Timestamp(parsed)
+    stamp = stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp
+    return stamp.tz_convert(LOCAL_TIMEZONE).tz_localize(None)
+
+
+def parse_date(value):
+    """
+    dateutil.parse(str(value)).replace(tzinfo=None), memoized; NaT if unparseable.
+    """
+    return _to_wall_time(_dateutil(str(value).strip()))
+
+
+def _split_offset(text):
+    """
+    "2025-04-21T10:15:00+03:00" → ("2025-04-21T10:15:00", "+03:00"); offset is "" when absent.
+    """
+    match = _ISO_OFFSET.search(text)
+    if not match:
+        return text, ""
+    return text[:match.start(1)].rstrip(), match.group(1)
+
+
+def _parse_unique(texts, to_local):
+    """
+    {text: naive datetime or NaT}. ISO/SQL timestamps are parsed in one vectorized
+    pd.to_datetime call; anything else goes through the memoized dateutil parse.
+    """
+    parsed = {}
+    iso_texts, iso_values = [], []
+    for text in texts:
+        wall, offset = _split_offset(text)
+        if _ISO_TIMESTAMP.fullmatch(wall):
+            iso_texts.append(text)
+            iso_values.append(text if to_local else wall)
+        else:
+            parsed[text] = None
+
+    if iso_texts:
+        if to_local:
+            values = pd.to_datetime(pd.Series(iso_values, dtype=object), format="ISO8601", errors="coerce", utc=True)
+            values = values.dt.tz_convert(LOCAL_TIMEZONE).dt.tz_localize(None)
+        else:
+            values = pd.to_datetime(pd.Series(iso_values, dtype=object), format="ISO8601", errors="coerce")
+        for text, value in zip(iso_texts, values):
+            parsed[text] = value if pd.notna(value) else None
+
+    convert = _to_local if to_local else _to_wall_time
+    return {text: value if value is not None else convert(_dateutil(text)) for text, value in parsed.items()}
+
+
+def parse_dates(series, to_local=False):
+    """
+    Parses a column of date values; each distinct value is parsed once.
+
+    Args:
+        series: raw values (strings, datetimes, ...); each is read as str(value).strip().
+        to_local: False keeps the written wall time and drops any offset (what
+            dateutil.parse(...).replace(tzinfo=None) did); True converts the instant to
+            Asia/Jerusalem, reading values without an offset as UTC.
+
+    Returns:
+        Series of naive datetimes aligned with series (datetime64 when every value fits,
+        object otherwise); unparseable values become NaT.
+    """
+    text = series.astype(object).map(str).str.strip()
+    parsed = _parse_unique(text.unique(), to_local)
+    result = pd.Series(text.map(parsed).to_numpy(dtype=object), index=series.index, dtype=object)
+    try:
+        return pd.to_datetime(result)
+    except (ValueError, TypeError, OverflowError):
+        return result
+
+
+def format_dates(series, fmt):
+    """
+    strftime(fmt) for every parsed date, None where the date is NaT.
+    """
+    formatted = series.map(lambda value: value.strftime(fmt) if pd.notna(value) else None)
+    return formatted.astype(object).where(series.notna(), None)
@@ -1,8 +1,22 @@
 import os
+import gzip
 import json
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 import requests
+try:
+    import zstandard
+except ImportError:  # optional: CACHE_COMPRESSION=zstd needs the zstandard package
+    zstandard = None
 from dotenv import load_dotenv, set_key
 from utils.logging_utils import log_and_print
+from utils.concurrency import observed_request
+from utils.cache_store import get_cache_store
+from utils.single_flight import SingleFlight, single_flight
+from utils import json_codec
+from configs.config_loader import load_cache_policy
 
 load_dotenv()
 
@@ -14,6 +28,136 @@ ENV_PATH = os.path.join(os.getcwd(), ".env")
 
 BASE_CACHE_DIR = os.path.join("data")
 
+# On-disk cache codecs, keyed by CACHE_COMPRESSION. Payloads are stored as compact JSON;
+# reads recognise every codec by extension, so switching codecs migrates files lazily.
+CACHE_CODECS = {
+    "none": {"ext": "", "compress": lambda raw: raw, "decompress": lambda raw: raw},
+    "gzip": {
+        "ext": ".gz",
+        "compress": lambda raw: gzip.compress(raw, compresslevel=6),
+        "decompress": gzip.decompress,
+    },
+}
+if zstandard is not None:
+    CACHE_CODECS["zstd"] = {
+        "ext": ".zst",
+        "compress": lambda raw: zstandard.ZstdCompressor(level=10).compress(raw),
+        "decompress": lambda raw: zstandard.ZstdDecompressor().decompress(raw),
+    }
+
+# "files": data/{case_id}/ tree; "sqlite": one database file (utils/cache_store.py)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "files").lower()
+
+_cache_policy = None  # cachePolicy section of configs/tab_config.json, loaded on first use
+
+# Statuses that mean "nothing there" and are cached as negative entries.
+NEGATIVE_STATUSES = {204, 404}
+
+# Concurrent fetches of the same key share one request (see utils/single_flight.py).
+fetch_flights = SingleFlight()
+_cache_stats = {"hits": 0, "misses": 0, "stale": 0}
+_cache_stats_lock = threading.Lock()
+
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "gzip").lower()
+if CACHE_COMPRESSION not in CACHE_CODECS:
+    log_and_print(f"⚠️ CACHE_COMPRESSION={CACHE_COMPRESSION} is not available, using gzip", "warning")
+    CACHE_COMPRESSION = "gzip"
+
+
+class MemoryCache:
+    """
+    Process-wide LRU of decoded cache files, keyed by path and bounded by the total size
+    of the decoded JSON. An entry is served only while the file's (mtime, size) is the one
+    it was loaded from, so files rewritten by other workers or processes are re-read.
+
+    Read-only contract: every payload the fetchers return (from this tier, a single-flight
+    join or a CaseContext) is one object shared by all callers and is never copied.
+    Callers must not mutate it; build DataFrames / new dicts from it instead.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (signature, data, size)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path):
+        """
+        Returns (found, data).
+        """
+        if self.max_bytes <= 0:
+            return False, None
+        signature = self.signature(path)
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return True, cached[1]
+            self.misses += 1
+            return False, None
+
+    def put(self, path, data, size, signature=None):
+        """
+        signature: the file's signature from before it was read, so a concurrent rewrite
+        between reading and storing is not mistaken for the file that was parsed.
+        """
+        if size > self.max_bytes:  # also covers a disabled tier (max_bytes <= 0)
+            self.discard(path)
+            return
+        signature = signature or self.signature(path)
+        with self._lock:
+            self._remove(path)
+            if signature is None:
+                return
+            self._entries[path] = (signature, data, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, path):
+        with self._lock:
+            self._remove(path)
+
+    def _remove(self, path):
+        cached = self._entries.pop(path, None)
+        if cached is not None:
+            self.bytes -= cached[2]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self._entries), "bytes": self.bytes,
+            }
+
+
+# In-memory tier in front of the files backend; CACHE_MEMORY_MB=0 disables it.
+memory_cache = MemoryCache(int(float(os.getenv("CACHE_MEMORY_MB", "256")) * 1024 * 1024))
+
+# Back-office endpoints (shared with utils/async_fetcher.py)
+CASE_URL = "{base_url}/api/Case/GetCase?CaseId={case_id}"
+ROLE_CONTACTS_URL = "https://bo-contacts-int.prod.k8s.justice.gov.il/api/RoleInCorporation"
+DISCUSSIONS_URL = "https://bo-discussions-int.prod.k8s.justice.gov.il/api/DiscussionsBo/All/{case_id}"
+DISTRIBUTIONS_URL = "https://bo-distribution-int.prod.k8s.justice.gov.il/api/Distribution/GetDistributionsByCaseOrRequest?CaseId={case_id}"
+
+
+def build_role_contacts_url(role_ids):
+    params = "&".join(f"RoleInCorporationIds={rid}" for rid in role_ids)
+    return f"{ROLE_CONTACTS_URL}?{params}"
+
 
 def get_case_dir(case_id):
     """
@@ -26,87 +170,435 @@ def get_case_dir(case_id):
 
 def get_tab_file_path(case_id, prefix):
     """
-    Builds a path like: data/{case_id}/{prefix}_{case_id}.json
-    Example: prefix='doc' → data/123456/doc_123456.json
+    Builds a path like: data/{case_id}/{prefix}_{case_id}.json plus the extension of the
+    configured CACHE_COMPRESSION codec.
+    Example: prefix='doc' → data/123456/doc_123456.json.gz
     """
     case_dir = get_case_dir(case_id)
-    filename = f"{prefix}_{case_id}.json"
+    filename = f"{prefix}_{case_id}.json{CACHE_CODECS[CACHE_COMPRESSION]['ext']}"
     return os.path.join(case_dir, filename)
 
 
+def _json_base_path(path):
+    for codec in CACHE_CODECS.values():
+        if codec["ext"] and path.endswith(codec["ext"]):
+            return path[:-len(codec["ext"])]
+    return path
+
+
+def _codec_for_path(path):
+    for codec in CACHE_CODECS.values():
+        if codec["ext"] and path.endswith(codec["ext"]):
+            return codec
+    return CACHE_CODECS["none"]
+
+
+def _read_json_file(path):
+    return _read_json_file_sized(path)[0]
+
+
+def _read_json_file_sized(path):
+    """
+    Returns (data, size of the decoded JSON in bytes).
+    """
+    with open(path, "rb") as f:
+        raw = _codec_for_path(path)["decompress"](f.read())
+    return json_codec.loads(raw), len(raw)
+
+
 def read_cached_json(path):
     """
-    Reads a JSON file from disk if it exists.
+    Reads a cached JSON payload from disk if it exists.
+    Files in another format (e.g. a legacy indented .json next to a requested .json.gz)
+    are read as well and rewritten in the requested format.
+    Recently read payloads are served from memory_cache without touching the file's contents.
     """
+    found, data = memory_cache.get(path)
+    if found:
+        return data
+
     if os.path.exists(path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            signature = MemoryCache.signature(path)
+            data, size = _read_json_file_sized(path)
+            memory_cache.put(path, data, size, signature)
+            return data
         except Exception as e:
             log_and_print(f"⚠️ Failed reading {path}: {e}", "warning")
+            return None
+
+    base_path = _json_base_path(path)
+    for codec in CACHE_CODECS.values():
+        legacy_path = base_path + codec["ext"]
+        if legacy_path == path or not os.path.exists(legacy_path):
+            continue
+        try:
+            data = _read_json_file(legacy_path)
+        except Exception as e:
+            log_and_print(f"⚠️ Failed reading {legacy_path}: {e}", "warning")
+            continue
+        if write_json_to_cache(path, data):
+            memory_cache.discard(path)
+            try:
+                legacy_stat = os.stat(legacy_path)
+                os.utime(path, (legacy_stat.st_atime, legacy_stat.st_mtime))  # keeps the original fetch time
+                os.remove(legacy_path)
+                log_and_print(f"🗜️ Migrated {legacy_path} → {path}", "debug")
+            except OSError as e:
+                # another reader migrated (or a fetch replaced) the same entry concurrently
+                log_and_print(f"⚠️ Could not finish migrating {legacy_path}: {e}", "debug")
+        return data
     return None
 
 
+def _atomic_write_bytes(path, raw):
+    """
+    Writes to a temp file in the same directory and renames it over path, so readers
+    see either the old or the new file, never a half-written one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def write_json_to_cache(path, data):
     """
-    Writes JSON data to disk.
+    Writes JSON data to disk as compact JSON, compressed according to the path's extension.
+    Returns True on success.
     """
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        raw = json_codec.dumps(data)
+        _atomic_write_bytes(path, _codec_for_path(path)["compress"](raw))
+        memory_cache.put(path, data, len(raw))
         log_and_print(f"💾 Saved JSON to {path}")
+        return True
     except Exception as e:
         log_and_print(f"❌ Failed to save JSON to {path}: {e}", "error")
+        return False
+
+
+def get_tab_meta_path(path):
+    """
+    data/1/case_1.json.gz → data/1/case_1.meta.json (ETag / Last-Modified of the payload).
+    """
+    return _json_base_path(path)[:-len(".json")] + ".meta.json"
+
+
+def read_tab_meta(path):
+    """
+    Returns {"fetched_at", "etag", "last_modified"} for a cache file. The fetch time is
+    the file's modification time (touch_tab_cache bumps it after a 304); validators come
+    from the sidecar, if the API sent any.
+    """
+    meta = {"fetched_at": os.path.getmtime(path), "etag": None, "last_modified": None}
+    meta_path = get_tab_meta_path(path)
+    if os.path.exists(meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta.update(json.load(f))
+        except Exception as e:
+            log_and_print(f"⚠️ Failed reading {meta_path}: {e}", "warning")
+    return meta
+
+
+def _write_tab_meta(path, validators):
+    meta_path = get_tab_meta_path(path)
+    if validators and any(validators.values()):
+        _atomic_write_bytes(meta_path, json.dumps(validators).encode("utf-8"))
+    elif os.path.exists(meta_path):
+        os.remove(meta_path)  # validators of an older payload no longer apply
+
+
+def get_negative_marker_path(case_id, prefix):
+    """
+    data/1/disc_1.neg.json: marks that the API answered 204/404 for this case and prefix.
+    """
+    return os.path.join(get_case_dir(case_id), f"{prefix}_{case_id}.neg.json")
+
+
+def _get_cache_policy_value(prefix, key):
+    global _cache_policy
+    if _cache_policy is None:
+        _cache_policy = load_cache_policy()
+    policy = _cache_policy.get(prefix, {})
+    if key in policy:
+        return policy[key]
+    return _cache_policy.get("default", {}).get(key)
+
+
+def get_cache_ttl_hours(prefix, negative=False):
+    """
+    TTL of an endpoint from the cachePolicy section of configs/tab_config.json
+    (None = cached payloads never expire). Negative entries (empty payloads, 204/404
+    markers) use negativeTtlHours instead of ttlHours.
+    """
+    return _get_cache_policy_value(prefix, "negativeTtlHours" if negative else "ttlHours")
+
+
+def is_negative_entry(entry):
+    """
+    True for entries that record "nothing there": a 204/404 marker or an empty {} / [] payload.
+    """
+    return entry.get("status") is not None or not entry["data"]
+
+
+def is_entry_fresh(entry, prefix, max_age_hours=None):
+    """
+    True when the entry is younger than max_age_hours, or than the endpoint's TTL
+    (its negative TTL for negative entries) when max_age_hours is None.
+    """
+    max_age = max_age_hours if max_age_hours is not None else get_cache_ttl_hours(prefix, is_negative_entry(entry))
+    if max_age is None:
+        return True
+    return time.time() - entry["fetched_at"] <= max_age * 3600
+
+
+def conditional_headers(entry):
+    """
+    If-None-Match / If-Modified-Since headers for revalidating a stale entry.
+    """
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def response_validators(response_headers):
+    return {"etag": response_headers.get("ETag"), "last_modified": response_headers.get("Last-Modified")}
+
+
+def read_tab_cache_entry(case_id, prefix, params=""):
+    """
+    Reads one cache entry from the configured CACHE_BACKEND:
+    {"data", "fetched_at", "etag", "last_modified", "status"} or None.
+    status is 204/404 for negative markers, None for stored payloads.
+    The files backend ignores params (one file per case and prefix).
+    """
+    if CACHE_BACKEND == "sqlite":
+        try:
+            return get_cache_store().get_entry(prefix, case_id, params)
+        except Exception as e:
+            log_and_print(f"⚠️ Failed reading {prefix} of case {case_id} from cache DB: {e}", "warning")
+            return None
+
+    path = get_tab_file_path(case_id, prefix)
+    data = read_cached_json(path)
+    if data is not None:
+        return {"data": data, "status": None, **read_tab_meta(path)}
+
+    marker_path = get_negative_marker_path(case_id, prefix)
+    if not os.path.exists(marker_path):
+        return None
+    try:
+        with open(marker_path, "rb") as f:
+            marker = json_codec.loads(f.read())
+    except Exception as e:
+        log_and_print(f"⚠️ Failed reading {marker_path}: {e}", "warning")
+        return None
+    return {
+        "data": marker.get("data"), "status": marker.get("status"),
+        "fetched_at": os.path.getmtime(marker_path), "etag": None, "last_modified": None,
+    }
+
+
+def read_tab_cache(case_id, prefix, params=""):
+    """
+    Reads one cached payload from the configured CACHE_BACKEND, regardless of its age.
+    """
+    entry = read_tab_cache_entry(case_id, prefix, params)
+    return entry["data"] if entry is not None else None
+
+
+def get_fresh_cache_entry(case_id, prefix, force_refresh=False, max_age_hours=None):
+    """
+    Returns (entry, fresh). With force_refresh the cache is not consulted: (None, False).
+    """
+    if force_refresh:
+        record_cache_event("misses")
+        return None, False
+    entry = read_tab_cache_entry(case_id, prefix)
+    fresh = entry is not None and is_entry_fresh(entry, prefix, max_age_hours)
+    record_cache_event("hits" if fresh else "misses")
+    return entry, fresh
+
+
+def stale_or(entry, fallback, case_id, prefix, reason):
+    """
+    Value for a failed revalidation (network error, 401, 5xx, ...): the stale cached
+    payload when there is one, so an expired TTL never turns cached data into a gap.
+    Otherwise fallback.
+    """
+    if entry is None or entry["data"] is None:
+        return fallback
+    record_cache_event("stale")
+    log_and_print(f"⚠️ Serving stale cached {prefix} of case {case_id}: revalidation failed ({reason})", "warning")
+    return entry["data"]
+
+
+def record_cache_event(event):
+    with _cache_stats_lock:
+        _cache_stats[event] += 1
+
+
+def log_cache_stats():
+    """
+    Logs this process's cache hits/misses and single-flight joins (concurrent fetches of
+    the same key that waited for one in-flight request instead of sending their own).
+    """
+    with _cache_stats_lock:
+        hits, misses, stale = _cache_stats["hits"], _cache_stats["misses"], _cache_stats["stale"]
+    total = hits + misses
+    hit_rate = f"{hits / total:.0%}" if total else "n/a"
+    log_and_print(
+        f"🗃️ API cache: {hits} hits, {misses} misses (hit rate {hit_rate}), {stale} stale served, "
+        f"{fetch_flights.joins} single-flight joins", "info"
+    )
+    if CACHE_BACKEND == "files" and memory_cache.max_bytes > 0:
+        memory = memory_cache.stats()
+        log_and_print(
+            f"🧠 Memory tier: {memory['hits']} hits, {memory['misses']} misses, {memory['evictions']} evictions, "
+            f"{memory['entries']} entries / {memory['bytes'] / (1024 * 1024):.1f} MB of {memory_cache.max_bytes / (1024 * 1024):.0f} MB", "info"
+        )
+
+
+def write_tab_cache(case_id, prefix, data, params="", validators=None):
+    """
+    Writes one payload (and the response's ETag/Last-Modified, if any) to the configured
+    CACHE_BACKEND. Returns True on success.
+    """
+    validators = validators or {}
+    if CACHE_BACKEND == "sqlite":
+        try:
+            get_cache_store().put(prefix, case_id, data, params, etag=validators.get("etag"), last_modified=validators.get("last_modified"))
+            log_and_print(f"💾 Saved {prefix} of case {case_id} to cache DB")
+            return True
+        except Exception as e:
+            log_and_print(f"❌ Failed to save {prefix} of case {case_id} to cache DB: {e}", "error")
+            return False
+
+    path = get_tab_file_path(case_id, prefix)
+    if not write_json_to_cache(path, data):
+        return False
+    _write_tab_meta(path, validators)
+    marker_path = get_negative_marker_path(case_id, prefix)
+    if os.path.exists(marker_path):
+        os.remove(marker_path)
+    return True
+
+
+def write_negative_cache(case_id, prefix, status, data=None):
+    """
+    Records that the API answered status (204 / 404) for this case and prefix. data is
+    what the fetcher returns in that case (None for the case JSON, {} for the tabs), so
+    a cached answer looks exactly like a live one. Expires after negativeTtlHours.
+    """
+    try:
+        if CACHE_BACKEND == "sqlite":
+            get_cache_store().put(prefix, case_id, data, status=status)
+        else:
+            path = get_tab_file_path(case_id, prefix)
+            memory_cache.discard(path)
+            if os.path.exists(path):
+                os.remove(path)
+            marker = json_codec.dumps({"status": status, "data": data})
+            _atomic_write_bytes(get_negative_marker_path(case_id, prefix), marker)
+        log_and_print(f"🚫 Cached {status} for {prefix} of case {case_id}", "debug")
+    except Exception as e:
+        log_and_print(f"⚠️ Failed to cache {status} for {prefix} of case {case_id}: {e}", "warning")
+
+
+def touch_tab_cache(case_id, prefix, validators=None, params=""):
+    """
+    Marks a cached payload as revalidated now (the API answered 304 Not Modified).
+    """
+    validators = validators or {}
+    try:
+        if CACHE_BACKEND == "sqlite":
+            get_cache_store().touch(prefix, case_id, params, etag=validators.get("etag"), last_modified=validators.get("last_modified"))
+            return
+        path = get_tab_file_path(case_id, prefix)
+        if any(validators.values()):
+            meta = read_tab_meta(path)
+            _write_tab_meta(path, {
+                "etag": validators.get("etag") or meta["etag"],
+                "last_modified": validators.get("last_modified") or meta["last_modified"],
+            })
+        os.utime(path)
+    except Exception as e:
+        log_and_print(f"⚠️ Failed to mark {prefix} of case {case_id} as revalidated: {e}", "warning")
 
 
-def fetch_case_details(case_id):
+def fetch_case_details(case_id, cached_entry=None):
+    """
+    Downloads the case JSON. With a cached_entry the request is conditional, and a
+    304 Not Modified returns the cached payload.
+    """
     global BEARER_TOKEN
-    url = f"{BASE_URL}/api/Case/GetCase?CaseId={case_id}"
+    url = CASE_URL.format(base_url=BASE_URL, case_id=case_id)
     headers = {
         "Authorization": f"Bearer {BEARER_TOKEN}",
         "Moj-Application-Id": MOJ_APP_ID,
-        "Accept": "application/json"
+        "Accept": "application/json",
+        **conditional_headers(cached_entry)
     }
 
     while True:
         try:
             log_and_print(f"\U0001F310 Fetching case JSON from API for CaseId {case_id}...")
-            response = requests.get(url, headers=headers, verify=False)
+            response = observed_request("GET", url, headers=headers, verify=False)
             if response.status_code == 401:
                 log_and_print("❌ Authorization failed (401). Token may have expired.", "error")
                 new_token = input("Enter a new auth token: ").strip()
                 if not new_token:
                     log_and_print("❌ No token provided. Exiting fetch.", "error")
-                    return None
+                    return stale_or(cached_entry, None, case_id, "case", "401")
                 BEARER_TOKEN = new_token
                 headers["Authorization"] = f"Bearer {new_token}"
                 set_key(ENV_PATH, "BEARER_TOKEN", new_token)
                 continue
+            if response.status_code == 304 and cached_entry is not None:
+                log_and_print(f"♻️ Case {case_id} not modified, cached JSON revalidated", "debug")
+                touch_tab_cache(case_id, "case", response_validators(response.headers))
+                return cached_entry["data"]
+            if response.status_code in NEGATIVE_STATUSES:
+                log_and_print(f"⚠️ No data found for CaseId {case_id} ({response.status_code})", "warning")
+                write_negative_cache(case_id, "case", response.status_code)
+                return None
             response.raise_for_status()
-            case_json = response.json()
-            path = get_tab_file_path(case_id, "case")
-            write_json_to_cache(path, case_json)
+            case_json = json_codec.response_json(response)
+            write_tab_cache(case_id, "case", case_json, validators=response_validators(response.headers))
             return case_json
         except Exception as e:
             log_and_print(f"❌ Failed to fetch case {case_id}: {e}", "error")
-            return None
+            return stale_or(cached_entry, None, case_id, "case", e)
 
 
-def get_case_data(case_id, force_refresh=False):
+@single_flight(fetch_flights, lambda case_id, force_refresh=False, max_age_hours=None: ("case", case_id, force_refresh, max_age_hours))
+def get_case_data(case_id, force_refresh=False, max_age_hours=None):
     """
-    Returns case JSON: from cache or by calling API (if not cached or forced).
+    Returns case JSON: from cache if fresh (younger than max_age_hours, or the "case" TTL
+    in cachePolicy), otherwise revalidated or downloaded from the API.
     """
-    path = get_tab_file_path(case_id, "case")
-    if not force_refresh:
-        cached = read_cached_json(path)
-        #log_and_print(f"cached=={cached}")
-        if cached:
-            log_and_print(f"*******cached******")
-            return cached
-    return fetch_case_details(case_id)
+    entry, fresh = get_fresh_cache_entry(case_id, "case", force_refresh, max_age_hours)
+    if fresh:
+        log_and_print(f"*******cached******")
+        return entry["data"]
+    return fetch_case_details(case_id, entry)
 
 
-def fetch_role_contacts(role_ids: list, case_id=None, force_refresh=False) -> dict:
+@single_flight(fetch_flights, lambda role_ids, case_id=None, force_refresh=False, max_age_hours=None: (
+    "role", case_id, tuple(role_ids or ()), force_refresh, max_age_hours
+))
+def fetch_role_contacts(role_ids: list, case_id=None, force_refresh=False, max_age_hours=None) -> dict:
     """
     Fetch role contact data, using cache if available unless force_refresh=True.
     Saves as 'role_{case_id}.json' under data/{case_id}/
@@ -119,119 +611,134 @@ def fetch_role_contacts(role_ids: list, case_id=None, force_refresh=False) -> di
     if case_id is None:
         case_id = "general_roles"
 
-    path = get_tab_file_path(case_id, "role")
+    entry, fresh = get_fresh_cache_entry(case_id, "role", force_refresh, max_age_hours)
+    if fresh:
+        log_and_print(f"*******cached role contacts******")
+        return entry["data"]
 
-    if not force_refresh:
-        cached = read_cached_json(path)
-        if cached:
-            log_and_print(f"*******cached role contacts******")
-            return cached
-
-    base_url = "https://bo-contacts-int.prod.k8s.justice.gov.il/api/RoleInCorporation"
-    params = "&".join(f"RoleInCorporationIds={rid}" for rid in role_ids)
-    url = f"{base_url}?{params}"
+    url = build_role_contacts_url(role_ids)
 
     headers = {
         "Authorization": f"Bearer {BEARER_TOKEN}",
         "Accept": "application/json",
-        "Moj-Application-Id": MOJ_APP_ID
+        "Moj-Application-Id": MOJ_APP_ID,
+        **conditional_headers(entry)
     }
 
     try:
         log_and_print(f"🌐 Fetching role contacts from API for {len(role_ids)} roles...")
-        response = requests.get(url, headers=headers, verify=False)
+        response = observed_request("GET", url, headers=headers, verify=False)
         log_and_print(f"🔎 Contact API response status: {response.status_code}", "info")
 
+        if response.status_code == 304 and entry is not None:
+            touch_tab_cache(case_id, "role", response_validators(response.headers))
+            return entry["data"]
+
+        if response.status_code in NEGATIVE_STATUSES:
+            write_negative_cache(case_id, "role", response.status_code, {})
+            return {}
+
         if response.status_code != 200:
             log_and_print(f"❌ Failed to fetch contact data. Status: {response.status_code}", "error")
-            return {}
+            return stale_or(entry, {}, case_id, "role", response.status_code)
 
-        role_json = response.json()
-        write_json_to_cache(path, role_json)
+        role_json = json_codec.response_json(response)
+        write_tab_cache(case_id, "role", role_json, validators=response_validators(response.headers))
 
         return role_json
 
     except Exception as e:
         log_and_print(f"❌ Exception occurred while fetching contact data: {e}", "error")
-        return {}
+        return stale_or(entry, {}, case_id, "role", e)
 
 
-def fetch_case_discussions(case_id: int, force_refresh: bool = False) -> dict:
+@single_flight(fetch_flights, lambda case_id, force_refresh=False, max_age_hours=None: ("disc", case_id, force_refresh, max_age_hours))
+def fetch_case_discussions(case_id: int, force_refresh: bool = False, max_age_hours=None) -> dict:
     """
-    Fetches discussions for a case, with cache support.
-    Saves to: data/{case_id}/dist_{case_id}.json
+    Fetches discussions for a case, with cache support (prefix "disc").
     """
-    cache_path = get_tab_file_path(case_id, "disc")
+    entry, fresh = get_fresh_cache_entry(case_id, "disc", force_refresh, max_age_hours)
+    if fresh:
+        log_and_print(f"*******cached discussions******")
+        return entry["data"]
 
-    if not force_refresh:
-        cached = read_cached_json(cache_path)
-        if cached:
-            log_and_print(f"*******cached discussions******")
-            return cached
-
-    url = f"https://bo-discussions-int.prod.k8s.justice.gov.il/api/DiscussionsBo/All/{case_id}"
+    url = DISCUSSIONS_URL.format(case_id=case_id)
 
     headers = {
         "Authorization": f"Bearer {BEARER_TOKEN}",
         "Accept": "application/json",
-        "Moj-Application-Id": MOJ_APP_ID
+        "Moj-Application-Id": MOJ_APP_ID,
+        **conditional_headers(entry)
     }
 
     try:
         log_and_print(f"🌐 Fetching discussion JSON from API for CaseId {case_id}...")
-        response = requests.get(url, headers=headers, verify=False)
+        response = observed_request("GET", url, headers=headers, verify=False)
         log_and_print(f"🔎 Discussion API response status: {response.status_code}", "info")
 
+        if response.status_code == 304 and entry is not None:
+            touch_tab_cache(case_id, "disc", response_validators(response.headers))
+            return entry["data"]
+
+        if response.status_code in NEGATIVE_STATUSES:
+            write_negative_cache(case_id, "disc", response.status_code, {})
+            return {}
+
         if response.status_code != 200:
             log_and_print(f"❌ Failed to fetch discussions for case {case_id}. Status: {response.status_code}", "error")
-            return {}
+            return stale_or(entry, {}, case_id, "disc", response.status_code)
 
-        discussion_json = response.json()
-        write_json_to_cache(cache_path, discussion_json)
+        discussion_json = json_codec.response_json(response)
+        write_tab_cache(case_id, "disc", discussion_json, validators=response_validators(response.headers))
 
         return discussion_json
 
     except Exception as e:
         log_and_print(f"❌ Exception occurred while fetching discussions: {e}", "error")
-        return {}
+        return stale_or(entry, {}, case_id, "disc", e)
     
-def fetch_distribution_data(case_id: int) -> dict:
+@single_flight(fetch_flights, lambda case_id, force_refresh=False, max_age_hours=None: ("dist", case_id, force_refresh, max_age_hours))
+def fetch_distribution_data(case_id: int, force_refresh: bool = False, max_age_hours=None) -> dict:
     """
     Fetches and caches distribution data for a given case ID.
     """
-    from utils.fetcher import get_tab_file_path, read_cached_json, write_json_to_cache
-
-    cache_path = get_tab_file_path(case_id, "dist")
-
     # Try loading from cache first
-    cached_data = read_cached_json(cache_path)
-    if cached_data:
-        log_and_print(f"📁 Loaded distribution data from cache: {cache_path}", "debug")
-        return cached_data
+    entry, fresh = get_fresh_cache_entry(case_id, "dist", force_refresh, max_age_hours)
+    if fresh:
+        log_and_print(f"📁 Loaded distribution data from cache for case {case_id}", "debug")
+        return entry["data"]
 
-    # Fetch from API if no cache
-    url = f"https://bo-distribution-int.prod.k8s.justice.gov.il/api/Distribution/GetDistributionsByCaseOrRequest?CaseId={case_id}"
+    # Fetch (or revalidate) from API
+    url = DISTRIBUTIONS_URL.format(case_id=case_id)
     headers = {
         "Authorization": f"Bearer {BEARER_TOKEN}",
         "Accept": "application/json",
-        "Moj-Application-Id": MOJ_APP_ID
+        "Moj-Application-Id": MOJ_APP_ID,
+        **conditional_headers(entry)
     }
 
     try:
         log_and_print(f"🌐 Fetching distribution data from API for CaseId {case_id}...", "info")
-        response = requests.get(url, headers=headers, verify=False)
+        response = observed_request("GET", url, headers=headers, verify=False)
         log_and_print(f"🔎 Distribution API response status: {response.status_code}", "info")
 
+        if response.status_code == 304 and entry is not None:
+            touch_tab_cache(case_id, "dist", response_validators(response.headers))
+            return entry["data"]
+
+        if response.status_code in NEGATIVE_STATUSES:
+            write_negative_cache(case_id, "dist", response.status_code, {})
+            return {}
+
         if response.status_code == 200:
-            json_data = response.json()
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            write_json_to_cache(cache_path, json_data)
-            log_and_print(f"💾 Cached distribution data to: {cache_path}", "debug")
+            json_data = json_codec.response_json(response)
+            write_tab_cache(case_id, "dist", json_data, validators=response_validators(response.headers))
+            log_and_print(f"💾 Cached distribution data for case {case_id}", "debug")
             return json_data
         else:
             log_and_print(f"❌ Failed to fetch distribution data for case {case_id}. Status: {response.status_code}", "error")
-            return {}
+            return stale_or(entry, {}, case_id, "dist", response.status_code)
 
     except Exception as e:
         log_and_print(f"❌ Exception occurred while fetching distribution data: {e}", "error")
-        return {}
+        return stale_or(entry, {}, case_id, "dist", e)
@@ -0,0 +1,74 @@
+# json_codec.py
+import json
+import os
+from dotenv import load_dotenv
+from utils.logging_utils import log_and_print
+try:
+    import orjson
+except ImportError:  # optional: JSON_BACKEND=orjson needs the orjson package
+    orjson = None
+try:
+    import msgspec
+except ImportError:  # optional: JSON_BACKEND=msgspec needs the msgspec package
+    msgspec = None
+
+load_dotenv()
+
+
+def _stdlib_dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# JSON backends, keyed by JSON_BACKEND. loads takes bytes or str; dumps returns compact UTF-8 bytes.
+JSON_BACKENDS = {"json": {"loads": json.loads, "dumps": _stdlib_dumps}}
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = {"loads": orjson.loads, "dumps": orjson.dumps}
+if msgspec is not None:
+    JSON_BACKENDS["msgspec"] = {"loads": msgspec.json.decode, "dumps": msgspec.json.encode}
+
+
+def _select_backend(name):
+    if name == "auto":
+        return next(backend for backend in ("orjson", "msgspec", "json") if backend in JSON_BACKENDS)
+    if name not in JSON_BACKENDS:
+        log_and_print(f"⚠️ JSON_BACKEND={name} is not available, using json", "warning")
+        return "json"
+    return name
+
+
+JSON_BACKEND = _select_backend(os.getenv("JSON_BACKEND", "auto").lower())
+_backend = JSON_BACKENDS[JSON_BACKEND]
+
+
+def loads(raw):
+    """
+    Decodes a JSON document (bytes or str) with JSON_BACKEND. Documents the fast backend
+    rejects but the stdlib accepts (e.g. NaN / Infinity literals) are retried with the
+    stdlib decoder.
+    """
+    try:
+        return _backend["loads"](raw)
+    except Exception:
+        if JSON_BACKEND == "json":
+            raise
+        return json.loads(raw)
+
+
+def dumps(data):
+    """
+    Encodes data as compact UTF-8 JSON bytes (non-ASCII kept as-is). Data the fast
+    backend cannot encode (e.g. integers beyond 64 bits) falls back to the stdlib.
+    """
+    try:
+        return _backend["dumps"](data)
+    except Exception:
+        if JSON_BACKEND == "json":
+            raise
+        return _stdlib_dumps(data)
+
+
+def response_json(response):
+    """
+    requests' response.json(), decoded with JSON_BACKEND from the raw body.
+    """
+    return loads(response.content)
@@ -125,13 +125,50 @@ def extract_discussions(case_data):
     return case_data.get("discussions", [])
 
 
-def is_case_type_supported(case_id, expected_types=None):
+def extract_active_contact_representors(case_json):
+    """
+    Returns the active representors (no appointmentEndDate) of all case involveds
+    except the tax authority (meshiva).
+    """
+    representors = []
+    for ci in case_json.get("caseInvolveds", []):
+        if "רשות המיסים" in ci.get("caseInvolvedName", ""):
+            continue  # Skip meshiva
+        for rep in ci.get("representors", []):
+            if rep.get("appointmentEndDate") is None:
+                representors.append(rep)
+    return representors
+
+
+def get_contact_lookup_ids(representors):
+    """
+    Decides which contacts API serves the representors.
+
+    Returns:
+        tuple[list, list]: (role_ids, connect_ids) — role_ids is non-empty when any representor
+        has a roleInCorporationId (RoleInCorporation API), otherwise connect_ids lists the
+        connectDetailsIds for the ConnectDetails API.
+    """
+    role_ids = [r.get("roleInCorporationId") for r in representors if r.get("roleInCorporationId")]
+    if role_ids:
+        return role_ids, []
+
+    connect_ids = list({
+        r.get("connectDetailsId"): None
+        for r in representors
+        if r.get("connectDetailsId") and r.get("caseInvolvedIdentifyId")
+    })
+    return [], connect_ids
+
+
+def is_case_type_supported(case_id, expected_types=None, case_json=None):
     """
     Loads case JSON and checks if the caseTypeId is in the expected types list.
 
     Args:
         case_id (int): The case ID to check.
         expected_types (list[int]): A list of valid caseTypeIds.
+        case_json (dict): Already-loaded case JSON (e.g. CaseContext.case_json); loaded from cache if omitted.
 
     Returns:
         bool: True if caseTypeId is in the list, False otherwise.
@@ -139,7 +176,8 @@ def is_case_type_supported(case_id, expected_types=None):
     if expected_types is None:
         expected_types = [328, 329, 330, 331]
 
-    case_json = get_case_data(case_id)
+    if case_json is None:
+        case_json = get_case_data(case_id)
     if not case_json:
         log_and_print(f"❌ Cannot validate caseTypeId — case {case_id} not found", "error")
         return False
@@ -157,13 +195,14 @@ def is_case_type_supported(case_id, expected_types=None):
 
 
 
-def is_case_type_support_doc(case_id, expected_types=None):
+def is_case_type_support_doc(case_id, expected_types=None, case_json=None):
     """
     Loads case JSON and checks if the caseTypeId is in the expected types list.
 
     Args:
         case_id (int): The case ID to check.
         expected_types (list[int]): A list of valid caseTypeIds.
+        case_json (dict): Already-loaded case JSON (e.g. CaseContext.case_json); loaded from cache if omitted.
 
     Returns:
         bool: True if caseTypeId is in the list, False otherwise.
@@ -171,7 +210,8 @@ def is_case_type_support_doc(case_id, expected_types=None):
     if expected_types is None:
         expected_types = [328]
 
-    case_json = get_case_data(case_id)
+    if case_json is None:
+        case_json = get_case_data(case_id)
     if not case_json:
         log_and_print(f"❌ Cannot validate caseTypeId — case {case_id} not found", "error")
         return False
@@ -187,17 +227,19 @@ def is_case_type_support_doc(case_id, expected_types=None):
     return True
 
 
-def get_first_request_id(case_id):
+def get_first_request_id(case_id, case_json=None):
     """
     Returns the requestId of the first request in the case JSON.
     
     Args:
         case_id (int): The case ID to extract from.
+        case_json (dict): Already-loaded case JSON; loaded from cache if omitted.
     
     Returns:
         int | None: The requestId of the first request, or None if not found.
     """
-    case_json = get_case_data(case_id)
+    if case_json is None:
+        case_json = get_case_data(case_id)
     if not case_json:
         log_and_print(f"❌ Could not load case JSON for {case_id}", "error")
         return None
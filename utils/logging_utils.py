@@ -1,4 +1,5 @@
 import logging
+import multiprocessing
 from bidi.algorithm import get_display
 from dateutil.parser import parse
 import unicodedata
@@ -18,9 +19,12 @@ RESET = '\033[0m'
 
 # Configure logging
 def setup_logging(log_file='application.log'):
+    # Worker processes (pipeline comparison stage) re-import this module; they must
+    # append to the log the main process started instead of truncating it.
+    filemode = 'w' if multiprocessing.parent_process() is None else 'a'
     logging.basicConfig(
         filename=log_file,
-        filemode='w',
+        filemode=filemode,
         level=logging.INFO,
         format='%(message)s',  # Only log the message itself
         encoding='utf-8'
@@ -31,28 +35,15 @@ logger = setup_logging()
 
 
 def filter_post_cutoff_docs(doc_ids, source_df, cutoff_datetime, source_label=""):
-    filtered = []
-
-    for moj in doc_ids:
-        row = source_df[source_df["mojId"] == moj]
-        if not row.empty:
-            raw_date = row.iloc[0].get("statusDate")
-            if raw_date:
-                try:
-                    parsed = parse(raw_date).replace(tzinfo=None)
-                    if parsed <= cutoff_datetime:
-                        filtered.append(moj)
-                    else:
-                        log_and_print(f"✅ Skipping [{source_label}] {moj}, post-CUTOFF: {parsed}", "debug")
-                except Exception as e:
-                    log_and_print(f"⚠️ Failed to parse statusDate for mojId {moj}: {e}", "warning")
-                    filtered.append(moj)
-            else:
-                filtered.append(moj)
-        else:
-            filtered.append(moj)
-
-    return filtered
+    """
+    doc_ids whose statusDate in source_df is on or before cutoff_datetime; ids without a row
+    or a parseable statusDate are kept. See utils.cutoff.CutoffIndex.
+    """
+    from utils.cutoff import CutoffIndex  # utils.cutoff imports log_and_print from here
+
+    return CutoffIndex(source_df, "statusDate").filter(
+        doc_ids, (None, cutoff_datetime), keep_unknown=True, label=source_label
+    )
 
 
 
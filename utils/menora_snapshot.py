@@ -0,0 +1,105 @@
+# menora_snapshot.py
+import json
+import os
+import zlib
+import pandas as pd
+from dotenv import load_dotenv
+from utils.logging_utils import log_and_print
+try:
+    import pyarrow  # noqa: F401  (pandas uses it for to_parquet/read_parquet)
+except ImportError:  # optional: MENORA_SNAPSHOT needs the pyarrow package
+    pyarrow = None
+
+load_dotenv()
+
+MENORA_SNAPSHOT_DIR = os.getenv("MENORA_SNAPSHOT_DIR", os.path.join("snapshots", "menora"))
+MANIFEST_NAME = "_manifest.json"
+
+
+def query_fingerprint(query):
+    """
+    Short hash of a query template, so editing a query invalidates its snapshots.
+    """
+    return f"{zlib.crc32(query.encode('utf-8')):08x}"
+
+
+class MenoraSnapshotStore:
+    """
+    Local Parquet snapshots of the per-case Menora frames:
+    {root}/{case_id}/{tab}.parquet plus a manifest with the case's snapshot key
+    (see apis.sql_client.SNAPSHOT_KEY_QUERY) and the fingerprint of each tab's query.
+    A snapshot is used only while both still match.
+    """
+
+    def __init__(self, root=MENORA_SNAPSHOT_DIR):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def available(self):
+        return pyarrow is not None
+
+    def _case_dir(self, case_id):
+        return os.path.join(self.root, str(case_id))
+
+    def _read_manifest(self, case_id):
+        path = os.path.join(self._case_dir(case_id), MANIFEST_NAME)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            log_and_print(f"⚠️ Failed reading snapshot manifest {path}: {e}", "warning")
+            return None
+
+    def load(self, case_id, key, tab_queries):
+        """
+        Returns {tab: DataFrame} when every tab in tab_queries has a valid snapshot, else None.
+        """
+        manifest = self._read_manifest(case_id)
+        valid = manifest is not None and manifest.get("key") == key and all(
+            manifest.get("tabs", {}).get(tab) == query_fingerprint(query) for tab, query in tab_queries.items()
+        )
+        if not valid:
+            self.misses += 1
+            return None
+
+        try:
+            frames = {
+                tab: pd.read_parquet(os.path.join(self._case_dir(case_id), f"{tab}.parquet"))
+                for tab in tab_queries
+            }
+        except Exception as e:
+            log_and_print(f"⚠️ Unreadable Menora snapshot for case {case_id}: {e}", "warning")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return frames
+
+    def save(self, case_id, key, frames, tab_queries):
+        """
+        Writes the case's frames and then its manifest, so a crash mid-save leaves the
+        snapshot invalid instead of half-updated.
+        """
+        case_dir = self._case_dir(case_id)
+        os.makedirs(case_dir, exist_ok=True)
+        manifest_path = os.path.join(case_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        try:
+            for tab, frame in frames.items():
+                frame.to_parquet(os.path.join(case_dir, f"{tab}.parquet"), index=False)
+        except Exception as e:
+            log_and_print(f"⚠️ Could not snapshot Menora frames for case {case_id}: {e}", "warning")
+            return False
+
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "tabs": {tab: query_fingerprint(tab_queries[tab]) for tab in frames}}, f)
+        return True
+
+    def log_summary(self):
+        log_and_print(f"🧊 Menora snapshots: {self.hits} cases reused, {self.misses} cases queried", "info")
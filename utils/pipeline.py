@@ -0,0 +1,72 @@
+# pipeline.py
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+from utils.logging_utils import log_and_print
+from utils.sql_connection import get_connection_pool
+from runners.case_runner import collect_case_inputs, compare_case
+
+load_dotenv()
+
+IO_WORKERS = int(os.getenv("IO_WORKERS", "6"))
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 2)))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "24"))
+
+
+def _collect_into_queue(case_id, handoff, menora_frames, max_age_hours=None):
+    """
+    I/O stage worker: gathers one case's inputs and hands them to the comparison stage.
+    Always puts exactly one item per case, so the consumer never waits on a failed case.
+    """
+    inputs = None
+    try:
+        with get_connection_pool().connection() as conn:
+            inputs = collect_case_inputs(case_id, conn, menora_frames, max_age_hours)
+    except Exception as e:
+        log_and_print(f"❌ Failed collecting inputs for case_id {case_id}: {e}", "error")
+    finally:
+        handoff.put((case_id, inputs))  # blocks while the comparison stage is behind
+
+
+def run_pipeline(case_ids, tab_configs, menora_frames=None, io_workers=IO_WORKERS, cpu_workers=CPU_WORKERS, queue_size=PIPELINE_QUEUE_SIZE, max_age_hours=None, tab_plans=None):
+    """
+    Two-stage run: a thread pool fetches SQL frames and API payloads, a process pool
+    runs the pandas comparisons. The stages are joined by a bounded queue, and at most
+    cpu_workers * 2 comparisons are queued in the process pool, so a slow stage
+    back-pressures the other instead of piling inputs up in memory.
+
+    Yields:
+        tuple: (case_id, case_results) as each comparison finishes.
+    """
+    menora_frames = menora_frames or {}
+    handoff = queue.Queue(maxsize=queue_size)
+    max_pending = cpu_workers * 2
+
+    log_and_print(f"🚀 Pipeline: {io_workers} I/O workers, {cpu_workers} comparison processes, queue size {queue_size}", "info")
+
+    with ThreadPoolExecutor(max_workers=io_workers) as io_pool, ProcessPoolExecutor(max_workers=cpu_workers) as cpu_pool:
+        for case_id in case_ids:
+            io_pool.submit(_collect_into_queue, case_id, handoff, menora_frames.get(case_id), max_age_hours)
+
+        pending = set()
+        for _ in range(len(case_ids)):
+            while len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+            case_id, inputs = handoff.get()
+            if inputs is None:
+                yield case_id, {}
+                continue
+
+            pending.add(cpu_pool.submit(
+                compare_case, case_id, inputs["appeal_number"], tab_configs, inputs["menora_frames"], inputs["context"],
+                tab_plans
+            ))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
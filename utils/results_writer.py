@@ -0,0 +1,136 @@
+# results_writer.py
+import glob
+import json
+import os
+import time
+import pandas as pd
+from utils.logging_utils import log_and_print
+
+DEFAULT_RESULTS_LOG = "comparison_results.jsonl"
+
+
+def json_default(obj):
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+class ResultsLog:
+    """
+    Append-only JSONL log with one {"case_id", "results"} line per finished case.
+    Lines are flushed immediately and fsync'ed in batches (every fsync_every records
+    or fsync_interval seconds), so a crash loses at most the last unsynced batch.
+    """
+
+    def __init__(self, path=DEFAULT_RESULTS_LOG, resume=False, fsync_every=20, fsync_interval=5.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        if resume and self._file.tell() > 0 and not _ends_with_newline(path):
+            self._file.write("\n")  # terminate a torn last line so the next record stays readable
+
+    def append(self, case_id, case_results):
+        line = json.dumps({"case_id": str(case_id), "results": case_results}, ensure_ascii=False, default=json_default)
+        self._file.write(line + "\n")
+        self._file.flush()
+        self._unsynced += 1
+
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_results_log(path=DEFAULT_RESULTS_LOG):
+    """
+    Reads a results log into {case_id: case_results}. A later line for the same case wins.
+    A torn last line (crash mid-write) is skipped.
+    """
+    results = {}
+    if not os.path.exists(path):
+        return results
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                log_and_print(f"⚠️ Skipping unreadable line {line_number} in {path}", "warning")
+                continue
+            results[str(record["case_id"])] = record["results"]
+
+    return results
+
+
+def completed_case_ids(path=DEFAULT_RESULTS_LOG):
+    """
+    Returns the set of case_ids (as int) already present in the results log.
+    """
+    return {int(case_id) for case_id in read_results_log(path)}
+
+
+def shard_results_log_path(log_path, suffix):
+    """
+    comparison_results.jsonl + "shard-0-of-4" → comparison_results.shard-0-of-4.jsonl
+    """
+    root, ext = os.path.splitext(log_path)
+    return f"{root}.{suffix}{ext or '.jsonl'}"
+
+
+def shard_results_logs(log_path):
+    """
+    The per-shard/per-worker logs written next to log_path (comparison_results.*.jsonl).
+    """
+    root, ext = os.path.splitext(log_path)
+    return sorted(glob.glob(f"{glob.escape(root)}.*{ext or '.jsonl'}"))
+
+
+def compact_results_log(log_path=DEFAULT_RESULTS_LOG, summary_path="comparison_summary.json"):
+    """
+    Writes the results log in the comparison_summary.json shape used by dashboard_app.py
+    and create_excel_summary_from_json: {case_id: {tab: result}}.
+    """
+    return merge_results_logs([log_path], summary_path)
+
+
+def merge_results_logs(log_paths, summary_path="comparison_summary.json"):
+    """
+    Merges the results logs of several shards/workers into one comparison_summary.json.
+    When a case appears in more than one log, the log listed last wins.
+    """
+    dashboard_results = {}
+    for log_path in log_paths:
+        dashboard_results.update(read_results_log(log_path))
+
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(dashboard_results, f, indent=2, ensure_ascii=False, default=json_default)
+
+    log_and_print(f"📁 Compacted {len(dashboard_results)} cases from {', '.join(log_paths)} into {summary_path}", "info")
+    return dashboard_results
@@ -0,0 +1,63 @@
+# single_flight.py
+import functools
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the function,
+    callers arriving while it is in flight wait and get the same result object or error
+    (read-only, see utils.fetcher.MemoryCache). Nothing is remembered after the call
+    finishes; caching stays the cache's job.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.joins = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.joins += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def single_flight(flights, key_fn):
+    """
+    Decorator: runs the function through flights.do(key_fn(*args, **kwargs), ...).
+    key_fn takes the same arguments as the decorated function.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return flights.do(key_fn(*args, **kwargs), lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorate
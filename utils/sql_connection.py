@@ -1,6 +1,10 @@
 # sql_connection.py
 
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 import pyodbc
 from dotenv import load_dotenv
 from utils.logging_utils import log_and_print
@@ -55,3 +59,185 @@ def get_sqlalchemy_engine():
     except Exception as e:
         log_and_print(f"❌ SQLAlchemy engine creation error: {e}", "error")
         raise
+
+
+class SqlConnectionPool:
+    """
+    Thread-safe bounded pool of pyodbc connections shared by the worker threads.
+
+    - Opens min_size connections up front and at most max_size in total.
+    - Checks every connection with SELECT 1 on checkout and reconnects if it is dead.
+    - Rolls back on return so no transaction state leaks between cases.
+    - Tracks checkout count and wait time so the pool can be sized against the worker count.
+    """
+
+    def __init__(self, min_size=2, max_size=8, checkout_timeout=120, connect_fn=get_sql_connection):
+        if min_size > max_size:
+            raise ValueError("min_size cannot be larger than max_size.")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self._connect = connect_fn
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "created": 0,
+            "reconnects": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "max_in_use": 0,
+        }
+
+        for _ in range(min_size):
+            self._idle.append(self._connect())
+            self._size += 1
+            self._stats["created"] += 1
+
+    @staticmethod
+    def _is_alive(conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        started = time.perf_counter()
+        deadline = started + self.checkout_timeout
+        conn = None
+        create = False
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    conn = self._idle.popleft()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise TimeoutError(f"No SQL connection available within {self.checkout_timeout}s (pool max_size={self.max_size}).")
+                self._condition.wait(remaining)
+
+        try:
+            if create:
+                conn = self._connect()
+                with self._condition:
+                    self._stats["created"] += 1
+            elif not self._is_alive(conn):
+                log_and_print("⚠️ Pooled SQL connection is dead, reconnecting...", "warning")
+                self._close_quietly(conn)
+                conn = self._connect()
+                with self._condition:
+                    self._stats["reconnects"] += 1
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        waited = time.perf_counter() - started
+        with self._condition:
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["total_wait_seconds"] += waited
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+            self._stats["max_in_use"] = max(self._stats["max_in_use"], self._in_use)
+        return conn
+
+    def release(self, conn, broken=False):
+        if not broken:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+
+        with self._condition:
+            self._in_use -= 1
+            if broken:
+                self._close_quietly(conn)
+                self._size -= 1
+                self._stats["discarded"] += 1
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrows a connection for the duration of a with-block. Connections that raised a
+        pyodbc error are discarded instead of returned to the pool.
+        """
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except pyodbc.Error:
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def metrics(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats["size"] = self._size
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._in_use
+        checkouts = stats["checkouts"]
+        stats["avg_wait_seconds"] = stats["total_wait_seconds"] / checkouts if checkouts else 0.0
+        return stats
+
+    def log_metrics(self):
+        m = self.metrics()
+        log_and_print(
+            f"🔌 SQL pool: {m['checkouts']} checkouts, avg wait {m['avg_wait_seconds']:.3f}s, "
+            f"max wait {m['max_wait_seconds']:.3f}s, peak in use {m['max_in_use']}/{self.max_size}, "
+            f"created {m['created']}, reconnects {m['reconnects']}, discarded {m['discarded']}, timeouts {m['timeouts']}",
+            "info"
+        )
+
+    def close_all(self):
+        with self._condition:
+            while self._idle:
+                self._close_quietly(self._idle.popleft())
+                self._size -= 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool():
+    """
+    Returns the process-wide connection pool, created on first use from
+    SQL_POOL_MIN_SIZE / SQL_POOL_MAX_SIZE / SQL_POOL_TIMEOUT.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SqlConnectionPool(
+                min_size=int(os.getenv("SQL_POOL_MIN_SIZE", "2")),
+                max_size=int(os.getenv("SQL_POOL_MAX_SIZE", "8")),
+                checkout_timeout=int(os.getenv("SQL_POOL_TIMEOUT", "120")),
+            )
+        return _pool
@@ -0,0 +1,125 @@
+# work_queue.py
+import os
+import socket
+import sqlite3
+import time
+from dotenv import load_dotenv
+from utils.logging_utils import log_and_print
+
+load_dotenv()
+
+QUEUE_LEASE_SECONDS = int(os.getenv("QUEUE_LEASE_SECONDS", "1800"))
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class SqliteWorkQueue:
+    """
+    Shared case queue in a SQLite file that workers on several nodes claim case_ids from.
+
+    Each claim is a short BEGIN IMMEDIATE transaction, so two workers never claim the same
+    case. A claim is a lease: cases claimed by a worker that died are handed out again
+    after lease_seconds. Put the file on a share with working file locks (SMB, local disk
+    of one node); NFS without lockd is not safe for SQLite.
+
+    Status per case: pending → claimed → done / failed.
+    """
+
+    def __init__(self, path, lease_seconds=QUEUE_LEASE_SECONDS, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._conn.execute("PRAGMA busy_timeout = 60000")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cases (
+                case_id INTEGER PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                claimed_at REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cases_status ON cases (status, claimed_at)")
+
+    def enqueue(self, case_ids):
+        """
+        Adds case_ids that are not in the queue yet. Safe to call from every worker with the
+        same case source; returns the number of newly added cases.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO cases (case_id) VALUES (?)", [(int(c),) for c in case_ids])
+            added = self._conn.total_changes - before
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def claim(self, worker_id, batch_size=10):
+        """
+        Claims up to batch_size pending cases (or cases whose lease expired) for worker_id.
+        Returns an empty list when nothing is left to claim.
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self._conn.execute(
+                """
+                SELECT case_id FROM cases
+                WHERE (status = 'pending' OR (status = 'claimed' AND claimed_at < ?))
+                  AND attempts < ?
+                ORDER BY case_id
+                LIMIT ?
+                """,
+                (now - self.lease_seconds, self.max_attempts, batch_size)
+            ).fetchall()
+            case_ids = [row[0] for row in rows]
+            self._conn.executemany(
+                "UPDATE cases SET status = 'claimed', worker = ?, claimed_at = ?, attempts = attempts + 1 WHERE case_id = ?",
+                [(worker_id, now, case_id) for case_id in case_ids]
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return case_ids
+
+    def complete(self, case_ids, status="done"):
+        self._conn.executemany(
+            "UPDATE cases SET status = ? WHERE case_id = ?", [(status, int(case_id)) for case_id in case_ids]
+        )
+
+    def fail(self, case_ids):
+        """
+        Hands failed cases back: pending again (any worker may retry them) while attempts
+        < max_attempts, status 'failed' once they are used up.
+        """
+        self._conn.executemany(
+            """
+            UPDATE cases
+            SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, worker = NULL, claimed_at = NULL
+            WHERE case_id = ?
+            """,
+            [(self.max_attempts, int(case_id)) for case_id in case_ids]
+        )
+
+    def counts(self):
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM cases GROUP BY status").fetchall())
+
+    def log_progress(self):
+        counts = self.counts()
+        total = sum(counts.values())
+        log_and_print(
+            f"📋 Queue {self.path}: {counts.get('done', 0)}/{total} done, {counts.get('claimed', 0)} claimed, "
+            f"{counts.get('pending', 0)} pending, {counts.get('failed', 0)} failed", "info"
+        )
+
+    def close(self):
+        self._conn.close()